@@ -0,0 +1,383 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Docstring2md: end-to-end benchmark.
+
+Generate synthetic packages (10, 100, 1000 and 10000 modules with varied
+docstring sizes and nesting depths) and time DocString2MD.import_module and
+DocString2MD.writedoc. Each run is a new process: the peak RSS is the
+run's one.
+
+The result (modules/s, nodes/s, peak RSS) is compared with the stored
+baseline (benchmarks/baseline_e2e.json): the benchmark fails if a rate is
+lower or the peak RSS is higher than the tolerance allows. The rates depend
+on the machine: they are normalized by a calibration loop (pure Python
+parsing, timed with the baseline and before each check). For an exact
+comparison, save the baseline on the same machine (--save-baseline on the
+reference commit) before the check.
+
+Use:
+    ```shell
+    python benchmarks/bench_e2e.py
+    python benchmarks/bench_e2e.py --sizes 10 100 --repeat 1
+    # store the result as the new baseline
+    python benchmarks/bench_e2e.py --save-baseline
+    ```
+"""
+from __future__ import annotations
+
+import argparse
+import ast
+import json
+import logging
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, NamedTuple, Optional
+
+BASELINE: Path = Path(__file__).resolve().parent / "baseline_e2e.json"
+SIZES: list[int] = [10, 100, 1000, 10000]
+REPEAT: int = 3
+TOLERANCE: float = 0.3
+SEED: int = 42
+PACKAGE: str = "synthpkg"
+# calibration loop: parse a module CALIBRATION_LOOPS times (the fastest of
+# CALIBRATION_REPEAT runs)
+CALIBRATION_LOOPS: int = 200
+CALIBRATION_REPEAT: int = 10
+
+
+class Result(NamedTuple):
+    """Define the result of a run.
+
+    Attributes:
+        modules (int): number of modules
+        nodes (int): number of extracted nodes (classes and functions)
+        import_time (float): DocString2MD.import_module (s)
+        write_time (float): DocString2MD.writedoc (s)
+        peak_rss (int): peak RSS (KiB, 0 if unknown)
+
+    """
+
+    modules: int
+    nodes: int
+    import_time: float
+    write_time: float
+    peak_rss: int
+
+    @property
+    def modules_per_sec(self) -> float:
+        """Get the number of modules per second."""
+        return self.modules / (self.import_time + self.write_time)
+
+    @property
+    def nodes_per_sec(self) -> float:
+        """Get the number of nodes per second."""
+        return self.nodes / (self.import_time + self.write_time)
+
+
+class PackageGenerator:
+    """Generate a synthetic package.
+
+    The generation is deterministic (seeded): the same size gives the same
+    package.
+
+    """
+
+    __rng: random.Random
+    __nodes: int
+
+    def __init__(self, seed: int = SEED) -> None:
+        """Init the generator.
+
+        Args:
+            seed (int): random seed
+
+        """
+        self.__rng = random.Random(seed)
+        self.__nodes = 0
+
+    def __docstring(self, indent: str, examples: bool = False) -> list[str]:
+        lines: list[str] = ['"""Summary line of the object.', ""]
+        lines += [
+            "Lorem ipsum dolor sit amet, consectetur adipiscing elit, sed "
+            "do eiusmod." for _ in range(self.__rng.randint(0, 12))]
+        lines += ["", "Args:"] + [
+            f"    arg{idx} (int): argument {idx}"
+            for idx in range(self.__rng.randint(1, 4))]
+        lines += ["", "Returns:", "    str: result"]
+        if examples:
+            lines += ["", "Examples:", "    >>> 1 + 1", "    2"]
+        lines += ["", '"""']
+        return [f"{indent}{line}" if line else "" for line in lines]
+
+    def __function(self, name: str, indent: str) -> list[str]:
+        self.__nodes += 1
+        args: list[str] = [
+            f"arg{idx}: Optional[dict[str, list[int]]] = None"
+            if idx % 2 else f"arg{idx}: int | str = {idx}"
+            for idx in range(self.__rng.randint(0, 5))]
+        decorator: list[str] = [f"{indent}@staticmethod"] \
+            if self.__rng.random() < 0.2 else []
+        return decorator + [
+            f"{indent}def {name}({', '.join(args)}) -> str:"] + \
+            self.__docstring(f"{indent}    ", self.__rng.random() < 0.3) + \
+            [f"{indent}    return ''", ""]
+
+    def __class(self, name: str, indent: str, depth: int) -> list[str]:
+        self.__nodes += 1
+        lines: list[str] = [f"{indent}class {name}(Base, Generic[T]):"]
+        lines += self.__docstring(f"{indent}    ")
+        for idx in range(self.__rng.randint(1, 6)):
+            lines += self.__function(f"method_{idx}", f"{indent}    ")
+        if depth > 0 and self.__rng.random() < 0.5:
+            lines += self.__class(f"{name}Inner", f"{indent}    ", depth - 1)
+        return lines
+
+    def module(self) -> str:
+        """Generate a module.
+
+        The module docstring is not counted: it is not extracted as a node
+        (the Base class is).
+
+        Returns:
+            str: source code
+
+        """
+        lines: list[str] = self.__docstring("")
+        self.__nodes += 1
+        lines += ["from typing import Generic, Optional, TypeVar", "",
+                  "T = TypeVar('T')", "", "", "class Base:", "    pass", ""]
+        for idx in range(self.__rng.randint(0, 3)):
+            lines += self.__class(f"Class{idx}", "", self.__rng.randint(0, 2))
+        for idx in range(self.__rng.randint(1, 5)):
+            lines += self.__function(f"function_{idx}", "")
+        return "\n".join(lines) + "\n"
+
+    def package(self, path: Path, size: int) -> tuple[int, int]:
+        """Generate a package with size modules.
+
+        The modules are spread in sub-packages (depth 0 to 3).
+
+        Args:
+            path (Path): package directory
+            size (int): number of modules (__init__ included)
+
+        Returns:
+            tuple[int, int]: number of modules, number of nodes
+
+        """
+        self.__nodes = 0
+        modules: int = 0
+        dirs: list[Path] = [path]
+        while modules < size:
+            parent: Path = self.__rng.choice(dirs)
+            target: Path
+            if not (parent / "__init__.py").exists():
+                target = parent / "__init__.py"
+            elif len(dirs) < size // 20 + 1 and \
+                    len(parent.relative_to(path).parts) < 3 and \
+                    self.__rng.random() < 0.1:
+                dirs.append(parent / f"sub{len(dirs)}")
+                dirs[-1].mkdir(parents=True)
+                continue
+            else:
+                target = parent / f"mod{modules}.py"
+            target.parent.mkdir(parents=True, exist_ok=True)
+            target.write_text(self.module(), encoding="utf-8")
+            modules += 1
+        return modules, self.__nodes
+
+
+def run_child(path: str, nodes: int) -> dict[str, Any]:
+    """Run DocString2MD in this process (child mode).
+
+    Args:
+        path (str): package directory
+        nodes (int): number of nodes
+
+    Returns:
+        dict[str, Any]: result
+
+    """
+    # pylint: disable=import-outside-toplevel
+    from docstring2md.__config__ import ExitStatus
+    from docstring2md.doc2md import DocString2MD, DocString2MDOptions
+    from docstring2md.file import MyFile
+    from docstring2md.log import logger
+
+    logger.setLevel(logging.WARNING)
+    sys.path.insert(0, str(Path(path).parent))
+    with tempfile.TemporaryDirectory() as tmp:
+        doc: DocString2MD = DocString2MD(PACKAGE, DocString2MDOptions(
+            toml=MyFile.set_path(None), uml=MyFile.set_path(None),
+            todo=MyFile.set_path(None),
+            output=MyFile.set_path(os.path.join(tmp, "README.md")),
+            toc=True, private_def=False))
+        start: float = time.perf_counter()
+        status: ExitStatus = doc.import_module()
+        import_time: float = time.perf_counter() - start
+        write_time: float = 0.0
+        if status is ExitStatus.EX_OK:
+            start = time.perf_counter()
+            status = doc.writedoc()
+            write_time = time.perf_counter() - start
+        if status is not ExitStatus.EX_OK:
+            raise RuntimeError(f"{path}: {status!r}")
+    return Result(modules=len(doc.files), nodes=nodes,
+                  import_time=import_time, write_time=write_time,
+                  peak_rss=get_peak_rss())._asdict()
+
+
+def get_peak_rss() -> int:
+    """Get the peak RSS of this process.
+
+    Returns:
+        int: KiB (0 if unknown)
+
+    """
+    try:
+        import resource  # pylint: disable=import-outside-toplevel
+    except ImportError:
+        return 0
+    peak: int = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # bytes on macOS
+    return peak // 1024 if sys.platform == "darwin" else peak
+
+
+def calibrate(repeat: int = CALIBRATION_REPEAT) -> float:
+    """Time the calibration loop (machine speed).
+
+    Args:
+        repeat (int): number of runs (the fastest one is kept)
+
+    Returns:
+        float: time of the loop (s)
+
+    """
+    source: str = PackageGenerator().module()
+    times: list[float] = []
+    for _ in range(repeat):
+        start: float = time.perf_counter()
+        for _ in range(CALIBRATION_LOOPS):
+            ast.parse(source)
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def run(path: Path, nodes: int, repeat: int) -> Result:
+    """Run the benchmark in new processes.
+
+    Args:
+        path (Path): package directory
+        nodes (int): number of nodes
+        repeat (int): number of runs (the fastest one is kept)
+
+    Returns:
+        Result: result
+
+    """
+    results: list[Result] = []
+    for _ in range(repeat):
+        with tempfile.NamedTemporaryFile(suffix=".json") as output:
+            subprocess.run([sys.executable, __file__, "--child", str(path),
+                            str(nodes), output.name], check=True)
+            results.append(Result(**json.loads(Path(output.name).read_text(
+                encoding="utf-8"))))
+    return min(results, key=lambda result: result.import_time +
+               result.write_time)
+
+
+def check(size: int, result: Result, baseline: dict[str, Any],
+          tolerance: float, scale: float = 1.0) -> list[str]:
+    """Compare a result with the baseline.
+
+    Args:
+        size (int): package size
+        result (Result): result
+        baseline (dict[str, Any]): baseline of this size
+        tolerance (float): allowed regression (0.3 => 30%)
+        scale (float): speed of this machine / speed of the baseline one
+            (calibration loop)
+
+    Returns:
+        list[str]: regressions
+
+    """
+    errors: list[str] = []
+    for name in ("modules_per_sec", "nodes_per_sec"):
+        expected: float = baseline[name] * scale
+        if getattr(result, name) < expected * (1 - tolerance):
+            errors.append(f"{size}: {name} {getattr(result, name):.1f} < "
+                          f"{expected:.1f} (baseline x {scale:.2f})")
+    if result.peak_rss and baseline.get("peak_rss") and \
+            result.peak_rss > baseline["peak_rss"] * (1 + tolerance):
+        errors.append(f"{size}: peak_rss {result.peak_rss} KiB > "
+                      f"{baseline['peak_rss']} KiB (baseline)")
+    return errors
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    """Run the benchmark and print the result.
+
+    Args:
+        argv (list[str]): arguments
+
+    Returns:
+        int: 0 => no regression, 1 otherwise
+
+    """
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--sizes", type=int, nargs="+", default=SIZES)
+    parser.add_argument("--repeat", type=int, default=REPEAT)
+    parser.add_argument("--tolerance", type=float, default=TOLERANCE)
+    parser.add_argument("--baseline", type=Path, default=BASELINE)
+    parser.add_argument("--save-baseline", action="store_true")
+    parser.add_argument("--child", nargs=3, help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+    if args.child:
+        Path(args.child[2]).write_text(json.dumps(
+            run_child(args.child[0], int(args.child[1]))), encoding="utf-8")
+        return 0
+
+    baseline: dict[str, Any] = json.loads(args.baseline.read_text(
+        encoding="utf-8")) if args.baseline.exists() else {}
+    calibration: float = calibrate()
+    # no calibration in the baseline => absolute rates
+    scale: float = baseline.get("calibration", calibration) / calibration
+    print(f"calibration: {calibration:.3f}s (baseline x {scale:.2f})")
+    results: dict[str, Any] = {"calibration": round(calibration, 4)}
+    errors: list[str] = []
+    print(f"{'modules':>8} {'nodes':>8} {'import':>9} {'write':>9} "
+          f"{'modules/s':>10} {'nodes/s':>10} {'peak RSS':>10}")
+    for size in args.sizes:
+        with tempfile.TemporaryDirectory() as tmp:
+            path: Path = Path(tmp) / PACKAGE
+            modules, nodes = PackageGenerator(SEED + size).package(path, size)
+            result: Result = run(path, nodes, args.repeat)
+        print(f"{modules:8d} {nodes:8d} {result.import_time:8.3f}s "
+              f"{result.write_time:8.3f}s {result.modules_per_sec:10.1f} "
+              f"{result.nodes_per_sec:10.1f} {result.peak_rss:7d} KiB")
+        results[str(size)] = {
+            "modules_per_sec": round(result.modules_per_sec, 1),
+            "nodes_per_sec": round(result.nodes_per_sec, 1),
+            "peak_rss": result.peak_rss}
+        if str(size) in baseline:
+            errors += check(size, result, baseline[str(size)],
+                            args.tolerance, scale)
+    if args.save_baseline:
+        args.baseline.write_text(json.dumps(
+            {**baseline, **results}, indent=4) + "\n", encoding="utf-8")
+        print(f"baseline saved: {args.baseline}")
+        return 0
+    for error in errors:
+        print(f"REGRESSION {error}", file=sys.stderr)
+    return 1 if errors else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
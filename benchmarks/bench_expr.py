@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Docstring2md: expression renderer benchmark.
+
+Render the annotations, default values, decorators and bases of the
+package and of a few typed stdlib packages:
+    - unparse: ast.unparse for every node
+    - render_expr: dispatch table (ast.unparse for the other nodes)
+
+Use:
+    ```shell
+    python benchmarks/bench_expr.py
+    ```
+"""
+from __future__ import annotations
+
+import ast
+import sys
+import sysconfig
+import timeit
+from functools import partial
+from pathlib import Path
+from typing import Callable
+
+from docstring2md.expr import render_expr
+
+SRC_DIRS: list[Path] = [
+    Path(__file__).resolve().parent.parent / "src" / "docstring2md",
+    Path(sysconfig.get_paths()["stdlib"]) / "tomllib",
+    Path(sysconfig.get_paths()["stdlib"]) / "wsgiref",
+    Path(sysconfig.get_paths()["stdlib"]) / "importlib"]
+REPEAT: int = 5
+NUMBER: int = 10
+
+
+def get_nodes(tree: ast.AST) -> list[ast.AST]:
+    """Get the expression nodes of the definitions.
+
+    Args:
+        tree (ast.AST): parsed module
+
+    Returns:
+        list[ast.AST]: expression nodes
+
+    """
+    nodes: list[ast.AST] = []
+    for node in ast.walk(tree):
+        if isinstance(node, ast.ClassDef):
+            nodes.extend(node.bases)
+        elif isinstance(node, ast.FunctionDef):
+            args: ast.arguments = node.args
+            nodes.extend(
+                arg.annotation for arg in
+                args.posonlyargs + args.args + args.kwonlyargs
+                if arg.annotation is not None)
+            nodes.extend(args.defaults)
+            nodes.extend(node.decorator_list)
+            if node.returns is not None:
+                nodes.append(node.returns)
+    return nodes
+
+
+def render_all(nodes: list[ast.AST],
+               renderer: Callable[[ast.AST], str]) -> None:
+    """Render all nodes.
+
+    Args:
+        nodes (list[ast.AST]): expression nodes
+        renderer (Callable): render function
+
+    """
+    for node in nodes:
+        renderer(node)
+
+
+def main() -> None:
+    """Run the benchmark and print the result."""
+    if sys.version_info < (3, 9):
+        print("ast.unparse is not available")
+        return
+    nodes: list[ast.AST] = [
+        node for src_dir in SRC_DIRS
+        for path in sorted(src_dir.glob("**/*.py"))
+        for node in get_nodes(ast.parse(path.read_bytes()))]
+    result: dict[str, float] = {}
+    for name, renderer in (("unparse", ast.unparse),
+                           ("render_expr", render_expr)):
+        result[name] = min(timeit.repeat(
+            partial(render_all, nodes, renderer),
+            repeat=REPEAT, number=NUMBER)) / NUMBER
+    print(f"{'nodes':>12}: {len(nodes):8d}")
+    for name, elapse in result.items():
+        print(f"{name:>12}: {elapse * 1000:8.2f} ms / run")
+    print(f"{'speedup':>12}: "
+          f"{result['unparse'] / result['render_expr']:8.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,178 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Docstring2md: import time benchmark.
+
+Time the import of the library (docstring2md) and of the CLI
+(docstring2md.cli) with python -X importtime. Each import is a new
+process: nothing is already imported.
+
+The benchmark fails if:
+    - an import time is higher than the stored baseline
+      (benchmarks/baseline_import.json) plus the tolerance
+    - a lazy module (rich, asyncio, multiprocessing, sqlite3...) is
+      imported
+    - the import configures the logging (root handlers)
+
+Use:
+    ```shell
+    python benchmarks/bench_import.py
+    python benchmarks/bench_import.py --repeat 3 --top 10
+    # store the result as the new baseline
+    python benchmarks/bench_import.py --save-baseline
+    ```
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import subprocess
+import sys
+from pathlib import Path
+from typing import Any, NamedTuple, Optional
+
+BASELINE: Path = Path(__file__).resolve().parent / "baseline_import.json"
+TARGETS: list[str] = ["docstring2md", "docstring2md.cli"]
+# loaded on demand: rich, batch and daemon modes, asyncio API, process
+# pool, symbol index, archives
+LAZY: tuple[str, ...] = (
+    "rich", "rich_argparse", "asyncio", "http.server", "socketserver",
+    "multiprocessing", "sqlite3", "tarfile")
+REPEAT: int = 10
+TOLERANCE: float = 0.3
+TOP: int = 5
+# the logging is checked after the import: not measured
+CHILD: str = "import {target}; import logging, sys; " \
+    "sys.exit(1 if logging.getLogger().handlers else 0)"
+
+
+class Result(NamedTuple):
+    """Define the result of an import.
+
+    Attributes:
+        elapse (float): import time (ms, cumulative)
+        imports (dict[str, float]): module => import time (ms, cumulative)
+        logging (bool): True if the root logger has a handler
+
+    """
+
+    elapse: float
+    imports: dict[str, float]
+    logging: bool
+
+
+def run_child(target: str) -> Result:
+    """Import the target in a new process.
+
+    Args:
+        target (str): module
+
+    Returns:
+        Result: result
+
+    """
+    child: subprocess.CompletedProcess[str] = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c",
+         CHILD.format(target=target)],
+        capture_output=True, text=True, check=False)
+    imports: dict[str, float] = {}
+    # import time: <self us> | <cumulative us> | <indent><module>
+    for line in child.stderr.splitlines():
+        fields: list[str] = line.split("|")
+        if len(fields) != 3 or not fields[1].strip().isdigit():
+            continue
+        imports[fields[2].strip()] = int(fields[1]) / 1000
+    if target not in imports:
+        raise RuntimeError(f"{target}: {child.stderr.strip()}")
+    return Result(elapse=imports[target], imports=imports,
+                  logging=child.returncode != 0)
+
+
+def run(target: str, repeat: int) -> Result:
+    """Import the target in new processes.
+
+    Args:
+        target (str): module
+        repeat (int): number of runs (the fastest one is kept)
+
+    Returns:
+        Result: result
+
+    """
+    return min((run_child(target) for _ in range(repeat)),
+               key=lambda result: result.elapse)
+
+
+def check(target: str, result: Result, baseline: Optional[float],
+          tolerance: float) -> list[str]:
+    """Check a result.
+
+    Args:
+        target (str): module
+        result (Result): result
+        baseline (float): baseline (ms, None => no baseline)
+        tolerance (float): allowed regression (0.3 => 30%)
+
+    Returns:
+        list[str]: regressions
+
+    """
+    errors: list[str] = [
+        f"{target}: {module} is imported" for module in LAZY
+        if module in result.imports]
+    if result.logging:
+        errors.append(f"{target}: the logging is configured")
+    if baseline and result.elapse > baseline * (1 + tolerance):
+        errors.append(f"{target}: {result.elapse:.1f} ms > {baseline:.1f} "
+                      "ms (baseline)")
+    return errors
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    """Run the benchmark and print the result.
+
+    Args:
+        argv (list[str]): arguments
+
+    Returns:
+        int: 0 => no regression, 1 otherwise
+
+    """
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--targets", nargs="+", default=TARGETS)
+    parser.add_argument("--repeat", type=int, default=REPEAT)
+    parser.add_argument("--tolerance", type=float, default=TOLERANCE)
+    parser.add_argument("--top", type=int, default=TOP)
+    parser.add_argument("--baseline", type=Path, default=BASELINE)
+    parser.add_argument("--save-baseline", action="store_true")
+    args = parser.parse_args(argv)
+
+    baseline: dict[str, Any] = json.loads(args.baseline.read_text(
+        encoding="utf-8")) if args.baseline.exists() else {}
+    results: dict[str, float] = {}
+    errors: list[str] = []
+    for target in args.targets:
+        result: Result = run(target, args.repeat)
+        print(f"{target}: {result.elapse:.1f} ms "
+              f"({len(result.imports)} modules)")
+        # slowest imports, the target and its parents excluded
+        for module, elapse in sorted(
+                ((module, elapse) for module, elapse in result.imports.items()
+                 if module != target
+                 and not target.startswith(f"{module}.")),
+                key=lambda elem: elem[1], reverse=True)[:args.top]:
+            print(f"{elapse:10.1f} ms  {module}")
+        results[target] = round(result.elapse, 1)
+        errors += check(target, result, baseline.get(target), args.tolerance)
+    if args.save_baseline:
+        args.baseline.write_text(json.dumps(
+            {**baseline, **results}, indent=4) + "\n", encoding="utf-8")
+        print(f"baseline saved: {args.baseline}")
+        return 0
+    for error in errors:
+        print(f"REGRESSION {error}", file=sys.stderr)
+    return 1 if errors else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
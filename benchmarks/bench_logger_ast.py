@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Docstring2md: logger_ast benchmark.
+
+Compare the ObjVisitor with and without the tracing layer when the debug
+logging is off (INFO level):
+    - traced: all methods are wrapped by trace_ast (previous behaviour)
+    - untraced: the undecorated methods are used
+
+Use:
+    ```shell
+    python benchmarks/bench_logger_ast.py
+    ```
+"""
+from __future__ import annotations
+
+import ast
+import logging
+import timeit
+from functools import partial
+from pathlib import Path
+
+from docstring2md.ast_engine import ObjVisitor
+from docstring2md.log import logger
+
+PKG_DIR: Path = Path(__file__).resolve().parent.parent / "src" / \
+    "docstring2md"
+REPEAT: int = 5
+NUMBER: int = 20
+
+
+def visit_all(trees: list[ast.AST], trace: bool) -> None:
+    """Visit all trees.
+
+    Args:
+        trees (list[ast.AST]): parsed modules
+        trace (bool): enable the tracing layer
+
+    """
+    for tree in trees:
+        ObjVisitor(private_def=True, trace=trace).visit(tree)
+
+
+def main() -> None:
+    """Run the benchmark and print the result."""
+    logger.setLevel(logging.INFO)
+    logging.disable(logging.INFO)
+    trees: list[ast.AST] = [ast.parse(path.read_text(encoding="utf-8"))
+                            for path in sorted(PKG_DIR.glob("*.py"))]
+    result: dict[str, float] = {}
+    for trace in (True, False):
+        result["traced" if trace else "untraced"] = min(timeit.repeat(
+            partial(visit_all, trees, trace),
+            repeat=REPEAT, number=NUMBER)) / NUMBER
+    logging.disable(logging.NOTSET)
+    for name, elapse in result.items():
+        print(f"{name:>10}: {elapse * 1000:8.2f} ms / run")
+    print(f"{'speedup':>10}: {result['traced'] / result['untraced']:8.2f}x")
+
+
+if __name__ == "__main__":
+    main()
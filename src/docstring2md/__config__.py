@@ -16,7 +16,7 @@ from __future__ import annotations
 
 import os
 from enum import Enum, IntEnum, unique
-from typing import NamedTuple
+from typing import NamedTuple, Optional
 
 if __name__ == "__main__":
     raise Exception("Do not start this script manually !")
@@ -37,6 +37,7 @@ class Const(Enum):
     PROPERTY_TAG: str = '@Property'
     COMA: str = ", "
     DOT: str = "."
+    XREF_SEE: str = "See:"
 
 
 @unique
@@ -166,18 +167,66 @@ class LogMessages(NamedTuple):
         debug="New ClassDef - title: %s / def: %s / doc: %s / lvl: %s")
     new_func: EventMSG = EventMSG(
         debug="New FuncDef - title: %s / def: %s / doc: %s / lvl: %s")
-    node_link_analysis_beg: EventMSG = EventMSG(
-        info="Node link analysis: started")
-    node_link_analysis_end: EventMSG = EventMSG(
-        info="Node link analysis: finished")
     unknown_type_of_node: EventMSG = EventMSG(
-        warning="__get_value_from_node - another object: %s")
+        warning="render_expr - another object: %s")
     io_err: EventMSG = EventMSG(
         error="Error writing to the file.")
     file_not_found: EventMSG = EventMSG(
         error="Error opening file")
     write_doc: EventMSG = EventMSG(
         info="Doc has been created")
+    write_unchanged: EventMSG = EventMSG(
+        info="Doc is unchanged (not written): %s")
+    cache: EventMSG = EventMSG(
+        info="Cache directory used: %s",
+        warning="Cache entry cannot be used: %s",
+        debug="Cache hit: %s")
+    cache_evict: EventMSG = EventMSG(
+        debug="Cache eviction: %s")
+    watch: EventMSG = EventMSG(
+        info="Watch: waiting for changes (%s)",
+        error="Watch: the doc cannot be updated: %s",
+        debug="Watch: changed files => %s")
+    watch_update: EventMSG = EventMSG(
+        info="Watch: doc updated in %.1f ms")
+    profile: EventMSG = EventMSG(
+        info="Profile:\n%s",
+        warning="Profile: the workers are not profiled (jobs=%s)")
+    profile_output: EventMSG = EventMSG(
+        info="Profile written to %s",
+        error="Profile cannot be written: %s")
+    batch: EventMSG = EventMSG(
+        info="Batch: %s package(s) from %s",
+        warning="Batch: --watch is not used with a manifest",
+        error="Batch: the manifest cannot be read: %s")
+    batch_package: EventMSG = EventMSG(
+        info="Batch - package %s => %s",
+        error="Batch - package %s failed: %s")
+    batch_result: EventMSG = EventMSG(
+        info="Batch result:\n%s",
+        error="Batch: %s package(s) failed")
+    split: EventMSG = EventMSG(
+        info="Split: %s file(s) written, %s unchanged (%s)")
+    index: EventMSG = EventMSG(
+        info="Index: %s symbol(s) from %s module(s) written to %s",
+        warning="Index: FTS5 is not available, the docstrings are "
+                "searched with LIKE",
+        error="Index: the database cannot be written: %s")
+    archive: EventMSG = EventMSG(
+        info="Archive: %s module file(s) read from %s",
+        warning="Archive: no package or module found in %s",
+        error="Archive: the archive cannot be read: %s")
+    git: EventMSG = EventMSG(
+        error="Git: the revision cannot be read: %s",
+        debug="Git: cat-file process started in %s")
+    daemon: EventMSG = EventMSG(
+        info="Daemon: listening on %s",
+        warning="Daemon: --%s is ignored in daemon mode",
+        error="Daemon: the server cannot be started: %s",
+        debug="Daemon: stopped")
+    daemon_request: EventMSG = EventMSG(
+        info="Daemon - %s: %s in %.1f ms",
+        debug="Daemon - %s")
 
 
 LOG_MSG = LogMessages()
@@ -187,6 +236,74 @@ CHK_PYT_MIN: tuple[int, int, int] = (3, 7, 0)
 ROOT_DIR: str = os.path.abspath(os.path.dirname(__file__))
 PID: int = os.getpid()
 
+# source files (mmap if bigger)
+MMAP_THRESHOLD: int = 1024 * 1024
+# output files (compared block by block)
+WRITE_BLOCK_SIZE: int = 64 * 1024
+WRITE_TMP_SUFFIX: str = ".tmp"
+
+# cache
+CACHE_MAX_SIZE: int = 256 * 1024 * 1024
+CACHE_SUFFIX: str = ".pickle"
+# entries being written (removed at init if older than CACHE_TMP_MAX_AGE s)
+CACHE_TMP_PREFIX: str = "tmp-"
+CACHE_TMP_MAX_AGE: int = 3600
+# bumped when the pickled nodes change
+CACHE_FORMAT: int = 2
+CACHE_MEMORY_ENTRIES: int = 4096
+
+# watch
+WATCH_POLL_INTERVAL: float = 0.05
+WATCH_DEBOUNCE: float = 0.02
+WATCH_SUFFIX: str = ".py"
+# IN_MODIFY | IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE |
+# IN_DELETE
+INOTIFY_MASK: int = 0x002 | 0x008 | 0x040 | 0x080 | 0x100 | 0x200
+# IN_ISDIR, IN_MOVED_TO | IN_CREATE: a new directory can be a sub-package
+INOTIFY_ISDIR: int = 0x40000000
+INOTIFY_NEW: int = 0x080 | 0x100
+INOTIFY_EVENT: str = "iIII"
+
+# split output: one page per module
+SPLIT_INDEX: str = "README.md"
+SPLIT_SUFFIX: str = ".md"
+SPLIT_BACK: str = f"[Index]({SPLIT_INDEX})"
+
+# batch: packages documented at a time (Batch.arun)
+ASYNC_CONCURRENCY: int = 4
+# batch: result of the write
+BATCH_WRITTEN: dict[Optional[bool], str] = {
+    True: "written", False: "unchanged", None: ""}
+
+# index: SQLite symbol index
+INDEX_SEARCH_LIMIT: int = 20
+INDEX_TIMEOUT: float = 30.0
+
+# archive: documented without extracting it
+ARCHIVE_SUFFIXES: tuple[str, ...] = (
+    ".whl", ".zip", ".tar.gz", ".tgz", ".tar.bz2", ".tar.xz", ".tar")
+# directories skipped when looking for the top-level packages
+ARCHIVE_EXCLUDE: tuple[str, ...] = (
+    "tests", "test", "docs", "doc", "examples", "benchmarks")
+# files skipped when looking for the top-level modules (no package)
+ARCHIVE_EXCLUDE_MODULES: tuple[str, ...] = (
+    "setup.py", "conftest.py", "noxfile.py")
+
+# git: documented at a revision without checking it out
+GIT_COMMAND: str = "git"
+
+# daemon
+DAEMON_PATH: str = "/render"
+DAEMON_MAX_BODY: int = 64 * 1024
+# warm docs kept by the daemon (each one watches its files)
+DAEMON_MAX_DOCS: int = 16
+# options of the CLI not used by the daemon (the docs are only rendered)
+DAEMON_IGNORED: tuple[str, ...] = ("split_dir", "index_db", "git_rev")
+
+# profile
+PROFILE_TOP: int = 10
+PROFILE_TRACE_SUFFIX: str = ".json"
+
 
 # exit values
 @unique
@@ -45,8 +45,15 @@ Use:
     ```
     Usage: export_docstring2md [-h] [--version] [--debug | --quiet]
                                [--logfile LOGFILE] [--toc] [--private-def]
-                               -p PACKAGE [-o OUTPUT_FILE] [-tml TOML_FILE]
+                               [--xref] [--watch] [--no-import] [--profile]
+                               (-p PACKAGE | --manifest MANIFEST |
+                               --serve SERVE)
+                               [-o OUTPUT_FILE] [-tml TOML_FILE]
                                [-td TODO_FILE] [-mmd MERMAID_FILE]
+                               [--split-dir SPLIT_DIR]
+                               [--index-db INDEX_DB] [--git-rev GIT_REV]
+                               [--cache-dir CACHE_DIR] [-j JOBS]
+                               [--profile-output PROFILE_OUTPUT]
 
     This script is provided by docstring2md package.
     It exports google docstrings from python module to a Markdown file in order
@@ -60,11 +67,24 @@ Use:
       --logfile LOGFILE     /path/to/file.log
       --toc                 Enable the table of contents
       --private-def         Enable the table of contents
+      --xref                link the annotations, bases and backticked names
+                            to their objects
+      --watch               stay resident and update the doc when a file
+                            changes
+      --no-import           discover the modules without importing the
+                            package
+      --profile             log the time spent in each phase and the slowest
+                            modules
 
     Required Arguments:
       -p, --package PACKAGE
-                            define the /path/to/the/package or
-                            <package_name>
+                            define the /path/to/the/package,
+                            <package_name> or /path/to/the/archive (.whl,
+                            .zip, .tar.gz)
+      --manifest MANIFEST   /path/to/manifest.json (batch mode: list of
+                            package, output, toml, todo, mmd and split_dir)
+      --serve SERVE         host:port or /path/to/socket (daemon mode: GET
+                            /render?package=...)
 
     Optional Arguments:
       -o, --output-file OUTPUT_FILE
@@ -75,6 +95,20 @@ Use:
                             /path/to/todo/file.md
       -mmd, --mermaid-file MERMAID_FILE
                             /path/to/mermaid/file.mmd
+      --split-dir SPLIT_DIR
+                            /path/to/dir (one Markdown file per module and a
+                            README.md index, batch mode: one sub-directory
+                            per package)
+      --index-db INDEX_DB   /path/to/index.sqlite (symbols and full-text
+                            docstring search)
+      --git-rev GIT_REV     document the package at this git revision
+                            (branch, tag, commit) without checking it out
+      --cache-dir CACHE_DIR
+                            /path/to/cache/dir (extraction cache)
+      -j, --jobs JOBS       number of processes used to extract the modules
+      --profile-output PROFILE_OUTPUT
+                            /path/to/profile (.json => Chrome trace, cProfile
+                            stats otherwise)
 
     COMPATIBILITY:
         Python 3.7+ - https://www.python.org/
@@ -0,0 +1,266 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Docstring2md: archive.
+
+This script is free software; you can redistribute it and/or
+modify it under the terms of the GNU Lesser General Public
+License as published by the Free Software Foundation; either
+version 3 of the License, or (at your option) any later version.
+
+This script is provided in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.
+"""
+from __future__ import annotations
+
+import posixpath
+from typing import Iterable, Iterator, Optional
+
+from docstring2md.__config__ import (ARCHIVE_EXCLUDE, ARCHIVE_EXCLUDE_MODULES,
+                                     ARCHIVE_SUFFIXES, LOG_MSG)
+from docstring2md.log import logger
+
+INIT_FILE: str = "__init__.py"
+
+
+class Archive:
+    """Read the modules of a wheel, a zip or an sdist without extracting it.
+
+    The archive is read once, member by member (a tar.gz is streamed):
+    only the Python sources are kept in memory. A module is known by a
+    virtual path: /path/to/the/archive.whl/package/module.py.
+
+    The packages are the top-level directories with an __init__.py (the
+    tests, docs... are skipped). If there is no package, the top-level
+    modules are documented (foo.py, setup.py is skipped). The modules are
+    listed like pkgutil does on a directory.
+
+    Examples:
+        >>> import io, tarfile, tempfile, zipfile
+        >>> tmp = tempfile.TemporaryDirectory()
+        >>> path = f"{tmp.name}/pkg-1.0.tar.gz"
+        >>> with tarfile.open(path, "w:gz") as tar:
+        ...     for name in ("pkg-1.0/setup.py", "pkg-1.0/tests/__init__.py",
+        ...                  "pkg-1.0/src/pkg/__init__.py",
+        ...                  "pkg-1.0/src/pkg/sub/__init__.py",
+        ...                  "pkg-1.0/src/pkg/sub/b.py",
+        ...                  "pkg-1.0/src/pkg/a.py"):
+        ...         info = tarfile.TarInfo(name)
+        ...         info.size = 5
+        ...         tar.addfile(info, io.BytesIO(b"x = 1"))
+        >>> archive = Archive(path)
+        >>> [module[len(path) + 1:] for module in archive.modules]
+        ['pkg-1.0/src/pkg/__init__.py', 'pkg-1.0/src/pkg/a.py', \
+'pkg-1.0/src/pkg/sub/__init__.py', 'pkg-1.0/src/pkg/sub/b.py']
+        >>> archive.package[len(path) + 1:]
+        'pkg-1.0/src/pkg'
+        >>> archive.get_source(archive.modules[1])
+        b'x = 1'
+        >>> # no package: the top-level modules
+        >>> path = f"{tmp.name}/mod-1.0-py3-none-any.whl"
+        >>> with zipfile.ZipFile(path, "w") as whl:
+        ...     for name in ("mod.py", "_mod_c.py", "mod-1.0.dist-info/x.py"):
+        ...         whl.writestr(name, "x = 1")
+        >>> archive = Archive(path)
+        >>> [module[len(path) + 1:] for module in archive.modules]
+        ['_mod_c.py', 'mod.py']
+        >>> archive.package[len(path) + 1:]
+        '_mod_c'
+        >>> tmp.cleanup()
+
+    """
+
+    __path: str
+    __sources: dict[str, bytes]
+    # top-level packages (pkg) or modules (foo.py)
+    __packages: list[str]
+
+    def __init__(self, path: str,
+                 sources: Optional[Iterable[tuple[str, bytes]]] = None) \
+            -> None:
+        """Read the archive.
+
+        Args:
+            path (str): /path/to/the/archive (.whl, .zip, .tar.gz...)
+            sources (Iterable[tuple[str, bytes]]): member name, source of
+                the .py files (None => read from the archive file)
+
+        Raises:
+            OSError: the archive cannot be read
+            ValueError: unknown or invalid archive
+
+        """
+        # loaded on demand: only used if an archive is documented
+        # pylint: disable-next=import-outside-toplevel
+        import tarfile
+        # pylint: disable-next=import-outside-toplevel
+        import zipfile
+        self.__path = path
+        try:
+            self.__sources = dict(
+                self.__iter_sources(path) if sources is None else sources)
+        except (tarfile.TarError, zipfile.BadZipFile) as err:
+            raise ValueError(f"{path}: {err}") from err
+        self.__packages = self.__find_packages() or self.__find_modules()
+        logger.info(LOG_MSG.archive.info, len(self.__sources), path)
+
+    @staticmethod
+    def is_archive(path: str) -> bool:
+        """Check if a path is an archive (by suffix).
+
+        Args:
+            path (str): /path/to/the/file
+
+        Returns:
+            bool: True for a .whl, .zip, .tar.gz, .tgz... file
+
+        Examples:
+            >>> Archive.is_archive("dist/pkg-1.0-py3-none-any.whl")
+            True
+            >>> Archive.is_archive("pkg/__init__.py")
+            False
+
+        """
+        return path.lower().endswith(ARCHIVE_SUFFIXES)
+
+    @staticmethod
+    def __iter_sources(path: str) -> Iterator[tuple[str, bytes]]:
+        # member name => source, in one pass
+        # pylint: disable-next=import-outside-toplevel
+        import tarfile
+        # pylint: disable-next=import-outside-toplevel
+        import zipfile
+        if zipfile.is_zipfile(path):
+            with zipfile.ZipFile(path) as archive:
+                for info in archive.infolist():
+                    if not info.is_dir() and info.filename.endswith(".py"):
+                        yield info.filename, archive.read(info)
+            return
+        # stream mode: the members are read in order, no seek
+        with tarfile.open(path, "r|*") as tar:
+            for member in tar:
+                if member.isfile() and member.name.endswith(".py"):
+                    file = tar.extractfile(member)
+                    if file is not None:
+                        yield posixpath.normpath(member.name), file.read()
+
+    def __find_packages(self) -> list[str]:
+        # top-level packages: the parent has no __init__.py
+        packages: list[str] = []
+        for member in self.__sources:
+            parts: list[str] = member.split("/")
+            if parts[-1] != INIT_FILE or \
+                    set(parts[:-1]) & set(ARCHIVE_EXCLUDE) or \
+                    posixpath.join(*parts[:-2], INIT_FILE) in self.__sources:
+                continue
+            packages.append(posixpath.dirname(member))
+        if not packages:
+            return []
+        # the shallowest directory (./ or ./src in an sdist)
+        root: str = min((posixpath.dirname(package) for package in packages),
+                        key=lambda path: (path.count("/"), path))
+        return sorted(package for package in packages
+                      if posixpath.dirname(package) == root)
+
+    def __find_modules(self) -> list[str]:
+        # top-level modules: no package in the archive
+        modules: list[str] = [
+            member for member in self.__sources
+            if posixpath.basename(member)[:-3].isidentifier()
+            and posixpath.basename(member) not in ARCHIVE_EXCLUDE_MODULES
+            and not set(member.split("/")[:-1]) & set(ARCHIVE_EXCLUDE)]
+        if not modules:
+            return []
+        # the shallowest directory (./ or ./<name>-<version> in an sdist)
+        root: str = min((posixpath.dirname(module) for module in modules),
+                        key=lambda path: (path.count("/"), path))
+        return sorted(module for module in modules
+                      if posixpath.dirname(module) == root)
+
+    @property
+    def package(self) -> str:
+        """Get the virtual path of the first top-level package or module.
+
+        A module has no suffix: /path/to/the/archive.whl/foo for foo.py.
+
+        """
+        if not self.__packages:
+            return ""
+        return self.get_path(posixpath.splitext(self.__packages[0])[0])
+
+    @property
+    def modules(self) -> list[str]:
+        """Get the virtual paths of the top-level modules or packages."""
+        if not self.__packages:
+            return []
+        return [self.get_path(member) for member in self.__walk(
+            posixpath.dirname(self.__packages[0]), False)]
+
+    def get_path(self, member: str) -> str:
+        """Get the virtual path of a member.
+
+        Args:
+            member (str): member name (package/module.py)
+
+        Returns:
+            str: /path/to/the/archive/package/module.py
+
+        """
+        return f"{self.__path}/{member}"
+
+    def get_source(self, module: str) -> bytes:
+        """Get the source of a module.
+
+        Args:
+            module (str): virtual path
+
+        Returns:
+            bytes: source code
+
+        Raises:
+            FileNotFoundError: the module is not in the archive
+
+        """
+        source: Optional[bytes] = self.__sources.get(
+            module[len(self.__path) + 1:])
+        if source is None or not module.startswith(f"{self.__path}/"):
+            raise FileNotFoundError(module)
+        return source
+
+    def exists(self, module: str) -> bool:
+        """Check if a module is in the archive.
+
+        Args:
+            module (str): virtual path
+
+        Returns:
+            bool
+
+        """
+        return module.startswith(f"{self.__path}/") and \
+            module[len(self.__path) + 1:] in self.__sources
+
+    def __walk(self, directory: str, ispkg: bool) -> list[str]:
+        # same order as pkgutil.iter_modules: __init__, then the sorted
+        # file names (modules and sub-packages)
+        prefix: str = f"{directory}/" if directory else ""
+        modules: list[str] = [f"{prefix}{INIT_FILE}"] if ispkg else []
+        names: set[str] = {
+            member[len(prefix):].split("/", 1)[0]
+            for member in self.__sources if member.startswith(prefix)}
+        for name in sorted(names):
+            path: str = f"{prefix}{name}"
+            if f"{path}/{INIT_FILE}" in self.__sources and (
+                    ispkg or path in self.__packages):
+                modules += self.__walk(path, True)
+            elif (ispkg or path in self.__packages) and \
+                    name.endswith(".py") and name != INIT_FILE and \
+                    "." not in name[:-3]:
+                modules.append(path)
+        return modules
+
+
+if __name__ == "__main__":
+    import doctest
+    doctest.testmod()
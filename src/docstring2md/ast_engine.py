@@ -17,23 +17,75 @@ MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.
 from __future__ import annotations
 
 import ast
+import codecs
+import io
+import logging
+import mmap
 import re
+import tokenize
 from collections import deque
 from functools import wraps
+from itertools import chain
+from types import MethodType
 from typing import Any, Callable, NamedTuple, Optional, TypeVar, Union, cast
 
-from docstring2md.__config__ import LOG_MSG, Tag
+from docstring2md.__config__ import Const, Tag
 from docstring2md.convmd import ConvMD
+from docstring2md.expr import get_names, render_expr
+from docstring2md.file import SourceType
 from docstring2md.log import logger
 
 F = TypeVar('F', bound=Callable[..., Any])
 ASTVisitedNode = Union[ast.Module, ast.ClassDef, ast.FunctionDef]
 ASTClassFunc = Union[ast.ClassDef, ast.FunctionDef]
+TRACED_ATTR: str = "__traced__"
+# GitHub anchors: a dunder is rendered in bold (__init__ => init), the
+# punctuation is removed and the spaces are replaced by hyphens.
+ANCHOR_DUNDER: re.Pattern[str] = re.compile(r"__([a-zA-Z_]*)__\(")
+ANCHOR_PUNCTUATION: re.Pattern[str] = re.compile(r"[^\w\- ]+")
+# a carriage return alone ends a line for the tokenizer, not for the
+# line offsets (split on LF)
+BARE_CR: re.Pattern[bytes] = re.compile(rb"\r(?!\n)")
+# cross-references: `name` or ``name`` in a docstring
+XREF_BACKTICK: re.Pattern[str] = re.compile(
+    r"(?<!`)(``?)([A-Za-z_][\w.]*)\1(?!`)")
+# ATX headings and code fences of a MD text
+ANCHOR_HEADING: re.Pattern[str] = re.compile(
+    r"^ {0,3}(?:#{1,6}(?:[ \t]+(.*?))?[ \t#]*|(```|~~~).*)$",
+    flags=re.MULTILINE)
 
 
 def logger_ast(func: F) -> F:
     """Use it to decorate AST Navigator Class.
 
+    The function is returned unchanged: the traced version built by
+    trace_ast is only attached to it. ObjVisitor binds the traced
+    versions when it is built with tracing enabled, so the hot path
+    runs no logging code at all otherwise.
+
+    Args:
+        func: F (Callable[..., Any])
+
+    Returns:
+        F (Callable[..., Any])
+
+    Examples:
+        >>> @logger_ast
+        ... def my_func() -> str:
+        ...     return "ok"
+        >>> my_func()
+        'ok'
+        >>> getattr(my_func, TRACED_ATTR).__wrapped__ is my_func
+        True
+
+    """
+    setattr(func, TRACED_ATTR, trace_ast(func))
+    return func
+
+
+def trace_ast(func: F) -> F:
+    """Build the traced version of an AST Navigator method.
+
     This function decorate an AST function and use the logging to track
     the activity.
 
@@ -65,19 +117,6 @@ def logger_ast(func: F) -> F:
     return cast(F, func_wrapper)
 
 
-class NodeLink(NamedTuple):
-    """Use a NamedTuple to link a node with his parent Node.
-
-    Attributes:
-        level (int): level in the module
-        parent (NodeType): parent
-
-    """
-
-    level: int
-    parent: Optional[ASTVisitedNode]
-
-
 class ModuleDef(NamedTuple):
     """Define a module with this NamedTuple.
 
@@ -117,44 +156,312 @@ class ModuleDef(NamedTuple):
         return self.docstring
 
 
-class NodeDef(NamedTuple):
-    """Define a node (class/function) with this NamedTuple.
+def get_anchor(title: str) -> str:
+    """Get the anchor of a heading (GitHub slug, without suffix).
+
+    Args:
+        title (str): heading
+
+    Returns:
+        str: anchor
+
+    Examples:
+        >>> get_anchor("MyClass.__init__(self, name)")
+        'myclassinitself-name'
+
+    """
+    return ANCHOR_PUNCTUATION.sub(
+        "", ANCHOR_DUNDER.sub(r"\1(", title).replace(" ", "-").lower())
+
+
+class AnchorTable:
+    r"""Assign the anchors of the headings of a document.
+
+    The anchors are the GitHub ones: the first heading gets its slug, the
+    next headings with the same slug get slug-1, slug-2... The table is
+    filled in the document order, in one pass: the TOC links are the
+    anchors of the headings.
+
+    Examples:
+        >>> anchors = AnchorTable()
+        >>> anchors.add_text("# Dev notes\n```\n# not a heading\n```")
+        >>> [anchors.add(title) for title in (
+        ...     "f()", "f()", "f-1", "__init__(self)", "Dev notes")]
+        ['f', 'f-1', 'f-1-1', 'initself', 'dev-notes-1']
+
+    """
+
+    __occurrences: dict[str, int]
+
+    def __init__(self) -> None:
+        """Init the table."""
+        self.__occurrences = {}
+
+    def add(self, title: str) -> str:
+        """Add a heading.
+
+        Args:
+            title (str): heading (without the # tags)
+
+        Returns:
+            str: anchor of the heading
+
+        """
+        slug: str = get_anchor(title)
+        anchor: str = slug
+        while anchor in self.__occurrences:
+            self.__occurrences[slug] += 1
+            anchor = f"{slug}-{self.__occurrences[slug]}"
+        self.__occurrences[anchor] = 0
+        return anchor
+
+    def add_text(self, text: str) -> None:
+        """Add the headings of a MD text (the code blocks are skipped).
+
+        Args:
+            text (str): MD text
+
+        """
+        fence: str = ""
+        for match in ANCHOR_HEADING.finditer(text):
+            title, tag = match.groups()
+            if tag:
+                fence = "" if fence == tag else fence or tag
+            elif not fence:
+                self.add(title or "")
+
+
+class NodeDef:
+    r"""Define a node (class/function).
+
+    The MD strings are rendered on demand, they are not kept: a streamed
+    doc does not stay attached to its nodes. A node rendered several times
+    (watch mode) is released: the MD strings are cached and the raw
+    definition and docstring are dropped (the symbol index needs them: not
+    released if the symbols are exported).
 
     Attributes:
         title (str): short class/function definition
         definition (str): full class/function definition
         docstring (str): docstring
         level (int): level in the module
+        refs (tuple[str, ...]): names used by the annotations and the bases
+
+    Examples:
+        >>> node = NodeDef(title="test()", definition="def test():",
+        ...                docstring="Test.", level=0)
+        >>> node
+        NodeDef(title='test()', level=0)
+        >>> print(node.get_summary())
+        ## test()
+        ```python
+        def test():
+        ```
+        <pre>
+        <BLANKLINE>
+        Test.
+        <BLANKLINE>
+        </pre>
+        >>> # streamed: the rendered strings are not kept on the node
+        >>> node.get_docstring() is node.get_docstring()
+        False
+        >>> node.docstring
+        'Test.'
+        >>> node.release()
+        >>> node.docstring
+        Traceback (most recent call last):
+        ...
+        AttributeError: docstring
+        >>> node.get_docstring()
+        '<pre>\n\nTest.\n\n</pre>'
+        >>> node.get_docstring() is node.get_docstring()
+        True
+        >>> # cross-references
+        >>> node = NodeDef("f()", "def f(a: A):", "Use `A` or `B`.", 1, ("A",))
+        >>> node.get_name(), node.get_names()
+        ('f', ('A', 'B'))
+        >>> print(node.get_summary({"A": "#a"}))
+        ### f()
+        ```python
+        def f(a: A):
+        ```
+        > See: [A](#a)
+        <pre>
+        <BLANKLINE>
+        Use <a href="#a">`A`</a> or `B`.
+        <BLANKLINE>
+        </pre>
+        >>> # the examples are not linked
+        >>> node = NodeDef("g()", "def g():", "Use `A`.\n\nExamples:\n"
+        ...                "    >>> s = '`A`'", 1)
+        >>> prose, examples = node.get_summary({"A": "#a"}).split("</pre>")
+        >>> '<a href="#a">`A`</a>' in prose, "s = '`A`'" in examples
+        (True, True)
 
     """
 
+    __slots__ = ("title", "level", "refs", "__definition", "__docstring",
+                 "__definition_md", "__docstring_md")
+
     title: str
-    definition: str
-    docstring: str
     level: int
+    refs: tuple[str, ...]
+    __definition: str
+    __docstring: str
+    __definition_md: Optional[str]
+    __docstring_md: Optional[str]
 
-    def get_summary(self) -> str:
+    def __init__(self, title: str, definition: str, docstring: str,
+                 level: int, refs: tuple[str, ...] = ()) -> None:
+        """Init the node.
+
+        Args:
+            title (str): short class/function definition
+            definition (str): full class/function definition
+            docstring (str): docstring
+            level (int): level in the module
+            refs (tuple[str, ...]): names used by the annotations and the
+                bases
+
+        """
+        self.title = title
+        self.level = level
+        self.refs = refs
+        self.__definition = definition
+        self.__docstring = docstring
+        self.__definition_md = None
+        self.__docstring_md = None
+
+    def __repr__(self) -> str:
+        """Represent the node."""
+        return f"NodeDef(title={self.title!r}, level={self.level!r})"
+
+    def __eq__(self, other: object) -> bool:
+        """Compare the rendered nodes."""
+        if not isinstance(other, NodeDef):
+            return NotImplemented
+        return (self.title, self.level, self.get_definition(),
+                self.get_docstring()) == \
+            (other.title, other.level, other.get_definition(),
+             other.get_docstring())
+
+    __hash__ = None  # type: ignore[assignment]
+
+    @property
+    def definition(self) -> str:
+        """Get the raw definition: AttributeError once released."""
+        try:
+            return self.__definition
+        except AttributeError:
+            raise AttributeError("definition") from None
+
+    @property
+    def docstring(self) -> str:
+        """Get the raw docstring: AttributeError once released."""
+        try:
+            return self.__docstring
+        except AttributeError:
+            raise AttributeError("docstring") from None
+
+    def release(self) -> None:
+        """Render the node and release the raw definition and docstring."""
+        if self.__definition_md is None:
+            self.__definition_md = self.__render_definition()
+        if self.__docstring_md is None:
+            self.__docstring_md = self.__render_docstring()
+        for name in ("_NodeDef__definition", "_NodeDef__docstring"):
+            if hasattr(self, name):
+                delattr(self, name)
+
+    def get_summary(self, links: Optional[dict[str, str]] = None) -> str:
         """Get the node's summary.
 
+        Args:
+            links (dict[str, str]): name => target of the cross-references
+                (None => no link)
+
         Returns:
             str
 
         """
+        if links:
+            return self.__get_linked_summary(links)
         return f"{self.get_title()}{Tag.CR.value}{self.get_definition()}" + \
                f"{Tag.CR.value}{self.get_docstring()}"
 
-    def get_toc_elem(self) -> str:
+    def __get_linked_summary(self, links: dict[str, str]) -> str:
+        # the links of the annotations follow the definition (no link in a
+        # code block), the backticked names are linked in the docstring.
+        refs: list[str] = [f"[{name}]({links[name]})" for name in self.refs
+                           if name in links]
+        see: str = f"{Tag.QUOTE.value}{Const.XREF_SEE.value} " \
+            f"{Tag.COMA.value.join(refs)}{Tag.CR.value}" if refs else ""
+        prose, code = self.__split_docstring()
+        docstring: str = XREF_BACKTICK.sub(
+            lambda match: f'<a href="{links[match.group(2)]}">'
+                          f'{match.group(0)}</a>'
+            if match.group(2) in links else match.group(0), prose)
+        return f"{self.get_title()}{Tag.CR.value}{self.get_definition()}" \
+               f"{Tag.CR.value}{see}{docstring}{code}"
+
+    def __split_docstring(self) -> tuple[str, str]:
+        # the prose (<pre> block) and the rest (Examples...): the code
+        # blocks are copied as they are, without link
+        docstring: str = self.get_docstring()
+        end: int = min((idx for idx in (
+            docstring.find(Tag.END_PRE.value),
+            docstring.find(Tag.BEG_PY.value)) if idx >= 0),
+            default=len(docstring))
+        return docstring[:end], docstring[end:]
+
+    def get_name(self) -> str:
+        """Get the node's name in its module (Class.method).
+
+        Returns:
+            str
+
+        """
+        title: str = self.title
+        if title.startswith(Const.PROPERTY_TAG.value):
+            title = title[len(Const.PROPERTY_TAG.value):].lstrip()
+        return title[:-2] if title.endswith("()") else title
+
+    def get_names(self) -> tuple[str, ...]:
+        """Get the names the node refers to.
+
+        Returns:
+            tuple[str, ...]: annotations and bases, then the backticked
+            names of the docstring (the code blocks excluded)
+
+        """
+        names: dict[str, None] = dict.fromkeys(self.refs)
+        names.update(dict.fromkeys(
+            match.group(2)
+            for match in XREF_BACKTICK.finditer(self.__split_docstring()[0])))
+        return tuple(names)
+
+    def get_anchor(self) -> str:
+        """Get the node's anchor (without the suffix of a duplicate).
+
+        Returns:
+            str
+
+        """
+        return get_anchor(self.title)
+
+    def get_toc_elem(self, anchor: Optional[str] = None) -> str:
         """Get the node's TOC entry.
 
+        Args:
+            anchor (str): anchor given by the AnchorTable of the document
+                (None => the node's anchor)
+
         Returns:
             str
 
         """
-        anchor: str = f"{self.title}"
-        anchor = re.sub(r"__([a-zA-Z_]*)__\(", r"\1(", anchor)
-        anchor = re.sub(
-            r"[^\w\- ]+", "", (anchor.replace(' ', '-')).lower())
-        return f"[{self.title}](#{anchor})<br />"
+        return f"[{self.title}](#{anchor or self.get_anchor()})" \
+               f"{Tag.HTML_CR.value}"
 
     def get_title(self) -> str:
         """Get the node's title.
@@ -165,20 +472,17 @@ class NodeDef(NamedTuple):
         """
         return f"{'#' * (self.level + 2)} {self.title}"
 
-    @ConvMD.add_tag(Tag.BEG_PY.value, Tag.BEG_END_CO.value)
     def get_definition(self) -> str:
-        """Get the node's TOC entry.
+        """Get the node's definition with MD Tag.
 
         Returns:
             str
 
         """
-        return self.definition
+        if self.__definition_md is None:
+            return self.__render_definition()
+        return self.__definition_md
 
-    @ConvMD.repl_beg_end(Tag.BEG_STR.value, Tag.END_STRH.value,
-                         Tag.BEG_B.value, Tag.END_BH.value)
-    @ConvMD.colorize_examples()
-    @ConvMD.add_tag(Tag.CR.value, Tag.CR.value)
     def get_docstring(self) -> str:
         """Get the node's Docstring with MD Tag.
 
@@ -186,14 +490,47 @@ class NodeDef(NamedTuple):
             str: Docstring
 
         """
+        if self.__docstring_md is None:
+            return self.__render_docstring()
+        return self.__docstring_md
+
+    @ConvMD.add_tag(Tag.BEG_PY.value, Tag.BEG_END_CO.value)
+    def __render_definition(self) -> str:
+        return self.definition
+
+    @ConvMD.repl_beg_end(Tag.BEG_STR.value, Tag.END_STRH.value,
+                         Tag.BEG_B.value, Tag.END_BH.value)
+    @ConvMD.colorize_examples()
+    @ConvMD.add_tag(Tag.CR.value, Tag.CR.value)
+    def __render_docstring(self) -> str:
         return self.docstring
 
 
+class FuncInfo(NamedTuple):
+    """Define the data derived from a function node.
+
+    They are computed once per node and used to build the title and the
+    definition.
+
+    Attributes:
+        fullname (str): qualified name
+        decorators (list[str]): decorators
+        args (str): arguments
+        returns (str): return annotation
+
+    """
+
+    fullname: str
+    decorators: list[str]
+    args: str
+    returns: str
+
+
 NodeListType = deque[Union[NodeDef, ModuleDef]]
 
 
 class ObjVisitor(ast.NodeVisitor):
-    """Define the AST NodeVisitor.
+    r"""Define the AST NodeVisitor.
 
     This Class is an ast.NodeVisitor class and allow us to parse
     code tree.
@@ -222,6 +559,36 @@ class ObjVisitor(ast.NodeVisitor):
         '[logger_ast()](#logger_ast)<br />'
         >>> result[0].definition
         'def logger_ast(func: F) -> F:'
+        >>> # annotations and default values
+        >>> doc = ObjVisitor()
+        >>> doc.visit(doc.parse(
+        ...     "def f(a: int | None = None, /, *, b: str = 'x') -> list[int]:"
+        ...     " pass"))
+        >>> doc.node_lst[0].definition
+        "def f(a: int | None = None, /, *, b: str = 'x') -> list[int]:"
+        >>> # bytes: the PEP 263 encoding cookie is honored
+        >>> doc = ObjVisitor()
+        >>> doc.visit(doc.parse(
+        ...     b"# -*- coding: latin-1 -*-\ndef f(a: str = '\xe9'): pass"))
+        >>> doc.node_lst[0].definition
+        "def f(a: str = 'é'):"
+        >>> # mmap: the segments are sliced from the mapping (BOM skipped)
+        >>> import tempfile
+        >>> with tempfile.TemporaryFile() as file:
+        ...     _ = file.write(codecs.BOM_UTF8 + b"def f(a: int = 1): pass\n"
+        ...                    b"def g(b: int = 1): pass\n")
+        ...     file.flush()
+        ...     with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) \
+        ...             as source:
+        ...         doc = ObjVisitor()
+        ...         doc.visit(doc.parse(source))
+        >>> [node.definition for node in doc.node_lst]
+        ['def f(a: int = 1):', 'def g(b: int = 1):']
+        >>> # traced methods are only bound with tracing enabled
+        >>> 'visit_Module' in vars(ObjVisitor(trace=True))
+        True
+        >>> 'visit_Module' in vars(ObjVisitor(trace=False))
+        False
 
     """
 
@@ -230,157 +597,155 @@ class ObjVisitor(ast.NodeVisitor):
     __func: list[Any]
 
     def __init__(
-            self, module_docstring: bool = False, private_def: bool = False) \
-            -> None:
+            self, module_docstring: bool = False, private_def: bool = False,
+            trace: Optional[bool] = None) -> None:
         """Init the AST analysis.
 
+        The tracing layer is chosen once, here: the traced methods are
+        bound only if tracing is enabled.
+
         Args:
             module_docstring (bool): get module docstring
             private_def (bool): get private functions
+            trace (bool): trace all calls (None => debug logging enabled)
 
         """
         super(ast.NodeVisitor, self).__init__()
         self.__module_docstring = module_docstring
         self.__private_def = private_def
-        self.__link_lst: dict[ASTVisitedNode, NodeLink]
+        self.__parents: list[str] = []
         self.__node_lst: NodeListType = deque()
+        self.__source: Union[bytes, mmap.mmap] = b""
+        self.__offsets: list[int] = []
+        self.__rendered: dict[bytes, str] = {}
+        if trace is None:
+            trace = logger.isEnabledFor(logging.DEBUG)
+        if trace:
+            self.__bind_traced_methods()
+
+    def __bind_traced_methods(self) -> None:
+        for name, attr in vars(ObjVisitor).items():
+            func = attr.__func__ if isinstance(attr, staticmethod) else attr
+            traced = getattr(func, TRACED_ATTR, None)
+            if traced is None:
+                continue
+            setattr(self, name, traced if isinstance(attr, staticmethod)
+                    else MethodType(traced, self))
 
     @property
     def node_lst(self) -> NodeListType:
         """Get the node list."""
         return self.__node_lst
 
-    @staticmethod
-    def parse(source: str) -> ast.AST:
+    def parse(self, source: SourceType) -> ast.AST:
         """
         Parse the source code and build the tree.
 
+        The bytes (or mmap) are given as is to ast.parse: the source is
+        not decoded then encoded again, and the encoding cookie (PEP 263)
+        is honored.
+        The line offsets are kept: identical annotations and default
+        values (same source segment) are rendered once. A segment is sliced
+        on demand: an utf-8 mmap is not copied.
+
         Args:
-            source (str): source code
+            source (SourceType): source code (str, bytes or mmap)
 
         Returns:
             AST tree
 
         """
+        # ast positions are utf-8 offsets
+        start: int = 0
+        if isinstance(source, str):
+            self.__source = source.encode()
+        else:
+            self.__source, start = self.__get_utf8(source)
+        self.__offsets = self.__get_offsets(self.__source, start)
+        self.__rendered = {}
         return ast.parse(source)
 
-    @logger_ast
-    def __set_level(
-            self, node: ASTVisitedNode, level: int = 0,
-            parent: Optional[ASTVisitedNode] = None)\
-            -> None:
-        if level == 0:
-            logger.info(LOG_MSG.node_link_analysis_beg.info)
-            self.__link_lst = {}
-        self.__link_lst[node] = NodeLink(level=level, parent=parent)
-
-        for child in ast.iter_child_nodes(node):
-            if isinstance(child, (ast.ClassDef, ast.FunctionDef)):
-                self.__set_level(child, (level + 1), node)
-        if level == 0:
-            logger.info(LOG_MSG.node_link_analysis_end.info)
+    @staticmethod
+    def __get_utf8(source: Union[bytes, mmap.mmap]) \
+            -> tuple[Union[bytes, mmap.mmap], int]:
+        # (utf-8 source, start of the first line): the same bytes or mmap
+        # if the source is utf-8 (no cookie or utf-8 cookie)
+        first: int = source.find(b"\n")
+        second: int = source.find(b"\n", first + 1) if first >= 0 else -1
+        # the cookie is in the first two lines
+        head: bytes = source[:second + 1] if second >= 0 else source[:]
+        encoding, _lines = tokenize.detect_encoding(io.BytesIO(head).readline)
+        if encoding == "utf-8":
+            return source, 0
+        if encoding == "utf-8-sig":
+            return source, len(codecs.BOM_UTF8)
+        return source[:].decode(encoding).encode(), 0
+
+    @staticmethod
+    def __get_offsets(source: Union[bytes, mmap.mmap], start: int) \
+            -> list[int]:
+        # start of each line (no segment if a line ends with CR alone)
+        if BARE_CR.search(source, start):
+            return []
+        offsets: list[int] = [start]
+        end: int = source.find(b"\n", start)
+        while end >= 0:
+            offsets.append(end + 1)
+            end = source.find(b"\n", end + 1)
+        return offsets
 
     # -------------------------------------------------------------------------
     # Generic
     # -------------------------------------------------------------------------
 
+    @logger_ast
+    def __get_level(self) -> int:
+        # the current node is not in the parent chain (module => level 0)
+        return len(self.__parents)
+
     @logger_ast
     def __get_fullname(self, node: ASTClassFunc) -> str:
-        node_link: NodeLink = self.__link_lst[node]
-        return node.name if isinstance(node_link.parent, ast.Module) \
-            else f"{self.__get_fullname(node_link.parent)}.{node.name}" if \
-            node_link.parent is not None else ""
+        # built from the parent's full name ("" => module)
+        return f"{self.__parents[-1]}{Const.DOT.value}{node.name}" \
+            if self.__parents[-1] else node.name
+
+    @logger_ast
+    def __visit_children(self, node: ASTVisitedNode, fullname: str) -> None:
+        # the parent chain follows the visit
+        self.__parents.append(fullname)
+        self.generic_visit(node)
+        self.__parents.pop()
 
     @staticmethod
     @logger_ast
     def __get_docstring(node: ASTVisitedNode) -> str:
         return str(ast.get_docstring(node))
 
-    @staticmethod
-    def __get_value_from_name(node: ast.Name) -> str:
-        return node.id
-
-    @staticmethod
-    def __get_value_from_constant(
-            node: Union[ast.Constant, ast.NameConstant]) -> str:
-        return node.value if node.value != '' else '""'
-
-    @staticmethod
-    def __get_value_from_num(node: ast.Num) -> str:
-        return str(node.n)
-
-    @staticmethod
-    def __get_value_from_str(node: ast.Str) -> str:
-        return node.s
-
-    def __get_value_from_attribute(self, node: ast.Attribute) -> str:
-        return f"{node.value.id}.{node.attr}" \
-            if isinstance(node.value, ast.Name) \
-            else self.__get_value_from_node(node.value) \
-            if isinstance(node.value, ast.Attribute) else ""
-
-    @staticmethod
-    def __get_value_from_unary(node: ast.UnaryOp) -> str:
-        return f"-{node.operand.id}" \
-            if isinstance(node.operand, ast.Name) else ""
-
-    def __get_value_from_list(self, node: ast.List) -> str:
-        elts_lst: list[str] = [
-            self.__get_value_from_node(elt) for elt in node.elts
-            if isinstance(elt, (ast.Num, ast.Constant, ast.Subscript, ast.Str,
-                                ast.Name, ast.NameConstant, ast.Attribute))]
-        elts = ", ".join(elts_lst)
-        return f"[{elts}]"
-
-    def __get_value_from_subscript(self, node: ast.Subscript) -> str:
-        if isinstance(node.value, ast.Name):
-            curr_value = node.value
-            curr_slice = node.slice
-            _elts = ""
-            # multiple elts
-            if hasattr(curr_slice, "elts"):
-                for elt in curr_slice.elts:
-                    if isinstance(elt, ast.List):
-                        _elts = f"{_elts}{self.__get_value_from_node(elt)}, "
-                    elif isinstance(elt, (ast.Attribute, ast.Subscript,
-                                          ast.Name, ast.Constant)):
-                        _elts = f"{_elts}{self.__get_value_from_node(elt)}, "
-                _elts = _elts[:-2] if _elts.endswith(", ") else _elts
-                return f"{curr_value.id}[{_elts}]"
-            if isinstance(curr_slice, ast.Subscript):
-                _elts = f"[{self.__get_value_from_node(curr_slice)}]"
-            if isinstance(curr_slice, (ast.Name, ast.Attribute)):
-                _elts = f"{self.__get_value_from_node(curr_slice)}"
-            if isinstance(curr_slice, ast.Name):
-                _elts = f"[{_elts}]"
-            return f"{curr_value.id}{_elts}"
-        return ""
+    def __get_segment(self, node: ast.AST) -> Optional[bytes]:
+        lineno: Optional[int] = getattr(node, "lineno", None)
+        if lineno is None or lineno > len(self.__offsets) or \
+                getattr(node, "end_lineno", None) != lineno:
+            return None
+        offset: int = self.__offsets[lineno - 1]
+        return self.__source[offset + getattr(node, "col_offset"):
+                             offset + getattr(node, "end_col_offset")]
 
     @logger_ast
-    def __get_value_from_node(
-            self, node: Union[
-                ast.Name, ast.Constant, ast.NameConstant, ast.Num, ast.Str,
-                ast.Attribute, ast.Subscript, ast.UnaryOp, ast.List]) -> str:
-
-        methode_by_type: dict[Any, Callable[..., str]] = {
-            ast.Name: self.__get_value_from_name,
-            ast.Constant: self.__get_value_from_constant,
-            ast.NameConstant: self.__get_value_from_constant,
-            ast.Num: self.__get_value_from_num,
-            ast.Str: self.__get_value_from_str,
-            ast.Attribute: self.__get_value_from_attribute,
-            ast.List: self.__get_value_from_list,
-            ast.Subscript: self.__get_value_from_subscript,
-            ast.UnaryOp: self.__get_value_from_unary}
-
-        result: str = ""
-        try:
-            result = methode_by_type[type(node)](node)
-        except KeyError:
-            logger.warning(LOG_MSG.unknown_type_of_node.warning,
-                           str(type(node)) + " / " + str(ast.dump(node)))
+    def __get_value_from_node(self, node: ast.AST) -> str:
+        if isinstance(node, ast.Name):
+            return node.id
+        key: Optional[bytes] = self.__get_segment(node)
+        if key is None:
+            return render_expr(node)
+        value: Optional[str] = self.__rendered.get(key)
+        if value is None:
+            value = self.__rendered[key] = render_expr(node)
+        return value
 
-        return result
+    @logger_ast
+    def __get_keyword(self, node: ast.keyword) -> str:
+        value: str = self.__get_value_from_node(node.value)
+        return f"{node.arg}={value}" if node.arg else f"**{value}"
 
     # -------------------------------------------------------------------------
     # Module
@@ -399,14 +764,13 @@ class ObjVisitor(ast.NodeVisitor):
             None
 
         """
-        # Find all objects and set up the level
-        self.__set_level(node)
         # Get docstring if available
         if self.__module_docstring:
             self.__node_lst.append(ModuleDef(
                 docstring=self.__mod_get_docstring(node)))
         # Continue the visit
-        self.generic_visit(node)
+        self.__parents = []
+        self.__visit_children(node, "")
 
     def __mod_get_docstring(self, node: ast.Module) -> str:
         return self.__get_docstring(node)
@@ -433,8 +797,11 @@ class ObjVisitor(ast.NodeVisitor):
                 title=self.__cla_get_title(node),
                 definition=self.__cla_get_def(node),
                 docstring=self.__cla_get_docstring(node),
-                level=self.__link_lst[node].level))
-        self.generic_visit(node)
+                level=self.__get_level(),
+                refs=get_names(chain(
+                    node.bases,
+                    (keyword.value for keyword in node.keywords)))))
+        self.__visit_children(node, self.__get_fullname(node))
 
     @logger_ast
     def __cla_get_title(self, node: ast.ClassDef) -> str:
@@ -446,10 +813,9 @@ class ObjVisitor(ast.NodeVisitor):
 
     @logger_ast
     def __cla_get_inheritance(self, node: ast.ClassDef) -> str:
-        return Tag.COMA.value.join([self.__get_value_from_node(base)
-                                    for base in node.bases
-                                    if isinstance(base,
-                                                  (ast.Name, ast.Attribute))])
+        return Tag.COMA.value.join(
+            [self.__get_value_from_node(base) for base in node.bases] +
+            [self.__get_keyword(keyword) for keyword in node.keywords])
 
     @logger_ast
     def __cla_get_docstring(self, node: ast.ClassDef) -> str:
@@ -472,108 +838,94 @@ class ObjVisitor(ast.NodeVisitor):
             None
 
         """
+        fullname: str = self.__get_fullname(node)
         if self.__func_valid_name(node):
+            info: FuncInfo = self.__func_get_info(node, fullname)
             self.__node_lst.append(NodeDef(
-                title=self.__func_get_title(node),
-                definition=self.__func_get_def(node),
+                title=self.__func_get_title(info),
+                definition=self.__func_get_def(node, info),
                 docstring=self.__func_get_docstring(node),
-                level=self.__link_lst[node].level))
-        self.generic_visit(node)
+                level=self.__get_level(),
+                refs=self.__func_get_refs(node)))
+        self.__visit_children(node, fullname)
 
     @logger_ast
     def __func_valid_name(self, node: ast.FunctionDef) -> bool:
         return self.__private_def or (node.name.startswith("__") is False)
 
     @logger_ast
-    def __func_get_title(self, node: ast.FunctionDef) -> str:
-        title = f"{self.__get_fullname(node)}()"
-        return f"@Property {title}" \
-            if "@property" in self.__func_get_decorator(node) \
+    def __func_get_info(self, node: ast.FunctionDef, fullname: str) \
+            -> FuncInfo:
+        return FuncInfo(
+            fullname=fullname,
+            decorators=self.__func_get_decorator(node),
+            args=self.__func_get_args(node),
+            returns=self.__func_get_return(node))
+
+    @logger_ast
+    def __func_get_title(self, info: FuncInfo) -> str:
+        title = f"{info.fullname}()"
+        return f"@Property {title}" if "@property" in info.decorators \
             else f"{title}"
 
     @logger_ast
-    def __func_get_def(self, node: ast.FunctionDef) -> str:
-        deco: str = Tag.CR.value.join(self.__func_get_decorator(node)) + \
+    def __func_get_def(self, node: ast.FunctionDef, info: FuncInfo) -> str:
+        deco: str = Tag.CR.value.join(info.decorators) + \
                     Tag.CR.value if (hasattr(node, "decorator_list")
                                      and len(node.decorator_list) > 0) else ""
-        return f"{deco}def {self.__get_fullname(node)}" + \
-            f"({self.__func_get_args(node)}){self.__func_get_return(node)}:"
+        return f"{deco}def {info.fullname}({info.args}){info.returns}:"
 
     @logger_ast
     def __func_get_args(self, node: ast.FunctionDef) -> str:
-        argument: list[str] = [arg.arg + self.__func_get_args_annotation(arg)
-                               for arg in node.args.args]
-        if len(node.args.defaults) > 0:
-            def_value: list[str] = [""] * (len(argument) - len(
-                node.args.defaults)) + self.__func_get_args_default(node)
-            argument = [arg + def_value[idx] for idx, arg in
-                        enumerate(argument)]
-        if hasattr(node.args, "vararg") and node.args.vararg:
-            argument.append(
-                f"*{node.args.vararg.arg}" +
-                f"{self.__func_get_args_annotation(node.args.vararg)}")
-        if hasattr(node.args, "kwarg") and node.args.kwarg:
-            argument.append(
-                f"**{node.args.kwarg.arg}" +
-                f"{self.__func_get_args_annotation(node.args.kwarg)}")
-
-        result: str = f"{Tag.COMA.value.join(argument)}"
-        return result
-
-    @logger_ast
-    def __func_get_args_annotation(self, node: ast.arg) -> str:
-        return f": {self.__get_value_from_node(node.annotation)}" \
-            if (hasattr(node, "annotation")
-                and isinstance(node.annotation, (ast.Name,
-                                                 ast.Attribute,
-                                                 ast.Subscript))) \
-            else ""
+        args: ast.arguments = node.args
+        posonlyargs: list[ast.arg] = getattr(args, "posonlyargs", [])
+        positional: list[ast.arg] = posonlyargs + args.args
+        # defaults are the last positional arguments
+        defaults: list[Optional[ast.expr]] = \
+            [None] * (len(positional) - len(args.defaults)) + \
+            list(args.defaults)
+        argument: list[str] = [self.__func_get_arg(arg, default)
+                               for arg, default in zip(positional, defaults)]
+        if posonlyargs:
+            argument.insert(len(posonlyargs), "/")
+        if args.vararg:
+            argument.append(f"*{self.__func_get_arg(args.vararg)}")
+        elif args.kwonlyargs:
+            argument.append("*")
+        argument.extend(self.__func_get_arg(arg, default) for arg, default
+                        in zip(args.kwonlyargs, args.kw_defaults))
+        if args.kwarg:
+            argument.append(f"**{self.__func_get_arg(args.kwarg)}")
+        return Tag.COMA.value.join(argument)
 
     @logger_ast
-    def __func_get_args_default(self, node: ast.FunctionDef) -> list[str]:
-        return [f" = {self.__get_value_from_node(def_value)}"
-                for def_value in node.args.defaults
-                if isinstance(def_value, (ast.Constant,
-                                          ast.NameConstant,
-                                          ast.Num,
-                                          ast.Str,
-                                          ast.Name,
-                                          ast.Attribute,
-                                          ast.UnaryOp))]
+    def __func_get_arg(self, node: ast.arg,
+                       default: Optional[ast.expr] = None) -> str:
+        annotation: str = f": {self.__get_value_from_node(node.annotation)}" \
+            if node.annotation is not None else ""
+        value: str = f" = {self.__get_value_from_node(default)}" \
+            if default is not None else ""
+        return f"{node.arg}{annotation}{value}"
 
     @logger_ast
     def __func_get_decorator(self, node: ast.FunctionDef) -> list[str]:
-        decorator: list[str] = []
-        name: str
-        for dec in node.decorator_list:
-            name = ''
-            if isinstance(dec, (ast.Name, ast.Attribute)):
-                name = self.__get_value_from_node(dec)
-            elif isinstance(dec, ast.Call):
-                if isinstance(dec.func, (ast.Attribute, ast.Name)):
-                    name = self.__get_value_from_node(dec.func)
-                if hasattr(dec, "args"):
-                    name += f"({self.__func_get_decorator_args(dec)})"
-            decorator.append("@" + name)
-        return decorator
-
-    @logger_ast
-    def __func_get_decorator_args(self, node: ast.Call) -> str:
-        # node = Args from Call node
-        return Tag.COMA.value.join([self.__get_value_from_node(attribute)
-                                    for attribute in node.args
-                                    if isinstance(attribute, (ast.Name,
-                                                              ast.Attribute))])
+        return [f"@{self.__get_value_from_node(dec)}"
+                for dec in node.decorator_list]
 
     @logger_ast
     def __func_get_return(self, node: ast.FunctionDef) -> str:
         return f" -> {self.__get_value_from_node(node.returns)}" \
-            if (node.returns is not None
-                and isinstance(node.returns, (ast.Name,
-                                              ast.Constant,
-                                              ast.Attribute,
-                                              ast.Subscript))) \
-            else ""
+            if node.returns is not None else ""
+
+    @logger_ast
+    def __func_get_refs(self, node: ast.FunctionDef) -> tuple[str, ...]:
+        args: ast.arguments = node.args
+        return get_names(chain(
+            (arg.annotation for arg in chain(
+                getattr(args, "posonlyargs", []), args.args,
+                [args.vararg], args.kwonlyargs, [args.kwarg])
+             if arg is not None),
+            [node.returns]))
 
     @logger_ast
     def __func_get_docstring(self, node: ast.FunctionDef) -> str:
@@ -0,0 +1,350 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Docstring2md: batch.
+
+This script is free software; you can redistribute it and/or
+modify it under the terms of the GNU Lesser General Public
+License as published by the Free Software Foundation; either
+version 3 of the License, or (at your option) any later version.
+
+This script is provided in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.
+"""
+from __future__ import annotations
+
+import asyncio
+import json
+import os
+from concurrent.futures import Executor, ProcessPoolExecutor
+from contextlib import ExitStack
+from typing import Any, NamedTuple, Optional, Union
+
+from docstring2md.__config__ import (ASYNC_CONCURRENCY, BATCH_WRITTEN, LOG_MSG,
+                                     ExitStatus)
+from docstring2md.cache import ExtractCache
+from docstring2md.doc2md import DocString2MD, DocString2MDOptions
+from docstring2md.file import MyFile
+from docstring2md.log import logger
+
+
+class BatchEntry(NamedTuple):
+    """Define a package of the manifest.
+
+    Attributes:
+        package (str): /path/to/the/package or <package_name>
+        output (str): /path/to/output/file (None => stdout)
+        toml (str): /path/to/toml/file.toml
+        todo (str): /path/to/todo/file.md
+        mmd (str): /path/to/mermaid/file.mmd
+        split_dir (str): /path/to/the/dir of the pages (None =>
+            <split_dir>/<package> if the batch has a split_dir)
+
+    """
+
+    package: str
+    output: Optional[str] = None
+    toml: Optional[str] = None
+    todo: Optional[str] = None
+    mmd: Optional[str] = None
+    split_dir: Optional[str] = None
+
+
+class BatchResult(NamedTuple):
+    """Define the result of a package.
+
+    Attributes:
+        entry (BatchEntry): package
+        status (ExitStatus): exit status of the package
+        written (bool): True if the output file has been written, False if
+            it is unchanged, None if there is no output file
+
+    """
+
+    entry: BatchEntry
+    status: ExitStatus
+    written: Optional[bool] = None
+
+
+def read_manifest(path: str) -> list[BatchEntry]:
+    """Read the manifest.
+
+    The manifest is a JSON list of objects: package (required), output,
+    toml, todo, mmd and split_dir. The paths are relative to the current
+    directory, like the command line ones.
+
+    Args:
+        path (str): /path/to/manifest.json
+
+    Returns:
+        list[BatchEntry]: packages
+
+    Raises:
+        ValueError: the manifest is not a list of packages
+        OSError: the manifest cannot be read
+
+    Examples:
+        >>> import tempfile
+        >>> with tempfile.NamedTemporaryFile("w", suffix=".json") as file:
+        ...     _ = file.write('[{"package": "json", "output": "json.md"}]')
+        ...     _ = file.flush()
+        ...     read_manifest(file.name)
+        [BatchEntry(package='json', output='json.md', toml=None, todo=None, \
+mmd=None, split_dir=None)]
+
+    """
+    data: Any = json.loads(MyFile.set_path(path).read())
+    if not isinstance(data, list):
+        raise ValueError(f"{path}: a list of packages is expected")
+    entries: list[BatchEntry] = []
+    for item in data:
+        if not isinstance(item, dict) or not item.get("package") or \
+                set(item) - set(BatchEntry._fields):
+            raise ValueError(f"{path}: invalid package {item!r}")
+        entries.append(BatchEntry(**item))
+    return entries
+
+
+class Batch:
+    """Document several packages in one process.
+
+    The packages share the process pool (jobs > 1), the extraction cache
+    and the profiler: the interpreter, the imports and the workers are
+    started once. A failed package does not stop the batch: all the
+    statuses are reported at the end.
+
+    Examples:
+        >>> import tempfile
+        >>> tmp = tempfile.TemporaryDirectory()
+        >>> batch = Batch([
+        ...     BatchEntry("json", f"{tmp.name}/json.md"),
+        ...     BatchEntry("oups", f"{tmp.name}/oups.md")],
+        ...     DocString2MDOptions(
+        ...         toml=MyFile.set_path(None), uml=MyFile.set_path(None),
+        ...         todo=MyFile.set_path(None), output=MyFile.set_path(None),
+        ...         toc=True, private_def=False))
+        >>> batch.run()
+        <ExitStatus.EX_OSFILE: 72>
+        >>> [result.status for result in batch.results]
+        [<ExitStatus.EX_OK: 0>, <ExitStatus.EX_OSFILE: 72>]
+        >>> print(batch.get_report())
+        EX_OK         written    json => ...json.md
+        EX_OSFILE                oups => ...oups.md
+        >>> # same doc: the file is not written again
+        >>> _ = batch.run()
+        >>> [result.written for result in batch.results]
+        [False, None]
+        >>> # split output: one directory per package
+        >>> import json
+        >>> batch = Batch([BatchEntry("json"), BatchEntry("html"), BatchEntry(
+        ...     os.path.dirname(json.__file__))], DocString2MDOptions(
+        ...     toml=MyFile.set_path(None), uml=MyFile.set_path(None),
+        ...     todo=MyFile.set_path(None), output=MyFile.set_path(None),
+        ...     toc=True, private_def=False, split_dir=tmp.name))
+        >>> [os.path.relpath(str(entry.split_dir), tmp.name)
+        ...  for entry in batch.entries]
+        ['json', 'html', 'json-3']
+        >>> _ = batch.run()
+        >>> sorted(os.listdir(f"{tmp.name}/html"))
+        ['README.md', 'html.md', 'html.parser.md']
+        >>> tmp.cleanup()
+
+    """
+
+    __entries: list[BatchEntry]
+    __options: DocString2MDOptions
+    __results: list[BatchResult]
+
+    def __init__(self, entries: list[BatchEntry],
+                 options: DocString2MDOptions) -> None:
+        """Init the batch.
+
+        Args:
+            entries (list[BatchEntry]): packages
+            options (DocString2MDOptions): options shared by the packages
+                (toml, uml, todo, output and split_dir are replaced by the
+                package's ones)
+
+        """
+        self.__entries = self.__get_split_dirs(entries, options.split_dir)
+        self.__options = options
+        self.__results = []
+
+    @property
+    def entries(self) -> list[BatchEntry]:
+        """Get the packages (with their split_dir)."""
+        return self.__entries
+
+    @property
+    def results(self) -> list[BatchResult]:
+        """Get the results of the last run."""
+        return self.__results
+
+    @staticmethod
+    def __get_split_dirs(entries: list[BatchEntry],
+                         split_dir: Optional[str]) -> list[BatchEntry]:
+        # the pages and the README.md index of a package are written in
+        # <split_dir>/<package>: the packages do not overwrite each other
+        if not split_dir:
+            return list(entries)
+        used: set[str] = {
+            os.path.normpath(entry.split_dir) for entry in entries
+            if entry.split_dir}
+        result: list[BatchEntry] = []
+        for idx, entry in enumerate(entries, 1):
+            if entry.split_dir:
+                result.append(entry)
+                continue
+            path: str = os.path.join(split_dir, os.path.basename(
+                os.path.normpath(entry.package)))
+            if os.path.normpath(path) in used:
+                path = f"{path}-{idx}"
+            used.add(os.path.normpath(path))
+            result.append(entry._replace(split_dir=path))
+        return result
+
+    def run(self) -> ExitStatus:
+        """Document all the packages.
+
+        Returns:
+            ExitStatus: EX_OK if all the packages are documented, the
+            status of the first failed package otherwise
+
+        """
+        self.__results = []
+        with ExitStack() as stack:
+            options: DocString2MDOptions = self.__get_options(stack)
+            for entry in self.__entries:
+                self.__results.append(self.__run_entry(entry, options))
+        return self.__get_status()
+
+    async def arun(self, concurrency: int = ASYNC_CONCURRENCY) \
+            -> ExitStatus:
+        """Document all the packages without blocking the event loop.
+
+        The packages are documented concurrently (aimport_module and
+        awritedoc), at most concurrency at a time. The results are in the
+        manifest order. The profiler is not used: the phases of the
+        packages would overlap.
+
+        Args:
+            concurrency (int): number of packages documented at a time
+
+        Returns:
+            ExitStatus: same as run
+
+        Examples:
+            >>> import tempfile
+            >>> tmp = tempfile.TemporaryDirectory()
+            >>> batch = Batch([
+            ...     BatchEntry("json", f"{tmp.name}/json.md"),
+            ...     BatchEntry("oups", f"{tmp.name}/oups.md")],
+            ...     DocString2MDOptions(
+            ...         toml=MyFile.set_path(None), uml=MyFile.set_path(None),
+            ...         todo=MyFile.set_path(None),
+            ...         output=MyFile.set_path(None), toc=True,
+            ...         private_def=False))
+            >>> asyncio.run(batch.arun(concurrency=2))
+            <ExitStatus.EX_OSFILE: 72>
+            >>> [result.entry.package for result in batch.results]
+            ['json', 'oups']
+            >>> [result.written for result in batch.results]
+            [True, None]
+            >>> tmp.cleanup()
+
+        """
+        limit: asyncio.Semaphore = asyncio.Semaphore(max(1, concurrency))
+        with ExitStack() as stack:
+            options: DocString2MDOptions = self.__get_options(stack)._replace(
+                profiler=None)
+            self.__results = list(await asyncio.gather(*(
+                self.__arun_entry(entry, options, limit)
+                for entry in self.__entries)))
+        return self.__get_status()
+
+    def __get_options(self, stack: ExitStack) -> DocString2MDOptions:
+        # one process pool and one cache for all the packages
+        executor: Optional[Executor] = stack.enter_context(
+            ProcessPoolExecutor(max_workers=self.__options.jobs)) \
+            if self.__options.jobs > 1 else None
+        return self.__options._replace(
+            executor=executor,
+            extract_cache=self.__options.extract_cache or (
+                ExtractCache(self.__options.cache.path)
+                if self.__options.cache.path else None))
+
+    def __get_status(self) -> ExitStatus:
+        failed: list[BatchResult] = [
+            result for result in self.__results
+            if result.status is not ExitStatus.EX_OK]
+        if failed:
+            logger.error(LOG_MSG.batch_result.error, len(failed))
+            return failed[0].status
+        return ExitStatus.EX_OK
+
+    @staticmethod
+    def __get_module(entry: BatchEntry,
+                     options: DocString2MDOptions) -> DocString2MD:
+        logger.info(LOG_MSG.batch_package.info, entry.package, entry.output)
+        return DocString2MD(entry.package, options._replace(
+            toml=MyFile.set_path(entry.toml),
+            uml=MyFile.set_path(entry.mmd),
+            todo=MyFile.set_path(entry.todo),
+            output=MyFile.set_path(entry.output),
+            split_dir=entry.split_dir))
+
+    @staticmethod
+    def __import_failed(entry: BatchEntry,
+                        error: Union[ExitStatus, Exception]) -> BatchResult:
+        # the package cannot be read: the next ones are documented
+        if isinstance(error, ExitStatus):
+            logger.error(LOG_MSG.batch_package.error, entry.package,
+                         error.name)
+            return BatchResult(entry, error)
+        logger.error(LOG_MSG.batch_package.error, entry.package, error)
+        return BatchResult(entry, ExitStatus.EX_OSFILE)
+
+    @staticmethod
+    def __run_entry(entry: BatchEntry,
+                    options: DocString2MDOptions) -> BatchResult:
+        module: DocString2MD = Batch.__get_module(entry, options)
+        try:
+            status: ExitStatus = module.import_module()
+        except (ImportError, SyntaxError, ValueError, OSError) as err:
+            return Batch.__import_failed(entry, err)
+        if status is not ExitStatus.EX_OK:
+            return Batch.__import_failed(entry, status)
+        return BatchResult(entry, module.writedoc(), module.written)
+
+    @staticmethod
+    async def __arun_entry(entry: BatchEntry, options: DocString2MDOptions,
+                           limit: asyncio.Semaphore) -> BatchResult:
+        async with limit:
+            module: DocString2MD = Batch.__get_module(entry, options)
+            try:
+                status: ExitStatus = await module.aimport_module()
+            except (ImportError, SyntaxError, ValueError, OSError) as err:
+                return Batch.__import_failed(entry, err)
+            if status is not ExitStatus.EX_OK:
+                return Batch.__import_failed(entry, status)
+            return BatchResult(entry, await module.awritedoc(),
+                               module.written)
+
+    def get_report(self) -> str:
+        """Get the status of each package.
+
+        Returns:
+            str: one line per package
+
+        """
+        return "\n".join(
+            f"{result.status.name:<14}"
+            f"{BATCH_WRITTEN.get(result.written, ''):<11}"
+            f"{result.entry.package} => {result.entry.output or 'stdout'}"
+            for result in self.__results)
+
+
+if __name__ == "__main__":
+    import doctest
+    doctest.testmod()
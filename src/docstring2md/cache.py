@@ -0,0 +1,346 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Docstring2md: cache.
+
+This script is free software; you can redistribute it and/or
+modify it under the terms of the GNU Lesser General Public
+License as published by the Free Software Foundation; either
+version 3 of the License, or (at your option) any later version.
+
+This script is provided in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.
+"""
+from __future__ import annotations
+
+import hashlib
+import os
+import pickle
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Optional, Union
+
+from docstring2md.__about__ import __version__
+from docstring2md.__config__ import (CACHE_FORMAT, CACHE_MAX_SIZE,
+                                     CACHE_MEMORY_ENTRIES, CACHE_SUFFIX,
+                                     CACHE_TMP_MAX_AGE, CACHE_TMP_PREFIX,
+                                     LOG_MSG)
+from docstring2md.ast_engine import NodeListType
+from docstring2md.file import SourceType
+from docstring2md.log import logger
+
+
+class ExtractCache:
+    """Content-addressed cache of the extracted nodes.
+
+    Each entry is a pickled node list stored in the cache directory. The
+    key is a hash of the source, the tool version and the extraction
+    options. The cache is bounded by max_size (bytes): the least recently
+    used entries are evicted first (the mtime of an entry is its last use).
+    The cache can be shared by threads (Batch.arun): the index of the
+    entries is updated under a lock, the files are read and written out of
+    it. It can be shared by processes too: a key missing in the index is
+    looked for on disk.
+
+    Examples:
+        >>> import tempfile
+        >>> from collections import deque
+        >>> from docstring2md.ast_engine import ModuleDef
+        >>> tmp = tempfile.TemporaryDirectory()
+        >>> cache = ExtractCache(tmp.name)
+        >>> key = cache.get_key("source", module_docstring=True)
+        >>> key == cache.get_key("source", module_docstring=False)
+        False
+        >>> cache.get(key) is None
+        True
+        >>> cache.put(key, deque([ModuleDef(docstring="Title:")]))
+        >>> cache.get(key)
+        deque([ModuleDef(docstring='Title:')])
+        >>> # LRU eviction
+        >>> cache = ExtractCache(tmp.name, max_size=0)
+        >>> cache.put(key, deque([ModuleDef(docstring="Title:")]))
+        >>> cache.get(key) is None
+        True
+        >>> # shared by threads: an entry evicted by another thread is a miss
+        >>> from concurrent.futures import ThreadPoolExecutor
+        >>> cache = ExtractCache(tmp.name, max_size=1024)
+        >>> keys = [cache.get_key(str(index)) for index in range(8)]
+        >>> def use(key):
+        ...     for _ in range(50):
+        ...         cache.put(key, deque([ModuleDef(docstring=key)]))
+        ...         node_lst = cache.get(key)
+        ...         if node_lst is not None and node_lst[0].docstring != key:
+        ...             return False
+        ...     return True
+        >>> with ThreadPoolExecutor(max_workers=8) as executor:
+        ...     all(executor.map(use, keys))
+        True
+        >>> # shared by processes: an entry written by another cache
+        >>> other = ExtractCache(tmp.name)
+        >>> key = cache.get_key("other")
+        >>> other.put(key, deque([ModuleDef(docstring="Other:")]))
+        >>> cache.get(key)
+        deque([ModuleDef(docstring='Other:')])
+        >>> # the stale temp files (interrupted put) are removed at init
+        >>> stale = Path(tmp.name) / f"{CACHE_TMP_PREFIX}stale"
+        >>> stale.touch()
+        >>> os.utime(stale, (0, 0))
+        >>> _ = ExtractCache(tmp.name)
+        >>> stale.exists()
+        False
+        >>> tmp.cleanup()
+
+    """
+
+    __path: Path
+    __max_size: int
+    __size: int
+    __entries: OrderedDict[str, int]
+    __lock: threading.Lock
+
+    def __init__(self, path: Union[str, Path],
+                 max_size: int = CACHE_MAX_SIZE) -> None:
+        """Init the cache.
+
+        The directory is created if needed and the existing entries are
+        loaded from the oldest to the most recently used one. The temp files
+        left by an interrupted put are removed (the recent ones can be
+        written by another process).
+
+        Args:
+            path (str | Path): /path/to/the/cache/dir
+            max_size (int): maximum size of the cache (bytes)
+
+        """
+        self.__path = Path(path)
+        self.__path.mkdir(parents=True, exist_ok=True)
+        self.__max_size = max_size
+        self.__entries = OrderedDict()
+        self.__lock = threading.Lock()
+        stale: float = time.time() - CACHE_TMP_MAX_AGE
+        for entry in self.__path.glob(f"{CACHE_TMP_PREFIX}*"):
+            try:
+                if entry.stat().st_mtime < stale:
+                    entry.unlink()
+            except OSError:
+                pass
+        stats: list[tuple[float, str, int]] = []
+        for entry in self.__path.glob(f"*{CACHE_SUFFIX}"):
+            stat = entry.stat()
+            stats.append((stat.st_mtime, entry.stem, stat.st_size))
+        for _mtime, key, size in sorted(stats):
+            self.__entries[key] = size
+        self.__size = sum(self.__entries.values())
+        logger.info(LOG_MSG.cache.info, self.__path)
+
+    @property
+    def path(self) -> Path:
+        """Get the cache directory."""
+        return self.__path
+
+    @staticmethod
+    def get_key(source: SourceType, module_docstring: bool = False,
+                private_def: bool = False) -> str:
+        """Get the key of a source.
+
+        Args:
+            source (SourceType): source code (str, bytes or mmap)
+            module_docstring (bool): get module docstring
+            private_def (bool): get private functions
+
+        Returns:
+            str: key
+
+        """
+        hasher = hashlib.sha256(
+            f"{__version__}:{CACHE_FORMAT}:{module_docstring}:{private_def}:"
+            .encode())
+        hasher.update(source.encode() if isinstance(source, str) else source)
+        return hasher.hexdigest()
+
+    def __entry(self, key: str) -> Path:
+        return self.__path / f"{key}{CACHE_SUFFIX}"
+
+    def get(self, key: str) -> Optional[NodeListType]:
+        """Get the node list stored with this key.
+
+        Args:
+            key (str): key
+
+        Returns:
+            NodeListType if the key is in the cache, None otherwise.
+
+        """
+        # a key missing in the index can be written by another process
+        entry: Path = self.__entry(key)
+        try:
+            with open(entry, "rb") as file:
+                size: int = os.fstat(file.fileno()).st_size
+                node_lst: NodeListType = pickle.load(file)
+            os.utime(entry)
+        except FileNotFoundError:
+            # missing or evicted in the meantime
+            return None
+        except (OSError, EOFError, pickle.UnpicklingError, AttributeError,
+                ImportError) as err:
+            logger.warning(LOG_MSG.cache.warning, err)
+            with self.__lock:
+                self.__remove(key)
+            return None
+        with self.__lock:
+            if key in self.__entries:
+                self.__entries.move_to_end(key)
+            else:
+                self.__size += size
+                self.__entries[key] = size
+                self.__evict()
+        logger.debug(LOG_MSG.cache.debug, key)
+        return node_lst
+
+    def put(self, key: str, node_lst: NodeListType) -> None:
+        """Store a node list.
+
+        The entry is written atomically (temp file + rename): the temp file
+        is removed on error.
+
+        Args:
+            key (str): key
+            node_lst (NodeListType): node list
+
+        """
+        data: bytes = pickle.dumps(node_lst, pickle.HIGHEST_PROTOCOL)
+        tmp_name: str = ""
+        try:
+            with tempfile.NamedTemporaryFile(
+                    dir=self.__path, prefix=CACHE_TMP_PREFIX,
+                    delete=False) as file:
+                tmp_name = file.name
+                file.write(data)
+            os.replace(tmp_name, self.__entry(key))
+        except OSError as err:
+            logger.warning(LOG_MSG.cache.warning, err)
+            try:
+                if tmp_name:
+                    os.unlink(tmp_name)
+            except OSError:
+                pass
+            return
+        with self.__lock:
+            self.__size += len(data) - self.__entries.pop(key, 0)
+            self.__entries[key] = len(data)
+            self.__evict()
+
+    def __remove(self, key: str) -> None:
+        # the lock must be held
+        self.__size -= self.__entries.pop(key, 0)
+        try:
+            self.__entry(key).unlink()
+        except OSError:
+            pass
+
+    def __evict(self) -> None:
+        while self.__entries and self.__size > self.__max_size:
+            key = next(iter(self.__entries))
+            logger.debug(LOG_MSG.cache_evict.debug, key)
+            self.__remove(key)
+
+
+class MemoryCache:
+    """In-memory cache of the extracted nodes, shared by several threads.
+
+    Same keys as ExtractCache (hash of the source and of the options). The
+    cache is bounded by max_entries: the least recently used node lists
+    are evicted first. The entries missing in memory can be read from an
+    ExtractCache (backend): the disk is read and written out of the lock.
+    A cached node list is only read (the nodes are rendered on demand,
+    nothing is stored on them): it can be shared by the threads.
+
+    Examples:
+        >>> from collections import deque
+        >>> from docstring2md.ast_engine import NodeDef
+        >>> cache = MemoryCache(max_entries=1)
+        >>> key = cache.get_key(b"def f(): pass")
+        >>> cache.put(key, deque([NodeDef("f()", "def f():", "Doc.", 0)]))
+        >>> cache.get(key)[0].get_definition().splitlines()
+        ['```python', 'def f():', '```']
+        >>> cache.put(cache.get_key(b""), deque())
+        >>> cache.get(key) is None
+        True
+
+    """
+
+    __entries: OrderedDict[str, NodeListType]
+    __max_entries: int
+    __backend: Optional[ExtractCache]
+    __lock: threading.Lock
+
+    def __init__(self, max_entries: int = CACHE_MEMORY_ENTRIES,
+                 backend: Optional[ExtractCache] = None) -> None:
+        """Init the cache.
+
+        Args:
+            max_entries (int): maximum number of node lists
+            backend (ExtractCache): on-disk cache (None => memory only)
+
+        """
+        self.__entries = OrderedDict()
+        self.__max_entries = max_entries
+        self.__backend = backend
+        self.__lock = threading.Lock()
+
+    get_key = staticmethod(ExtractCache.get_key)
+
+    def get(self, key: str) -> Optional[NodeListType]:
+        """Get the node list stored with this key.
+
+        Args:
+            key (str): key
+
+        Returns:
+            NodeListType if the key is in the cache, None otherwise.
+
+        """
+        with self.__lock:
+            node_lst: Optional[NodeListType] = self.__entries.get(key)
+            if node_lst is not None:
+                self.__entries.move_to_end(key)
+                return node_lst
+        if self.__backend is None:
+            return None
+        # read out of the lock: the other threads are not blocked by the
+        # disk (the backend has its own lock)
+        node_lst = self.__backend.get(key)
+        if node_lst is not None:
+            with self.__lock:
+                self.__add(key, node_lst)
+        return node_lst
+
+    def put(self, key: str, node_lst: NodeListType) -> None:
+        """Store a node list.
+
+        Args:
+            key (str): key
+            node_lst (NodeListType): node list
+
+        """
+        if self.__backend is not None:
+            self.__backend.put(key, node_lst)
+        with self.__lock:
+            self.__add(key, node_lst)
+
+    def __add(self, key: str, node_lst: NodeListType) -> None:
+        self.__entries[key] = node_lst
+        self.__entries.move_to_end(key)
+        while len(self.__entries) > self.__max_entries:
+            logger.debug(LOG_MSG.cache_evict.debug,
+                         next(iter(self.__entries)))
+            self.__entries.popitem(last=False)
+
+
+if __name__ == "__main__":
+    import doctest
+    doctest.testmod()
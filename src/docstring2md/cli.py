@@ -14,16 +14,18 @@ import argparse
 import logging
 import sys
 import textwrap
-
-from rich_argparse import RawDescriptionRichHelpFormatter
+from functools import lru_cache
+from typing import Optional
 
 from docstring2md.__about__ import (__script_descr__, __script_epilog__,
                                     __version__)
 from docstring2md.__config__ import (ARG_HIGHLIGHT, ARG_STYLE, CHK_PYT_MIN,
-                                     LOG_MSG, Const, ExitStatus)
+                                     LOG_MSG, PROFILE_TRACE_SUFFIX, Const,
+                                     ExitStatus)
 from docstring2md.doc2md import DocString2MD, DocString2MDOptions
 from docstring2md.file import MyFile
-from docstring2md.log import define_logfile, logger
+from docstring2md.log import define_logfile, logger, setup_logging
+from docstring2md.profiler import Profiler
 
 
 # ------------------------------------------------------------------------------
@@ -56,6 +58,41 @@ def check_python() -> bool:
 # ------------------------------------------------------------------------------
 # arguments and options
 # ------------------------------------------------------------------------------
+@lru_cache(maxsize=None)
+def get_formatter_class() -> type[argparse.HelpFormatter]:
+    """Get the rich help formatter.
+
+    rich_argparse is imported the first time a help, a usage or an error
+    is formatted: a run does not pay for it.
+
+    Returns:
+        type[argparse.HelpFormatter]: RawDescriptionRichHelpFormatter
+
+    """
+    # pylint: disable-next=import-outside-toplevel
+    from rich_argparse import RawDescriptionRichHelpFormatter
+    RawDescriptionRichHelpFormatter.styles.update(ARG_STYLE)
+    RawDescriptionRichHelpFormatter.highlights.extend(ARG_HIGHLIGHT)
+    return RawDescriptionRichHelpFormatter
+
+
+def get_formatter(*, prog: str) -> argparse.HelpFormatter:
+    """Get the help formatter (argparse formatter_class).
+
+    Args:
+        prog (str): program name
+
+    Returns:
+        argparse.HelpFormatter: rich help formatter
+
+    Examples:
+        >>> type(get_formatter(prog="x")).__name__
+        'RawDescriptionRichHelpFormatter'
+
+    """
+    return get_formatter_class()(prog=prog)
+
+
 def get_argparser() -> argparse.ArgumentParser:
     """Define the argument parser.
 
@@ -69,14 +106,11 @@ def get_argparser() -> argparse.ArgumentParser:
         >>> type(a)
         <class 'argparse.ArgumentParser'>
     """
-    RawDescriptionRichHelpFormatter.styles.update(ARG_STYLE)
-    RawDescriptionRichHelpFormatter.highlights.extend(ARG_HIGHLIGHT)
-
     version: str = f'%(prog)s {__version__}'
     parser: argparse.ArgumentParser = argparse.ArgumentParser(
         description=__script_descr__,
         epilog=__script_epilog__,
-        formatter_class=RawDescriptionRichHelpFormatter)
+        formatter_class=get_formatter)
     parser.add_argument(
         '--version',
         help="show version and exit",
@@ -101,17 +135,47 @@ def get_argparser() -> argparse.ArgumentParser:
         '--private-def',
         help='Enable the table of contents',
         default=False, action='store_true')
+    parser.add_argument(
+        '--xref',
+        help='link the annotations, bases and backticked names to their '
+             'objects',
+        default=False, action='store_true')
+    parser.add_argument(
+        '--watch',
+        help='stay resident and update the doc when a file changes',
+        default=False, action='store_true')
+    parser.add_argument(
+        '--no-import',
+        help='discover the modules without importing the package',
+        default=False, action='store_true')
+    parser.add_argument(
+        '--profile',
+        help='log the time spent in each phase and the slowest modules',
+        default=False, action='store_true')
     # New groups
     required_argument = parser.add_argument_group(
         'required arguments')
     optional_argument = parser.add_argument_group(
         'optional arguments')
-    required_argument.add_argument(
+    source_argument = required_argument.add_mutually_exclusive_group(
+        required=True)
+    source_argument.add_argument(
         '-p', '--package',
         help=textwrap.dedent('''
-        define the /path/to/the/package or <package_name>
-        '''),
-        required=True)
+        define the /path/to/the/package, <package_name> or
+        /path/to/the/archive (.whl, .zip, .tar.gz)
+        '''))
+    source_argument.add_argument(
+        '--manifest',
+        help=textwrap.dedent('''\
+        /path/to/manifest.json (batch mode: list of package, output, toml,
+        todo, mmd and split_dir)
+        '''))
+    source_argument.add_argument(
+        '--serve',
+        help=textwrap.dedent('''\
+        host:port or /path/to/socket (daemon mode: GET /render?package=...)
+        '''))
     optional_argument.add_argument(
         '-o', '--output-file',
         help=textwrap.dedent('''\
@@ -132,10 +196,129 @@ def get_argparser() -> argparse.ArgumentParser:
         help=textwrap.dedent('''\
         /path/to/mermaid/file.mmd
         '''))
+    optional_argument.add_argument(
+        '--split-dir',
+        help=textwrap.dedent('''\
+        /path/to/dir (one Markdown file per module and a README.md index,
+        batch mode: one sub-directory per package)
+        '''))
+    optional_argument.add_argument(
+        '--index-db',
+        help=textwrap.dedent('''\
+        /path/to/index.sqlite (symbols and full-text docstring search)
+        '''))
+    optional_argument.add_argument(
+        '--git-rev',
+        help=textwrap.dedent('''\
+        document the package at this git revision (branch, tag, commit)
+        without checking it out
+        '''))
+    optional_argument.add_argument(
+        '--cache-dir',
+        help=textwrap.dedent('''\
+        /path/to/cache/dir (extraction cache)
+        '''))
+    optional_argument.add_argument(
+        '-j', '--jobs',
+        help=textwrap.dedent('''\
+        number of processes used to extract the modules
+        '''),
+        type=int, default=1)
+    optional_argument.add_argument(
+        '--profile-output',
+        help=textwrap.dedent('''\
+        /path/to/profile (.json => Chrome trace, cProfile stats otherwise)
+        '''))
 
     return parser
 
 
+def get_profiler(args: argparse.Namespace) -> Optional[Profiler]:
+    """Get the profiler defined by the options.
+
+    Args:
+        args (argparse.Namespace): arguments
+
+    Returns:
+        Profiler if --profile or --profile-output is used, None otherwise.
+
+    Examples:
+        >>> args = get_argparser().parse_args(["-p", "json"])
+        >>> get_profiler(args) is None
+        True
+        >>> args = get_argparser().parse_args(["-p", "json", "--profile"])
+        >>> get_profiler(args).events
+        []
+
+    """
+    if not args.profile and not args.profile_output:
+        return None
+    output: str = args.profile_output or ""
+    trace: bool = output.endswith(PROFILE_TRACE_SUFFIX)
+    return Profiler(cprofile=bool(output) and not trace, trace=trace)
+
+
+def write_profile(profiler: Profiler, output: Optional[str]) -> None:
+    """Stop the profiler, log the report and write the profile.
+
+    Args:
+        profiler (Profiler): started profiler
+        output (str): /path/to/profile (None => no file)
+
+    """
+    profiler.stop()
+    logger.info(LOG_MSG.elapse_time.info, f"{profiler.elapse:.3f}")
+    logger.info(LOG_MSG.profile.info, profiler.get_report())
+    if not output:
+        return
+    try:
+        if output.endswith(PROFILE_TRACE_SUFFIX):
+            profiler.write_trace(output)
+        else:
+            profiler.write_stats(output)
+    except OSError as err:
+        logger.error(LOG_MSG.profile_output.error, err)
+        return
+    logger.info(LOG_MSG.profile_output.info, output)
+
+
+def run_batch(args: argparse.Namespace,
+              options: DocString2MDOptions) -> ExitStatus:
+    """Document the packages of the manifest.
+
+    The shared options (toc, private-def, cache, jobs...) are used for all
+    packages. The status of each package is logged at the end.
+
+    Args:
+        args (argparse.Namespace): arguments
+        options (DocString2MDOptions): shared options
+
+    Returns:
+        ExitStatus: EX_OK if all the packages are documented, EX_CONFIG if
+        the manifest cannot be read, the first error otherwise
+
+    """
+    # loaded on demand: not used by a single package
+    # pylint: disable-next=import-outside-toplevel
+    from docstring2md.batch import Batch, BatchEntry, read_manifest
+    try:
+        entries: list[BatchEntry] = read_manifest(args.manifest)
+    except (OSError, ValueError, TypeError) as err:
+        logger.error(LOG_MSG.batch.error, err)
+        return ExitStatus.EX_CONFIG
+    logger.info(LOG_MSG.batch.info, len(entries), args.manifest)
+    if args.watch:
+        logger.warning(LOG_MSG.batch.warning)
+    batch: Batch = Batch(entries, options)
+    if options.profiler is not None:
+        options.profiler.start()
+    status: ExitStatus = batch.run()
+    if options.profiler is not None:
+        write_profile(options.profiler, args.profile_output)
+    logger.info(LOG_MSG.batch_result.info, batch.get_report())
+    return status
+
+
 def run() -> ExitStatus:
     """Manage options and analyse modules.
 
@@ -150,6 +333,7 @@ def run() -> ExitStatus:
         return EX_CANTCREAT: 73 -> can't create the file
         return EX_IOERR: 74 -> write error
     """
+    setup_logging()
     parser: argparse.ArgumentParser = get_argparser()
     args: argparse.Namespace = parser.parse_args()
 
@@ -162,21 +346,44 @@ def run() -> ExitStatus:
     if not check_python():
         return ExitStatus.EX_CONFIG
 
-    module_name: str = args.package
+    profiler: Optional[Profiler] = get_profiler(args)
     options: DocString2MDOptions = DocString2MDOptions(
         toml=MyFile.set_path(args.toml_file),
         uml=MyFile.set_path(args.mermaid_file),
         todo=MyFile.set_path(args.todo_file),
         output=MyFile.set_path(args.output_file),
         toc=args.toc,
-        private_def=args.private_def
+        private_def=args.private_def,
+        cache=MyFile.set_path(args.cache_dir),
+        jobs=args.jobs,
+        no_import=args.no_import,
+        profiler=profiler,
+        split_dir=args.split_dir,
+        index_db=args.index_db,
+        xref=args.xref,
+        git_rev=args.git_rev
     )
-    module: DocString2MD = DocString2MD(module_name, options)
+    if args.manifest:
+        return run_batch(args, options)
+    if args.serve:
+        # pylint: disable-next=import-outside-toplevel
+        from docstring2md.daemon import serve
+        return serve(args.serve, options)
+    module: DocString2MD = DocString2MD(args.package, options)
+    if profiler is not None:
+        profiler.start()
     status: ExitStatus = module.import_module()
     if status is not ExitStatus.EX_OK:
         logger.error(LOG_MSG.new_module.error)
         return status
-    return module.writedoc()
+    status = module.writedoc()
+    if profiler is not None:
+        write_profile(profiler, args.profile_output)
+    if args.watch and status is ExitStatus.EX_OK:
+        # pylint: disable-next=import-outside-toplevel
+        from docstring2md.watch import watch
+        return watch(module)
+    return status
 
 
 if __name__ == "__main__":
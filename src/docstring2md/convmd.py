@@ -17,16 +17,76 @@ from __future__ import annotations
 import html
 import re
 import textwrap
-from functools import wraps
+from functools import partial, wraps
 from typing import Any, Callable, TypeVar, cast
 
 from docstring2md.__config__ import Tag
 
 F = TypeVar('F', bound=Callable[..., Any])
+Transform = Callable[[str], str]
+CONVMD_ATTR = "__convmd__"
 
 
 class ConvMD:
-    """Prepare MD string."""
+    """Prepare MD string.
+
+    Each decorator is a transform (str => str) applied to the result of the
+    decorated function. The transforms of stacked decorators are merged
+    when the function is defined: the function is wrapped once and the
+    transforms are applied in a loop, from the inner to the outer one.
+
+    Examples:
+        >>> @ConvMD.add_tag("<", ">")
+        ... @ConvMD.repl_str("a", "b")
+        ... def return_test() -> str:
+        ...     return "a"
+        >>> print(return_test())
+        <b>
+        >>> func, transforms = getattr(return_test, CONVMD_ATTR)
+        >>> func.__name__, len(transforms)
+        ('return_test', 2)
+
+    """
+
+    @staticmethod
+    def transform(*transforms: Transform) -> Callable[[F], F]:
+        """Apply transforms to the result of a function.
+
+        If the function is already decorated by ConvMD, the transforms are
+        added to the existing wrapper's ones.
+
+        Args:
+            transforms (Transform): str => str functions
+
+        Returns:
+            Callable[[F], F]
+
+        Examples:
+            >>> @ConvMD.transform(str.upper, str.strip)
+            ... def return_test() -> str:
+            ...     return " test "
+            >>> print(return_test())
+            TEST
+
+        """
+        def tags_decorator(func: F) -> F:
+            """Decorate."""
+            inner: Callable[..., str]
+            inner_transforms: tuple[Transform, ...]
+            inner, inner_transforms = getattr(func, CONVMD_ATTR, (func, ()))
+            all_transforms: tuple[Transform, ...] = \
+                inner_transforms + transforms
+
+            @wraps(inner)
+            def func_wrapper(*args: Any, **kwargs: Any) -> Any:
+                """Wrapp."""
+                ret: str = inner(*args, **kwargs)
+                for func_transform in all_transforms:
+                    ret = func_transform(ret)
+                return ret
+            setattr(func_wrapper, CONVMD_ATTR, (inner, all_transforms))
+            return cast(F, func_wrapper)
+        return tags_decorator
 
     @staticmethod
     def repl_str(old_string: str, new_string: str) -> Callable[[F], F]:
@@ -48,14 +108,9 @@ class ConvMD:
             my function is ok !
 
         """
-        def tags_decorator(func: F) -> F:
-            """Decorate."""
-            @wraps(func)
-            def func_wrapper(*args: Any, **kwargs: Any) -> Any:
-                """Wrapp."""
-                return (func(*args, **kwargs)).replace(old_string, new_string)
-            return cast(F, func_wrapper)
-        return tags_decorator
+        def repl_str(text: str) -> str:
+            return text.replace(old_string, new_string)
+        return ConvMD.transform(repl_str)
 
     @staticmethod
     def repl_beg_end(
@@ -63,6 +118,9 @@ class ConvMD:
             -> Callable[[F], F]:
         """Replace the beginning and the end.
 
+        The regexp is compiled once, when the function is decorated, and
+        all lines are replaced in one pass.
+
         Args:
             begin_regexp (str)
             end_regexp (str)
@@ -83,18 +141,10 @@ class ConvMD:
             >my function docstring<br />
 
         """
-        def tags_decorator(func: F) -> F:
-            """Decorate."""
-            @wraps(func)
-            def func_wrapper(*args: Any, **kwargs: Any) -> Any:
-                """Wrapp."""
-                return re.sub(
-                    begin_regexp + r'(\S.*)' + end_regexp,
-                    begin_tag + r'\1' + end_tag,
-                    func(*args, **kwargs),
-                    flags=re.MULTILINE)
-            return cast(F, func_wrapper)
-        return tags_decorator
+        pattern: re.Pattern[str] = re.compile(
+            begin_regexp + r'(\S.*)' + end_regexp, flags=re.MULTILINE)
+        return ConvMD.transform(
+            partial(pattern.sub, begin_tag + r'\1' + end_tag))
 
     @staticmethod
     def add_tag(begin_tag: str, end_tag: str) -> Callable[[F], F]:
@@ -117,14 +167,9 @@ class ConvMD:
             __test__
 
         """
-        def tags_decorator(func: F) -> F:
-            """Decorate."""
-            @wraps(func)
-            def func_wrapper(*args: Any, **kwargs: Any) -> Any:
-                """Wrapp."""
-                return f"{begin_tag}{func(*args, **kwargs)}{end_tag}"
-            return cast(F, func_wrapper)
-        return tags_decorator
+        def add_tag(text: str) -> str:
+            return f"{begin_tag}{text}{end_tag}"
+        return ConvMD.transform(add_tag)
 
     @staticmethod
     def html_escape() -> Callable[[F], F]:
@@ -134,14 +179,7 @@ class ConvMD:
             decorated function
 
         """
-        def tags_decorator(func: F) -> F:
-            """Decorate."""
-            @wraps(func)
-            def func_wrapper(*args: Any, **kwargs: Any) -> Any:
-                """Wrapp."""
-                return html.escape(func(*args, **kwargs))
-            return cast(F, func_wrapper)
-        return tags_decorator
+        return ConvMD.transform(html.escape)
 
     @staticmethod
     def colorize_examples() -> Callable[[F], F]:
@@ -151,41 +189,45 @@ class ConvMD:
             decorated function
 
         """
-        def tags_decorator(func: F) -> F:
-            """Decorate."""
-            @wraps(func)
-            def func_wrapper(*args: Any, **kwargs: Any) -> Any:
-                """Wrapp."""
-                ret = func(*args, **kwargs)
-                if re.search(r"\nExamples:\n", ret):
-                    ret = f"{Tag.BEG_PRE.value}{Tag.CR.value}{ret}" + \
-                          f"{Tag.CR.value}{Tag.BEG_END_CO.value}"
-                    ret = ret.replace(
-                        "\nExamples:\n",
-                        f"\n{Tag.END_PRE.value}\nExamples:\n" +
-                        f"{Tag.BEG_PY.value}{Tag.CR.value}")
-                    return ret
-                return f"{Tag.BEG_PRE.value}{Tag.CR.value}{ret}" + \
-                       f"{Tag.CR.value}"f"{Tag.END_PRE.value}"
-            return cast(F, func_wrapper)
-        return tags_decorator
+        examples: str = "\nExamples:\n"
+        beg_pre: str = f"{Tag.BEG_PRE.value}{Tag.CR.value}"
+        end_pre: str = f"{Tag.CR.value}{Tag.END_PRE.value}"
+        end_examples: str = f"{Tag.CR.value}{Tag.BEG_END_CO.value}"
+        beg_examples: str = f"\n{Tag.END_PRE.value}\nExamples:\n" + \
+                            f"{Tag.BEG_PY.value}{Tag.CR.value}"
+
+        def colorize_examples(text: str) -> str:
+            if examples in text:
+                return f"{beg_pre}{text}{end_examples}".replace(
+                    examples, beg_examples)
+            return f"{beg_pre}{text}{end_pre}"
+        return ConvMD.transform(colorize_examples)
 
     @staticmethod
     def dedent() -> Callable[[F], F]:
-        """Deindent text.
+        r"""Deindent text.
+
+        textwrap.dedent is skipped if no line starts with a space or a tab
+        (cleaned docstrings): the text is unchanged in this case.
 
         Returns:
             decorated function
 
+        Examples:
+            >>> @ConvMD.dedent()
+            ... def return_test(text: str) -> str:
+            ...     return text
+            >>> return_test("  a\n    b")
+            'a\n  b'
+            >>> return_test("a\nb")
+            'a\nb'
+
         """
-        def tags_decorator(func: F) -> F:
-            """Decorate."""
-            @wraps(func)
-            def func_wrapper(*args: Any, **kwargs: Any) -> Any:
-                """Wrapp."""
-                return textwrap.dedent(func(*args, **kwargs))
-            return cast(F, func_wrapper)
-        return tags_decorator
+        def dedent(text: str) -> str:
+            if text[:1] in (" ", "\t") or "\n " in text or "\n\t" in text:
+                return textwrap.dedent(text)
+            return text
+        return ConvMD.transform(dedent)
 
 
 if __name__ == "__main__":
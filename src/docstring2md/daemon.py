@@ -0,0 +1,473 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Docstring2md: daemon.
+
+This script is free software; you can redistribute it and/or
+modify it under the terms of the GNU Lesser General Public
+License as published by the Free Software Foundation; either
+version 3 of the License, or (at your option) any later version.
+
+This script is provided in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.
+"""
+from __future__ import annotations
+
+import errno
+import json
+import os
+import socketserver
+import stat
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Executor, ProcessPoolExecutor
+from contextlib import ExitStack
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, NamedTuple, Optional, Union
+from urllib.parse import parse_qsl, urlsplit
+
+from docstring2md.__config__ import (DAEMON_IGNORED, DAEMON_MAX_BODY,
+                                     DAEMON_MAX_DOCS, DAEMON_PATH, LOG_MSG,
+                                     ExitStatus)
+from docstring2md.cache import ExtractCache, MemoryCache
+from docstring2md.doc2md import DocString2MD, DocString2MDOptions
+from docstring2md.log import logger
+from docstring2md.watch import Watcher
+
+
+class DocRequest(NamedTuple):
+    """Define a render request.
+
+    The toml, todo and mermaid files are the server's ones: a client cannot
+    get a file read by the server. The modules are discovered without
+    importing the package unless the client asks for it.
+
+    Attributes:
+        package (str): /path/to/the/package or <package_name>
+        toc (bool): True -> get a table of content
+        private_def (bool): True -> get private function
+        no_import (bool): True -> discover the modules without importing
+            the package (True by default)
+
+    """
+
+    package: str
+    toc: bool = False
+    private_def: bool = False
+    no_import: bool = True
+
+    @classmethod
+    def from_params(cls, params: dict[str, Any]) -> DocRequest:
+        """Create the request from the query string or JSON parameters.
+
+        The booleans are JSON booleans or "1", "true", "yes" and "on".
+
+        Args:
+            params (dict[str, Any]): parameters
+
+        Returns:
+            DocRequest
+
+        Raises:
+            ValueError: unknown parameter or no package
+
+        Examples:
+            >>> DocRequest.from_params({"package": "json", "toc": "1"})
+            DocRequest(package='json', toc=True, private_def=False, \
+no_import=True)
+            >>> DocRequest.from_params({"toc": True})
+            Traceback (most recent call last):
+            ...
+            ValueError: package is required
+            >>> DocRequest.from_params({"package": "json",
+            ...                         "toml": "/etc/hostname"})
+            Traceback (most recent call last):
+            ...
+            ValueError: unknown parameter: toml
+
+        """
+        unknown: set[str] = set(params) - set(cls._fields)
+        if unknown:
+            raise ValueError(
+                f"unknown parameter: {', '.join(sorted(unknown))}")
+        if not params.get("package"):
+            raise ValueError("package is required")
+        values: dict[str, Any] = {}
+        for name, value in params.items():
+            if name in ("toc", "private_def", "no_import"):
+                values[name] = value if isinstance(value, bool) else \
+                    str(value).lower() in ("1", "true", "yes", "on")
+            else:
+                values[name] = str(value)
+        return cls(**values)
+
+
+class WarmDoc:
+    """Keep a doc imported and rendered between the requests.
+
+    The doc is imported by the first request. The files are watched: a
+    request is answered with the rendered doc if nothing has changed, the
+    changed modules are extracted again otherwise (the unchanged sources
+    are found in the memory cache by hash).
+
+    """
+
+    __doc: DocString2MD
+    __watcher: Optional[Watcher]
+    __text: Optional[str]
+    __pending: set[str]
+    __closed: bool
+    lock: threading.Lock
+
+    def __init__(self, doc: DocString2MD) -> None:
+        """Init the warm doc.
+
+        Args:
+            doc (DocString2MD): doc (not imported)
+
+        """
+        self.__doc = doc
+        self.__watcher = None
+        self.__text = None
+        self.__pending = set()
+        self.__closed = False
+        self.lock = threading.Lock()
+
+    @property
+    def closed(self) -> bool:
+        """Get True once the doc is closed; the lock must be held."""
+        return self.__closed
+
+    def render(self) -> tuple[ExitStatus, str]:
+        """Get the doc (the lock must be held).
+
+        Returns:
+            tuple[ExitStatus, str]: status, doc ("" if the status is not
+            EX_OK)
+
+        """
+        if self.__watcher is None:
+            status: ExitStatus = self.__doc.import_module()
+            if status is not ExitStatus.EX_OK:
+                return status, ""
+            self.__watcher = Watcher(self.__doc.files)
+        # the changes are kept until the doc can be refreshed (a file
+        # can be invalid while it is edited)
+        self.__pending |= self.__watcher.changes()
+        if self.__pending:
+            updated: bool = self.__doc.refresh(self.__pending)
+            self.__pending = set()
+            if updated:
+                self.__watcher.update(self.__doc.files)
+                self.__text = None
+        if self.__text is None:
+            self.__text = self.__doc.get_doc()
+        return ExitStatus.EX_OK, self.__text
+
+    def close(self) -> None:
+        """Stop watching the files (after the running render)."""
+        with self.lock:
+            if self.__watcher is not None:
+                self.__watcher.close()
+                self.__watcher = None
+            self.__closed = True
+
+
+class DocServer:
+    r"""Render the docs requested by the clients.
+
+    A doc is imported once per request (package and options) and kept
+    warm. The requests for different docs run concurrently, the requests
+    for the same doc wait for each other. The nodes are shared by the docs
+    through a memory cache (same source and options => same nodes).
+
+    At most DAEMON_MAX_DOCS docs are kept warm: the least recently used
+    one is closed (its files are no longer watched).
+
+    Examples:
+        >>> from docstring2md.file import MyFile
+        >>> server = DocServer(DocString2MDOptions(
+        ...     toml=MyFile.set_path(None), uml=MyFile.set_path(None),
+        ...     todo=MyFile.set_path(None), output=MyFile.set_path(None),
+        ...     toc=False, private_def=False))
+        >>> status, text = server.render(DocRequest("json", no_import=True))
+        >>> status, text[:4]
+        (<ExitStatus.EX_OK: 0>, 'JSON')
+        >>> server.render(DocRequest("json", no_import=True))[1] == text
+        True
+        >>> server.render(DocRequest("oups", no_import=True))
+        (<ExitStatus.EX_OSFILE: 72>, '')
+        >>> for toc in (False, True):
+        ...     for private_def in (False, True):
+        ...         for package in ("csv", "shlex", "textwrap", "tomllib"):
+        ...             _ = server.render(DocRequest(
+        ...                 package, toc=toc, private_def=private_def))
+        >>> server.size <= DAEMON_MAX_DOCS
+        True
+        >>> server.close()
+
+    """
+
+    __options: DocString2MDOptions
+    __docs: OrderedDict[DocRequest, WarmDoc]
+    __lock: threading.Lock
+
+    def __init__(self, options: DocString2MDOptions) -> None:
+        """Init the server.
+
+        Args:
+            options (DocString2MDOptions): shared options (cache, jobs,
+                executor...)
+
+        """
+        cache: Optional[Union[ExtractCache, MemoryCache]] = \
+            options.extract_cache
+        if not isinstance(cache, MemoryCache):
+            cache = MemoryCache(backend=cache or (
+                ExtractCache(options.cache.path) if options.cache.path
+                else None))
+        # the profiler is not shared by the threads, the docs are only
+        # rendered (no output, no index, no revision)
+        self.__options = options._replace(
+            profiler=None, extract_cache=cache, split_dir=None,
+            index_db=None, git_rev=None)
+        self.__docs = OrderedDict()
+        self.__lock = threading.Lock()
+
+    @property
+    def size(self) -> int:
+        """Get the number of warm docs."""
+        return len(self.__docs)
+
+    def __get_doc(self, request: DocRequest) -> WarmDoc:
+        evicted: list[WarmDoc] = []
+        with self.__lock:
+            warm: Optional[WarmDoc] = self.__docs.get(request)
+            if warm is None:
+                warm = self.__docs[request] = WarmDoc(DocString2MD(
+                    request.package, self.__options._replace(
+                        toc=request.toc, private_def=request.private_def,
+                        no_import=request.no_import)))
+            self.__docs.move_to_end(request)
+            while len(self.__docs) > DAEMON_MAX_DOCS:
+                evicted.append(self.__docs.popitem(last=False)[1])
+        # closed out of the server lock: a render may be running
+        for old in evicted:
+            old.close()
+        return warm
+
+    def render(self, request: DocRequest) -> tuple[ExitStatus, str]:
+        """Render a doc.
+
+        Args:
+            request (DocRequest): package and options
+
+        Returns:
+            tuple[ExitStatus, str]: status, doc ("" if the status is not
+            EX_OK)
+
+        """
+        while True:
+            warm: WarmDoc = self.__get_doc(request)
+            with warm.lock:
+                # evicted by another request in the meantime: retried
+                if not warm.closed:
+                    return warm.render()
+
+    def close(self) -> None:
+        """Forget the docs."""
+        with self.__lock:
+            docs: list[WarmDoc] = list(self.__docs.values())
+            self.__docs.clear()
+        for warm in docs:
+            warm.close()
+
+
+class DocRequestHandler(BaseHTTPRequestHandler):
+    """Answer the HTTP requests.
+
+    GET /render?package=json&toc=1 or POST /render with a JSON object (same
+    parameters). The doc is sent as text/markdown.
+
+    """
+
+    server: Union[DocHTTPServer, DocUnixServer]
+    protocol_version: str = "HTTP/1.1"
+
+    def do_GET(self) -> None:  # pylint: disable=invalid-name
+        """Render the doc requested by the query string."""
+        url = urlsplit(self.path)
+        self.__answer(url.path, dict(parse_qsl(url.query)))
+
+    def do_POST(self) -> None:  # pylint: disable=invalid-name
+        """Render the doc requested by the JSON body."""
+        length: int = int(self.headers.get("Content-Length") or 0)
+        if length > DAEMON_MAX_BODY:
+            self.__send(HTTPStatus.REQUEST_ENTITY_TOO_LARGE, "")
+            return
+        try:
+            params: Any = json.loads(self.rfile.read(length) or b"{}")
+        except ValueError as err:
+            self.__send(HTTPStatus.BAD_REQUEST, f"{err}\n")
+            return
+        if not isinstance(params, dict):
+            self.__send(HTTPStatus.BAD_REQUEST, "a JSON object is expected\n")
+            return
+        self.__answer(urlsplit(self.path).path, params)
+
+    def __answer(self, path: str, params: dict[str, Any]) -> None:
+        if path != DAEMON_PATH:
+            self.__send(HTTPStatus.NOT_FOUND, f"{path}: not found\n")
+            return
+        start: float = time.perf_counter()
+        try:
+            request: DocRequest = DocRequest.from_params(params)
+            status, text = self.server.doc_server.render(request)
+        except (ValueError, SyntaxError, OSError, ImportError) as err:
+            self.__send(HTTPStatus.BAD_REQUEST, f"{err}\n")
+            return
+        logger.info(LOG_MSG.daemon_request.info, request.package,
+                    status.name, (time.perf_counter() - start) * 1000)
+        if status is ExitStatus.EX_OSFILE:
+            self.__send(HTTPStatus.NOT_FOUND, f"{status.name}\n")
+        elif status is not ExitStatus.EX_OK:
+            self.__send(HTTPStatus.INTERNAL_SERVER_ERROR, f"{status.name}\n")
+        else:
+            self.__send(HTTPStatus.OK, text, "text/markdown")
+
+    def __send(self, code: HTTPStatus, text: str,
+               content_type: str = "text/plain") -> None:
+        data: bytes = text.encode()
+        self.send_response(code)
+        self.send_header("Content-Type", f"{content_type}; charset=utf-8")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format: str,  # pylint: disable=redefined-builtin
+                    *args: Any) -> None:
+        """Log the requests with the logger (debug)."""
+        logger.debug(LOG_MSG.daemon_request.debug, format % args)
+
+
+class DocHTTPServer(ThreadingHTTPServer):
+    """Define the HTTP server (one thread per request)."""
+
+    daemon_threads: bool = True
+    doc_server: DocServer
+
+
+class DocUnixServer(socketserver.ThreadingMixIn,
+                    socketserver.UnixStreamServer):
+    """Define the HTTP server on a Unix socket (one thread per request)."""
+
+    daemon_threads: bool = True
+    doc_server: DocServer
+
+
+def get_address(address: str) -> Union[tuple[str, int], str]:
+    """Get the server address.
+
+    Args:
+        address (str): host:port or /path/to/the/socket
+
+    Returns:
+        tuple[str, int] (host, port) or str (Unix socket)
+
+    Examples:
+        >>> get_address("127.0.0.1:8000")
+        ('127.0.0.1', 8000)
+        >>> get_address(":8000")
+        ('127.0.0.1', 8000)
+        >>> get_address("/tmp/docstring2md.sock")
+        '/tmp/docstring2md.sock'
+
+    """
+    host, _sep, port = address.rpartition(":")
+    if port.isdigit() and "/" not in address:
+        return host or "127.0.0.1", int(port)
+    return address
+
+
+def remove_socket(path: str) -> None:
+    """Remove the socket left by a previous server.
+
+    Only a socket is removed: a mistyped path cannot delete a file.
+
+    Args:
+        path (str): /path/to/the/socket
+
+    Raises:
+        FileExistsError: the path exists and is not a socket
+
+    Examples:
+        >>> import tempfile
+        >>> with tempfile.NamedTemporaryFile() as file:
+        ...     try:
+        ...         remove_socket(file.name)
+        ...     except FileExistsError as err:
+        ...         print(err.strerror, os.path.exists(file.name))
+        not a socket True
+        >>> remove_socket("/oups/docstring2md.sock")
+
+    """
+    try:
+        mode: int = os.lstat(path).st_mode
+    except FileNotFoundError:
+        return
+    if not stat.S_ISSOCK(mode):
+        raise FileExistsError(errno.EEXIST, "not a socket", path)
+    os.unlink(path)
+
+
+def serve(address: str, options: DocString2MDOptions) -> ExitStatus:
+    """Answer the render requests until Ctrl+C.
+
+    Args:
+        address (str): host:port (localhost HTTP) or /path/to/the/socket
+            (HTTP on a Unix socket)
+        options (DocString2MDOptions): shared options
+
+    Returns:
+        int: status
+        return EX_OK: 0 -> success
+        return EX_CONFIG: 78 -> the server cannot be started
+
+    """
+    for name in DAEMON_IGNORED:
+        if getattr(options, name):
+            logger.warning(LOG_MSG.daemon.warning, name.replace("_", "-"))
+    target: Union[tuple[str, int], str] = get_address(address)
+    with ExitStack() as stack:
+        executor: Optional[Executor] = stack.enter_context(
+            ProcessPoolExecutor(max_workers=options.jobs)) \
+            if options.jobs > 1 else None
+        doc_server: DocServer = DocServer(options._replace(executor=executor))
+        stack.callback(doc_server.close)
+        server: Union[DocHTTPServer, DocUnixServer]
+        try:
+            if isinstance(target, str):
+                remove_socket(target)
+                server = DocUnixServer(target, DocRequestHandler)
+                stack.callback(os.unlink, target)
+            else:
+                server = DocHTTPServer(target, DocRequestHandler)
+        except OSError as err:
+            logger.error(LOG_MSG.daemon.error, err)
+            return ExitStatus.EX_CONFIG
+        server.doc_server = doc_server
+        stack.enter_context(server)
+        logger.info(LOG_MSG.daemon.info, address)
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            logger.info(LOG_MSG.daemon.debug)
+    return ExitStatus.EX_OK
+
+
+if __name__ == "__main__":
+    import doctest
+    doctest.testmod()
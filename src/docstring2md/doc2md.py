@@ -14,12 +14,22 @@ MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.
 """
 from __future__ import annotations
 
-from typing import NamedTuple
-
-from docstring2md.__config__ import Const, ExitStatus, Tag
-from docstring2md.ast_engine import NodeDef
+import os
+import sys
+from concurrent.futures import Executor
+from contextlib import ExitStack
+from itertools import chain, repeat
+from typing import Any, Iterable, Iterator, NamedTuple, Optional, Union
+
+from docstring2md.__config__ import (LOG_MSG, SPLIT_BACK, SPLIT_INDEX,
+                                     SPLIT_SUFFIX, Const, ExitStatus, Tag)
+from docstring2md.ast_engine import AnchorTable, NodeDef, NodeListType
+from docstring2md.cache import ExtractCache, MemoryCache
 from docstring2md.file import MyFile
-from docstring2md.mod import PytMod
+from docstring2md.log import logger
+from docstring2md.mod import PytMod, PytModOptions
+from docstring2md.profiler import Profiler, profile_phase
+from docstring2md.xref import XRefIndex
 
 
 class DocString2MDOptions(NamedTuple):
@@ -32,6 +42,24 @@ class DocString2MDOptions(NamedTuple):
         output (MyFile): MyFile.set_path(/path/to/output/file) (README.md)
         toc (bool): True -> get a table of content
         private_def (bool): True -> get private function
+        cache (MyFile): MyFile.set_path(/path/to/cache/dir) (no cache if
+            path is None)
+        jobs (int): number of processes used to extract the modules
+        no_import (bool): True -> discover the modules without importing
+            the package
+        profiler (Profiler): profiler (None => no profiling)
+        split_dir (str): /path/to/the/dir: one page per module and an index
+            (README.md), output is not used (None => one doc)
+        index_db (str): /path/to/index.sqlite: the symbols are written in a
+            SQLite database before the doc (None => no index)
+        xref (bool): True -> link the annotations, the bases and the
+            backticked names of the docstrings to their objects
+        executor (Executor): shared process pool (None => a pool is
+            created for each extraction)
+        extract_cache (ExtractCache | MemoryCache): shared extraction cache
+            (None => the cache is built from the cache path)
+        git_rev (str): document the package at this git revision, without
+            checking it out (None => the files are read)
 
     """
 
@@ -41,6 +69,16 @@ class DocString2MDOptions(NamedTuple):
     output: MyFile
     toc: bool
     private_def: bool
+    cache: MyFile = MyFile.set_path(None)
+    jobs: int = 1
+    no_import: bool = False
+    profiler: Optional[Profiler] = None
+    split_dir: Optional[str] = None
+    index_db: Optional[str] = None
+    xref: bool = False
+    executor: Optional[Executor] = None
+    extract_cache: Optional[Union[ExtractCache, MemoryCache]] = None
+    git_rev: Optional[str] = None
 
 
 class DocString2MD:
@@ -64,12 +102,77 @@ class DocString2MD:
         >>> result = result.split("\n")
         >>> result[0]
         '# docstring2md:'
+        >>> # the README is the same with a process pool
+        >>> doc_jobs = DocString2MD("docstring2md", options._replace(jobs=2))
+        >>> doc_jobs.import_module()
+        <ExitStatus.EX_OK: 0>
+        >>> doc_jobs.get_doc() == doc.get_doc()
+        True
+        >>> # build the doc again if a file has changed
+        >>> doc.refresh(doc.files[-1:])
+        True
+        >>> doc.get_doc() == doc_jobs.get_doc()
+        True
+        >>> doc.refresh(["/oups/README.md"])
+        False
+        >>> # rendered several times: the raw strings are released
+        >>> doc.release()
+        >>> doc.get_doc() == doc_jobs.get_doc()
+        True
+        >>> # cross-references
+        >>> doc_xref = DocString2MD("docstring2md", options._replace(
+        ...     xref=True))
+        >>> doc_xref.import_module()
+        <ExitStatus.EX_OK: 0>
+        >>> "> See: [LoggingSetup](#loggingsetup)" in doc_xref.get_doc()
+        True
+        >>> # one page per module and an index
+        >>> import tempfile
+        >>> tmp = tempfile.TemporaryDirectory()
+        >>> doc_split = DocString2MD("docstring2md", options._replace(
+        ...     split_dir=tmp.name))
+        >>> doc_split.import_module()
+        <ExitStatus.EX_OK: 0>
+        >>> doc_split.writedoc()
+        <ExitStatus.EX_OK: 0>
+        >>> sorted(os.listdir(tmp.name))[:2]
+        ['README.md', 'docstring2md.__config__.md']
+        >>> doc_split.writedoc(), doc_split.written
+        (<ExitStatus.EX_OK: 0>, False)
+        >>> # the symbols in a SQLite database
+        >>> from docstring2md.index import SymbolIndex
+        >>> doc_index = DocString2MD("docstring2md", options._replace(
+        ...     split_dir=tmp.name, index_db=f"{tmp.name}/index.sqlite"))
+        >>> doc_index.import_module()
+        <ExitStatus.EX_OK: 0>
+        >>> # the index is written from the raw strings, after a render too
+        >>> result = doc_index.get_doc()
+        >>> doc_index.writedoc()
+        <ExitStatus.EX_OK: 0>
+        >>> with SymbolIndex(f"{tmp.name}/index.sqlite") as index:
+        ...     index.find("docstring2md.doc2md.DocString2MD")[0].kind
+        'class'
+        >>> # the nodes of a MemoryCache are only read
+        >>> doc_memory = DocString2MD("json", options._replace(
+        ...     output=MyFile.set_path(f"{tmp.name}/json.md"),
+        ...     extract_cache=MemoryCache(),
+        ...     index_db=f"{tmp.name}/index.sqlite"))
+        >>> doc_memory.import_module(), doc_memory.import_module()
+        (<ExitStatus.EX_OK: 0>, <ExitStatus.EX_OK: 0>)
+        >>> doc_memory.writedoc()
+        <ExitStatus.EX_OK: 0>
+        >>> with SymbolIndex(f"{tmp.name}/index.sqlite") as index:
+        ...     index.find("json.loads")[0].docstring[:31]
+        'Deserialize ``s`` (a ``str``, `'
+        >>> tmp.cleanup()
 
     """
 
     __options: DocString2MDOptions
     __my_module: PytMod
-    __output: str = ""
+    __imported: bool = False
+    __written: Optional[bool] = None
+    __indexed: Optional[dict[str, NodeListType]] = None
 
     def __init__(self, module_name: str, options: DocString2MDOptions) -> None:
         """Init the obj.
@@ -81,7 +184,16 @@ class DocString2MD:
 
         """
         self.__options = options
-        self.__my_module = PytMod(module_name, options.private_def)
+        self.__my_module = PytMod(
+            module_name, options.private_def, PytModOptions(
+                cache=options.extract_cache or (
+                    ExtractCache(options.cache.path)
+                    if options.cache.path else None),
+                jobs=options.jobs,
+                no_import=options.no_import,
+                profiler=options.profiler,
+                executor=options.executor,
+                git_rev=options.git_rev))
 
     def import_module(self) -> ExitStatus:
         """Import the module.
@@ -98,40 +210,187 @@ class DocString2MD:
             self.__my_module.read()
         except ModuleNotFoundError:
             return ExitStatus.EX_OSFILE
+        self.__imported = True
+        return ExitStatus.EX_OK
+
+    async def aimport_module(self) -> ExitStatus:
+        """Import the module without blocking the event loop.
+
+        import_module runs in the loop's default executor (a thread): the
+        files are read and the modules discovered there. With jobs > 1 the
+        parsing runs in the process pool, so the GIL is not held by the
+        extraction either.
+
+        Returns:
+            int: status (see import_module)
+
+        Examples:
+            >>> options: DocString2MDOptions = DocString2MDOptions(
+            ...         toml=MyFile.set_path(None),
+            ...         uml=MyFile.set_path(None),
+            ...         output=MyFile.set_path(None),
+            ...         todo=MyFile.set_path(None),
+            ...         toc=False,
+            ...         private_def=False)
+            >>> import asyncio
+            >>> async def document(names):
+            ...     docs = [DocString2MD(name, options) for name in names]
+            ...     return docs, await asyncio.gather(
+            ...         *(doc.aimport_module() for doc in docs))
+            >>> docs, status = asyncio.run(document(["json", "oups"]))
+            >>> status
+            [<ExitStatus.EX_OK: 0>, <ExitStatus.EX_OSFILE: 72>]
+            >>> docs[0].get_doc().startswith("JSON")
+            True
+
+        """
+        # loaded on demand: asyncio is slow to import
+        # pylint: disable-next=import-outside-toplevel
+        import asyncio
+        return await asyncio.get_running_loop().run_in_executor(
+            None, self.import_module)
+
+    @property
+    def written(self) -> Optional[bool]:
+        """Get the result of the last writedoc.
+
+        Returns:
+            bool: True if the output file has been written, False if it is
+            unchanged, None if there is no output file (or no writedoc)
 
+        """
+        return self.__written
+
+    @property
+    def files(self) -> list[str]:
+        """Get the files used to build the doc.
+
+        Returns:
+            list[str]: module files, toml, mermaid and todo files
+
+        """
+        return self.__my_module.modules + [
+            str(option.path) for option in (
+                self.__options.todo, self.__options.toml, self.__options.uml)
+            if option.path and option.exists]
+
+    def release(self) -> None:
+        """Cache the rendered nodes before the doc is rendered several times.
+
+        The raw strings of the nodes are released, unless the symbols are
+        exported (index_db). The nodes of a shared cache (MemoryCache) must
+        not be released: they are read by other threads.
+
+        """
+        if self.__options.index_db:
+            return
+        for elem in self.__my_module.node_lst:
+            if isinstance(elem, NodeDef):
+                elem.release()
+
+    def refresh(self, paths: Iterable[str]) -> bool:
+        """Check the files used to build the doc.
+
+        Only the changed modules are extracted again.
+
+        Args:
+            paths (Iterable[str]): changed files
+
+        Returns:
+            bool: True if the doc must be written again, False otherwise.
+
+        """
+        changed: set[str] = {os.path.normpath(path) for path in paths}
+        updated: bool = self.__my_module.refresh(changed)
+        return updated or any(
+            os.path.normpath(str(option.path)) in changed
+            for option in (self.__options.todo, self.__options.toml,
+                           self.__options.uml)
+            if option.path)
+
+    def __iter_header(self) -> Iterator[str]:
         # module / README
-        _output: list[str] = []
-        if self.__my_module.pkg_main_docstring[0]:
-            _output.append(
-                self.__my_module.pkg_main_docstring[0].get_summary())
+        main_docstring: NodeListType = self.__my_module.pkg_main_docstring
+        if main_docstring:
+            yield main_docstring[0].get_summary()
 
         # _TODO
         if self.__options.todo.path and self.__options.todo.exists:
-            _output.extend([self.__options.todo.read()])
+            yield self.__options.todo.read()
 
-        _output.extend([Const.DEV_HEAD.value])
+        yield Const.DEV_HEAD.value
         # TOML
         if self.__options.toml.path and self.__options.toml.exists:
-            _output.extend([Const.DEV_TOML.value, Tag.BEG_TOML.value,
-                            self.__options.toml.read(), Tag.BEG_END_CO.value])
+            yield from (Const.DEV_TOML.value, Tag.BEG_TOML.value,
+                        self.__options.toml.read(), Tag.BEG_END_CO.value)
         # UML
         if self.__options.uml.path and self.__options.uml.exists:
-            _output.extend([Const.DEV_UML.value, Tag.BEG_MERMAID.value,
-                            self.__options.uml.read(), Tag.BEG_END_CO.value])
+            yield from (Const.DEV_UML.value, Tag.BEG_MERMAID.value,
+                        self.__options.uml.read(), Tag.BEG_END_CO.value)
 
+    def __iter_sections(self) -> Iterator[str]:
+        header: list[str] = list(self.__iter_header())
+        yield from header
         # children
-        _output.append(f"{Const.DEV_OBJ.value}{Tag.CR.value}")
+        yield from iter_objects(
+            self.__my_module.node_lst, self.__options.toc, header,
+            self.__get_links(header) if self.__options.xref else None)
+
+    def __get_links(self, headings: list[str]) -> dict[str, str]:
+        # same anchors as the TOC and the headings
+        xref: XRefIndex = XRefIndex()
+        anchors: AnchorTable = get_anchor_table(headings)
+        for module, node_lst in self.__my_module.module_nodes.items():
+            name: str = self.__my_module.get_module_name(module)
+            for elem in node_lst:
+                if isinstance(elem, NodeDef):
+                    xref.add(name, elem, f"#{anchors.add(elem.title)}")
+        return xref.get_links(chain.from_iterable(
+            elem.get_names() for elem in self.__my_module.node_lst
+            if isinstance(elem, NodeDef)))
+
+    @staticmethod
+    def __get_page_links(pages: list[tuple[str, str, NodeListType]]) \
+            -> list[Optional[dict[str, str]]]:
+        # the links of each page, to the other pages
+        xref: XRefIndex = XRefIndex()
+        for path, name, node_lst in pages:
+            anchors: AnchorTable = get_anchor_table([get_title(name)])
+            for elem in node_lst:
+                if isinstance(elem, NodeDef):
+                    xref.add(name, elem, f"{os.path.basename(path)}#"
+                                         f"{anchors.add(elem.title)}")
+        return [xref.get_links(chain.from_iterable(
+            elem.get_names() for elem in node_lst
+            if isinstance(elem, NodeDef))) for _path, _name, node_lst in pages]
+
+    def __iter_index(self, pages: list[tuple[str, str, NodeListType]]) \
+            -> Iterator[str]:
+        # same header as the README, the objects are links to the pages
+        yield from self.__iter_header()
+        yield f"{Const.DEV_OBJ.value}{Tag.CR.value}"
+        for path, name, node_lst in pages:
+            page: str = os.path.basename(path)
+            yield f"[{name}]({page}){Tag.HTML_CR.value}"
+            if self.__options.toc:
+                # the anchors of the page
+                yield from (elem.replace("](#", f"]({page}#", 1)
+                            for elem in iter_toc(node_lst, [get_title(name)]))
+
+    def iter_doc(self) -> Iterator[str]:
+        """Render the documentation chunk by chunk.
+
+        Each section is rendered when the chunk is requested, so the doc can
+        be written without holding it in memory. The chunks are the same as
+        get_doc() once joined.
 
-        if self.__options.toc:
-            _output.extend([elem.get_toc_elem() for elem in
-                            self.__my_module.node_lst if elem is not None
-                            and isinstance(elem, NodeDef)])
-
-        _output.extend([elem.get_summary() for elem in
-                        self.__my_module.node_lst if elem is not None])
+        Returns:
+            Iterator[str]: chunks
 
-        self.__output = Tag.CR.value.join(_output)
-        return ExitStatus.EX_OK
+        """
+        if not self.__imported:
+            return
+        yield from join_sections(self.__iter_sections())
 
     def get_doc(self) -> str:
         """Return the documentation.
@@ -140,11 +399,14 @@ class DocString2MD:
             str: doc
 
         """
-        return self.__output
+        return "".join(self.iter_doc())
 
     def writedoc(self) -> ExitStatus:
         """Write the doc - screen or files.
 
+        The doc is streamed: each section is written as soon as it is
+        rendered. The output file is not written if its content is the
+        same (see written).
         It exits 0 on success, and >0 if an error occurs.
 
         args:
@@ -157,11 +419,246 @@ class DocString2MD:
             return EX_IOERR: 74 -> write error
 
         """
-        if self.__options.output.status is not ExitStatus.EX_CANTCREAT:
-            return self.__options.output.write(self.__output)
-        print(self.__output)
+        profiler: Optional[Profiler] = self.__options.profiler
+        chunks: Iterable[str] = self.iter_doc() if profiler is None \
+            else profiler.iter_phase("render", self.iter_doc())
+        if self.__options.index_db:
+            with profile_phase(profiler, "index"):
+                status: ExitStatus = self.__write_index(
+                    self.__options.index_db)
+            if status is not ExitStatus.EX_OK:
+                return status
+        with profile_phase(profiler, "write"):
+            if self.__options.split_dir:
+                return self.__write_split(self.__options.split_dir)
+            if self.__options.output.status is not ExitStatus.EX_CANTCREAT:
+                status, self.__written = self.__options.output.update(chunks)
+                return status
+            for chunk in chunks:
+                sys.stdout.write(chunk)
+            sys.stdout.write(Tag.CR.value)
         return ExitStatus.EX_OK
 
+    def __write_index(self, path: str) -> ExitStatus:
+        # only the modules extracted since the last export are written:
+        # the nodes of the other ones can be released.
+        # pylint: disable-next=import-outside-toplevel
+        import sqlite3
+
+        # pylint: disable-next=import-outside-toplevel
+        from docstring2md.index import SymbolIndex
+        modules: dict[str, NodeListType] = self.__my_module.module_nodes
+        indexed: dict[str, NodeListType] = self.__indexed or {}
+        count: int = 0
+        try:
+            with SymbolIndex(path) as index:
+                if self.__indexed is None:
+                    # the modules removed since the last run
+                    for package in self.__my_module.packages:
+                        index.delete_package(package)
+                for module in set(indexed) - set(modules):
+                    index.delete_module(
+                        self.__my_module.get_module_name(module))
+                for module, node_lst in modules.items():
+                    if indexed.get(module) is not node_lst:
+                        count += index.put_module(
+                            self.__my_module.get_module_name(module),
+                            node_lst)
+        except sqlite3.Error as err:
+            logger.error(LOG_MSG.index.error, err)
+            return ExitStatus.EX_CANTCREAT
+        logger.info(LOG_MSG.index.info, count, len(modules), path)
+        self.__indexed = dict(modules)
+        return ExitStatus.EX_OK
+
+    async def awritedoc(self) -> ExitStatus:
+        """Write the doc without blocking the event loop.
+
+        writedoc runs in the loop's default executor (a thread): the
+        rendering and the writes are done there. The split pages are
+        written by the process pool (jobs > 1).
+
+        Returns:
+            int: status (see writedoc)
+
+        """
+        # pylint: disable-next=import-outside-toplevel
+        import asyncio
+        return await asyncio.get_running_loop().run_in_executor(
+            None, self.writedoc)
+
+    def __write_split(self, directory: str) -> ExitStatus:
+        # one page per module (workers if jobs > 1) and the index
+        try:
+            os.makedirs(directory, exist_ok=True)
+        except OSError:
+            logger.error(LOG_MSG.file_not_found.error)
+            return ExitStatus.EX_CANTCREAT
+        pages: list[tuple[str, str, NodeListType]] = []
+        for module, node_lst in self.__my_module.module_nodes.items():
+            if not node_lst:
+                continue
+            name: str = self.__my_module.get_module_name(module)
+            pages.append((os.path.join(directory, f"{name}{SPLIT_SUFFIX}"),
+                          name, node_lst))
+        args: tuple[Iterable[Any], ...] = (
+            [page[0] for page in pages], [page[1] for page in pages],
+            [page[2] for page in pages], repeat(self.__options.toc),
+            self.__get_page_links(pages) if self.__options.xref
+            else repeat(None))
+        with ExitStack() as stack:
+            executor: Optional[Executor] = self.__options.executor
+            if executor is None and self.__options.jobs > 1 and \
+                    len(pages) > 1:
+                # pylint: disable-next=import-outside-toplevel
+                from concurrent.futures import ProcessPoolExecutor
+                executor = stack.enter_context(ProcessPoolExecutor(
+                    max_workers=self.__options.jobs))
+            results: list[tuple[ExitStatus, bool]] = list(
+                executor.map(write_page, *args, chunksize=max(
+                    1, len(pages) // (self.__options.jobs * 4)))
+                if executor is not None else map(write_page, *args))
+        results.append(MyFile.set_path(
+            os.path.join(directory, SPLIT_INDEX)).update(
+                join_sections(self.__iter_index(pages))))
+        written: int = sum(1 for _status, page in results if page)
+        logger.info(LOG_MSG.split.info, written, len(results) - written,
+                    directory)
+        self.__written = written > 0
+        return next((status for status, _page in results
+                     if status is not ExitStatus.EX_OK), ExitStatus.EX_OK)
+
+
+def join_sections(sections: Iterable[str]) -> Iterator[str]:
+    r"""Join the sections with a line break.
+
+    Args:
+        sections (Iterable[str]): sections
+
+    Returns:
+        Iterator[str]: chunks
+
+    Examples:
+        >>> "".join(join_sections(["# Title", "Text"]))
+        '# Title\nText'
+
+    """
+    for idx, section in enumerate(sections):
+        if idx:
+            yield Tag.CR.value
+        yield section
+
+
+def get_title(name: str) -> str:
+    """Get the title of a module page (split output).
+
+    Args:
+        name (str): module name
+
+    Returns:
+        str: heading
+
+    """
+    return f"{Const.HEAD_TAG.value} {name}"
+
+
+def get_anchor_table(headings: Iterable[str]) -> AnchorTable:
+    """Get the anchor table of a document, before its objects.
+
+    Args:
+        headings (Iterable[str]): MD sections before the objects
+
+    Returns:
+        AnchorTable: the headings and the objects' one are added
+
+    """
+    anchors: AnchorTable = AnchorTable()
+    for heading in chain(headings, [Const.DEV_OBJ.value]):
+        anchors.add_text(heading)
+    return anchors
+
+
+def iter_toc(node_lst: NodeListType,
+             headings: Iterable[str] = ()) -> Iterator[str]:
+    r"""Render the table of contents.
+
+    The anchors are assigned in the document order (the headings before
+    the objects, then the nodes): a duplicate gets the GitHub suffix.
+
+    Args:
+        node_lst (NodeListType): nodes
+        headings (Iterable[str]): MD sections before the objects
+
+    Returns:
+        Iterator[str]: TOC entries
+
+    Examples:
+        >>> nodes = [NodeDef(title, "", "", 0) for title in (
+        ...     "objects()", "load()", "load()")]
+        >>> print("\n".join(iter_toc(nodes, ["# json"])))
+        [objects()](#objects-1)<br />
+        [load()](#load)<br />
+        [load()](#load-1)<br />
+
+    """
+    anchors: AnchorTable = get_anchor_table(headings)
+    for elem in node_lst:
+        if isinstance(elem, NodeDef):
+            yield elem.get_toc_elem(anchors.add(elem.title))
+
+
+def iter_objects(node_lst: NodeListType, toc: bool,
+                 headings: Iterable[str] = (),
+                 links: Optional[dict[str, str]] = None) -> Iterator[str]:
+    """Render the objects: TOC and summaries.
+
+    Args:
+        node_lst (NodeListType): nodes
+        toc (bool): True -> get a table of content
+        headings (Iterable[str]): MD sections before the objects (TOC
+            anchors)
+        links (dict[str, str]): name => target of the cross-references
+            (None => no link)
+
+    Returns:
+        Iterator[str]: sections
+
+    """
+    yield f"{Const.DEV_OBJ.value}{Tag.CR.value}"
+
+    if toc:
+        yield from iter_toc(node_lst, headings)
+
+    for elem in node_lst:
+        if not isinstance(elem, NodeDef):
+            yield elem.get_summary()
+            continue
+        yield elem.get_summary(links)
+
+
+def write_page(path: str, name: str, node_lst: NodeListType, toc: bool,
+               links: Optional[dict[str, str]] = None) \
+        -> tuple[ExitStatus, bool]:
+    """Write the page of a module (split output).
+
+    This function is used by the workers to write the pages.
+
+    Args:
+        path (str): /path/to/the/page.md
+        name (str): module name (page title)
+        node_lst (NodeListType): nodes of the module
+        toc (bool): True -> get a table of content
+        links (dict[str, str]): name => target of the cross-references
+            (None => no link)
+
+    Returns:
+        tuple[ExitStatus, bool]: status, True if the page has been written
+
+    """
+    title: str = get_title(name)
+    return MyFile.set_path(path).update(join_sections(chain(
+        (title, SPLIT_BACK), iter_objects(node_lst, toc, [title], links))))
+
 
 if __name__ == "__main__":
     import doctest
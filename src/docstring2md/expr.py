@@ -0,0 +1,268 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Docstring2md: expr.
+
+This script is free software; you can redistribute it and/or
+modify it under the terms of the GNU Lesser General Public
+License as published by the Free Software Foundation; either
+version 3 of the License, or (at your option) any later version.
+
+This script is provided in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.
+"""
+from __future__ import annotations
+
+import ast
+import sys
+from typing import Any, Callable, Iterable, Iterator, Optional
+
+from docstring2md.__config__ import LOG_MSG, Tag
+from docstring2md.log import logger
+
+
+def render_expr(node: ast.AST) -> str:
+    """Render an expression node as source code.
+
+    The most common nodes are rendered with the dispatch table, the others
+    with ast.unparse (Python 3.9+).
+
+    Args:
+        node (ast.AST): expression node
+
+    Returns:
+        str: source code ("" if the node cannot be rendered)
+
+    Examples:
+        >>> def render(source):
+        ...     return render_expr(ast.parse(source, mode="eval").body)
+        >>> render("Optional[dict[str, list[int]]]")
+        'Optional[dict[str, list[int]]]'
+        >>> render("int | None")
+        'int | None'
+        >>> render("os.path.sep")
+        'os.path.sep'
+        >>> render("-1")
+        '-1'
+        >>> render("field(default_factory=list)")
+        'field(default_factory=list)'
+        >>> render("''")
+        "''"
+
+    """
+    renderer = EXPR_RENDERERS.get(type(node))
+    if renderer is not None:
+        return renderer(node)
+    return render_fallback(node)
+
+
+def get_names(nodes: Iterable[Optional[ast.AST]]) -> tuple[str, ...]:
+    """Get the names used in expressions (annotations, bases...).
+
+    A dotted name (module.Class) is one name. The string annotations are
+    parsed.
+
+    Args:
+        nodes (Iterable[ast.AST]): expression nodes (None is skipped)
+
+    Returns:
+        tuple[str, ...]: names, in order, without duplicates
+
+    Examples:
+        >>> get_names([ast.parse("Optional[dict[str, ast.AST]]",
+        ...                      mode="eval").body, None])
+        ('Optional', 'dict', 'str', 'ast.AST')
+        >>> get_names([ast.parse("'PytMod | None'", mode="eval").body])
+        ('PytMod',)
+
+    """
+    names: dict[str, None] = {}
+    for node in nodes:
+        if node is not None:
+            names.update(dict.fromkeys(iter_names(node)))
+    return tuple(names)
+
+
+def iter_names(node: ast.AST) -> Iterator[str]:
+    """Get the names of an expression node."""
+    if isinstance(node, ast.Name):
+        yield node.id
+    elif isinstance(node, ast.Attribute):
+        value: ast.AST = node.value
+        while isinstance(value, ast.Attribute):
+            value = value.value
+        if isinstance(value, ast.Name):
+            yield render_attribute(node)
+        else:
+            yield from iter_names(node.value)
+    elif isinstance(node, ast.Constant) and isinstance(node.value, str):
+        # "Class" (forward reference)
+        try:
+            yield from iter_names(ast.parse(node.value, mode="eval").body)
+        except SyntaxError:
+            return
+    else:
+        for child in ast.iter_child_nodes(node):
+            yield from iter_names(child)
+
+
+def render_name(node: ast.Name) -> str:
+    """Render a name."""
+    return node.id
+
+
+def render_constant(node: Any) -> str:
+    """Render a constant (Constant, NameConstant, Num, Str...)."""
+    value: Any = node.value if hasattr(node, "value") else \
+        node.n if hasattr(node, "n") else node.s
+    if value is Ellipsis:
+        return "..."
+    # u"..."
+    return f"{getattr(node, 'kind', None) or ''}{repr(value)}"
+
+
+def render_attribute(node: ast.Attribute) -> str:
+    """Render an attribute."""
+    value: str = render_expr(node.value)
+    if isinstance(node.value, ast.Constant) and \
+            isinstance(node.value.value, int):
+        # 1 .real
+        value = f"{value} "
+    return f"{value}.{node.attr}"
+
+
+def render_subscript(node: ast.Subscript) -> str:
+    """Render a subscript."""
+    slice_node: Any = node.slice
+    # Python 3.8: Index(value=...)
+    if type(slice_node).__name__ == "Index":
+        slice_node = slice_node.value
+    if isinstance(slice_node, ast.Tuple) and any(
+            isinstance(elt, ast.Starred) for elt in slice_node.elts):
+        # Generic[*Ts]
+        return render_fallback(node)
+    if isinstance(slice_node, ast.Tuple) and slice_node.elts:
+        elts: str = render_elts(slice_node.elts)
+        if len(slice_node.elts) == 1:
+            elts = f"{elts},"
+    else:
+        elts = render_expr(slice_node)
+    return f"{render_expr(node.value)}[{elts}]"
+
+
+def render_elts(elts: list[ast.expr]) -> str:
+    """Render a list of elements."""
+    return Tag.COMA.value.join(render_expr(elt) for elt in elts)
+
+
+def render_tuple(node: ast.Tuple) -> str:
+    """Render a tuple."""
+    if len(node.elts) == 1:
+        return f"({render_expr(node.elts[0])},)"
+    return f"({render_elts(node.elts)})"
+
+
+def render_list(node: ast.List) -> str:
+    """Render a list."""
+    return f"[{render_elts(node.elts)}]"
+
+
+def render_binop(node: ast.BinOp) -> str:
+    """Render a binary operation (X | Y only, ast.unparse otherwise)."""
+    if not isinstance(node.op, ast.BitOr) or not all(
+            type(child) in EXPR_RENDERERS or
+            isinstance(child, ast.BinOp) and isinstance(child.op, ast.BitOr)
+            for child in (node.left, node.right)):
+        return render_fallback(node)
+    right: str = render_expr(node.right)
+    # X | (Y | Z)
+    if isinstance(node.right, ast.BinOp):
+        right = f"({right})"
+    return f"{render_expr(node.left)} | {right}"
+
+
+def render_fallback(node: ast.AST) -> str:
+    """Render a node with ast.unparse or with the Python 3.7/3.8 renderers."""
+    if sys.version_info >= (3, 9):
+        return ast.unparse(node)
+    renderer = FALLBACK_RENDERERS.get(type(node))
+    if renderer is not None:
+        return renderer(node)
+    logger.warning(LOG_MSG.unknown_type_of_node.warning,
+                   f"{type(node)} / {ast.dump(node)}")
+    return ""
+
+
+def render_binop_fallback(node: ast.BinOp) -> str:
+    """Render a binary operation (Python 3.7/3.8)."""
+    return f"{render_expr(node.left)} " \
+           f"{BINOP_SYMBOLS.get(type(node.op), '?')} {render_expr(node.right)}"
+
+
+def render_unaryop(node: ast.UnaryOp) -> str:
+    """Render a unary operation (Python 3.7/3.8)."""
+    symbol: str = UNARYOP_SYMBOLS.get(type(node.op), "?")
+    return f"{symbol}{render_expr(node.operand)}"
+
+
+def render_call(node: ast.Call) -> str:
+    """Render a call (Python 3.7/3.8)."""
+    args: list[str] = [render_expr(arg) for arg in node.args] + [
+        f"{keyword.arg}={render_expr(keyword.value)}" if keyword.arg
+        else f"**{render_expr(keyword.value)}" for keyword in node.keywords]
+    return f"{render_expr(node.func)}({Tag.COMA.value.join(args)})"
+
+
+def render_starred(node: ast.Starred) -> str:
+    """Render a starred expression (Python 3.7/3.8)."""
+    return f"*{render_expr(node.value)}"
+
+
+def render_dict(node: ast.Dict) -> str:
+    """Render a dict (Python 3.7/3.8)."""
+    items: list[str] = [
+        f"{render_expr(key)}: {render_expr(value)}" if key is not None
+        else f"**{render_expr(value)}"
+        for key, value in zip(node.keys, node.values)]
+    return f"{{{Tag.COMA.value.join(items)}}}"
+
+
+def render_set(node: ast.Set) -> str:
+    """Render a set (Python 3.7/3.8)."""
+    return f"{{{render_elts(node.elts)}}}"
+
+
+# dispatch tables, built once
+EXPR_RENDERERS: dict[type, Callable[[Any], str]] = {
+    ast.Name: render_name,
+    ast.Constant: render_constant,
+    ast.Attribute: render_attribute,
+    ast.Subscript: render_subscript,
+    ast.Tuple: render_tuple,
+    ast.List: render_list,
+    ast.BinOp: render_binop}
+FALLBACK_RENDERERS: dict[type, Callable[[Any], str]] = {
+    ast.BinOp: render_binop_fallback,
+    ast.UnaryOp: render_unaryop,
+    ast.Call: render_call,
+    ast.Starred: render_starred,
+    ast.Dict: render_dict,
+    ast.Set: render_set}
+# Python 3.7: deprecated constant nodes
+if sys.version_info < (3, 8):
+    EXPR_RENDERERS.update({
+        getattr(ast, name): render_constant
+        for name in ("NameConstant", "Num", "Str", "Bytes", "Ellipsis")})
+BINOP_SYMBOLS: dict[type, str] = {
+    ast.Add: "+", ast.Sub: "-", ast.Mult: "*", ast.Div: "/",
+    ast.FloorDiv: "//", ast.Mod: "%", ast.Pow: "**", ast.LShift: "<<",
+    ast.RShift: ">>", ast.BitOr: "|", ast.BitXor: "^", ast.BitAnd: "&",
+    ast.MatMult: "@"}
+UNARYOP_SYMBOLS: dict[type, str] = {
+    ast.USub: "-", ast.UAdd: "+", ast.Invert: "~", ast.Not: "not "}
+
+
+if __name__ == "__main__":
+    import doctest
+    doctest.testmod()
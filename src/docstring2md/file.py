@@ -14,12 +14,21 @@ MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.
 """
 from __future__ import annotations
 
+import mmap
+import os
+import stat
+import uuid
+from contextlib import contextmanager
 from pathlib import Path
-from typing import NamedTuple, Optional
+from typing import Iterable, Iterator, NamedTuple, Optional, Union
 
-from docstring2md.__config__ import LOG_MSG, LOGGING_SETUP, ExitStatus
+from docstring2md.__config__ import (LOG_MSG, LOGGING_SETUP, MMAP_THRESHOLD,
+                                     WRITE_BLOCK_SIZE, WRITE_TMP_SUFFIX,
+                                     ExitStatus)
 from docstring2md.log import logger
 
+SourceType = Union[str, bytes, mmap.mmap]
+
 
 class MyFile(NamedTuple):
     r"""Describe a file with a NamedTuple.
@@ -89,38 +98,141 @@ class MyFile(NamedTuple):
         return f'{self.__class__.__name__}({_repr})'
 
     def read(self) -> str:
-        """Read the file.
+        """Read the file (UTF-8).
 
         Returns:
             str: Text if successful else ""
 
         """
-        return self.path.read_text() if self.path else ""
+        return self.path.read_text(encoding=LOGGING_SETUP.encoding) \
+            if self.path else ""
+
+    @contextmanager
+    def open_bytes(self) -> Iterator[Union[bytes, mmap.mmap]]:
+        """Open the file as bytes.
+
+        A big file (MMAP_THRESHOLD) is memory-mapped: the pages are read
+        on demand, the content is not copied in a bytes object. The
+        mapping is closed on exit.
+        The bytes are not decoded: ast.parse honors the PEP 263 encoding
+        cookie.
+
+        Yields:
+            bytes or mmap: content (b"" if there is no path)
+
+        Examples:
+            >>> import pathlib
+            >>> path = str(pathlib.Path(__file__).resolve())
+            >>> with MyFile.set_path(path).open_bytes() as source:
+            ...     source[:22]
+            b'#!/usr/bin/env python3'
+
+        """
+        if not self.path:
+            yield b""
+            return
+        with open(self.path, "rb") as file:
+            size: int = os.fstat(file.fileno()).st_size
+            if size < MMAP_THRESHOLD:
+                yield file.read()
+                return
+            with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) \
+                    as source:
+                yield source
 
-    def write(self, data: str) -> ExitStatus:
+    def write(self, data: Union[str, Iterable[str]]) -> ExitStatus:
         """Write data in the file.
 
+        Data is a string or an iterable of strings (chunks are written one
+        by one). The file is left untouched if the content is the same (see
+        update).
+
         Returns:
             int: status
             return EX_OK: 0 -> success
             return EX_CANTCREAT: 73 -> can't create the file
             return EX_IOERR: 74 -> write error
 
+        """
+        return self.update(data)[0]
+
+    def update(self, data: Union[str, Iterable[str]]) \
+            -> tuple[ExitStatus, bool]:
+        r"""Write data in the file if the content has changed.
+
+        The chunks are written in a temporary file (same directory) which
+        is compared with the file: the file is replaced atomically (rename)
+        if they differ, the temporary file is removed otherwise. The mtime
+        of an unchanged file is kept.
+
+        Args:
+            data (str | Iterable[str]): content or chunks
+
+        Returns:
+            tuple[ExitStatus, bool]: status, True if the file has been
+            written (False if unchanged)
+
+        Examples:
+            >>> import tempfile
+            >>> tmp = tempfile.TemporaryDirectory()
+            >>> readme = MyFile.set_path(f"{tmp.name}/README.md")
+            >>> readme.update(["# Title", "\n"])
+            (<ExitStatus.EX_OK: 0>, True)
+            >>> readme.update("# Title\n")
+            (<ExitStatus.EX_OK: 0>, False)
+            >>> readme.update("# New title\n")
+            (<ExitStatus.EX_OK: 0>, True)
+            >>> sorted(path.name for path in Path(tmp.name).iterdir())
+            ['README.md']
+            >>> tmp.cleanup()
+
         """
         if not self.path:
-            return ExitStatus.EX_CANTCREAT
+            return ExitStatus.EX_CANTCREAT, False
+        # a symlink is kept: its target is replaced
+        target: Path = Path(os.path.realpath(self.path))
+        tmp: Path = target.with_name(
+            f".{target.name}.{uuid.uuid4().hex[:8]}{WRITE_TMP_SUFFIX}")
         try:
-            with open(self.path, 'w', encoding=LOGGING_SETUP.encoding) as file:
+            with open(tmp, 'x', encoding=LOGGING_SETUP.encoding) as file:
                 try:
-                    file.write(data)
+                    if isinstance(data, str):
+                        file.write(data)
+                    else:
+                        for chunk in data:
+                            file.write(chunk)
                 except (IOError, OSError):
                     logger.error(LOG_MSG.io_err.error)
-                    return ExitStatus.EX_IOERR
+                    return ExitStatus.EX_IOERR, False
+            if self.__same_content(tmp, target):
+                logger.info(LOG_MSG.write_unchanged.info, self.path)
+                return ExitStatus.EX_OK, False
+            if target.exists():
+                os.chmod(tmp, stat.S_IMODE(target.stat().st_mode))
+            os.replace(tmp, target)
         except (FileNotFoundError, PermissionError, OSError):
             logger.error(LOG_MSG.file_not_found.error)
-            return ExitStatus.EX_CANTCREAT
+            return ExitStatus.EX_CANTCREAT, False
+        finally:
+            if tmp.exists():
+                tmp.unlink()
         logger.info(LOG_MSG.write_doc.info)
-        return ExitStatus.EX_OK
+        return ExitStatus.EX_OK, True
+
+    @staticmethod
+    def __same_content(path: Path, other: Path) -> bool:
+        try:
+            if path.stat().st_size != other.stat().st_size:
+                return False
+        except FileNotFoundError:
+            return False
+        with open(path, "rb") as file, open(other, "rb") as other_file:
+            while True:
+                block: bytes = file.read(WRITE_BLOCK_SIZE)
+                if block != other_file.read(WRITE_BLOCK_SIZE):
+                    return False
+                if not block:
+                    return True
 
     def resolve(self) -> str:
         """Get the resolved path.
@@ -0,0 +1,216 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Docstring2md: git.
+
+This script is free software; you can redistribute it and/or
+modify it under the terms of the GNU Lesser General Public
+License as published by the Free Software Foundation; either
+version 3 of the License, or (at your option) any later version.
+
+This script is provided in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.
+"""
+from __future__ import annotations
+
+import os
+import subprocess
+from pathlib import Path
+from types import TracebackType
+from typing import IO, Iterator, Optional
+
+from docstring2md.__config__ import GIT_COMMAND, LOG_MSG, Const
+from docstring2md.log import logger
+
+
+class GitRevision:
+    """Read the files of a git revision without checking it out.
+
+    The files are listed with git ls-tree and the blobs are read by one
+    git cat-file --batch process: there is no checkout and no process per
+    file. The process is started on the first read and stopped when the
+    revision is closed.
+
+    Examples:
+        >>> with GitRevision("HEAD", os.path.dirname(__file__)) as git:
+        ...     sources = dict(git.iter_sources("docstring2md"))
+        >>> sorted(sources)[0]
+        'src/docstring2md/__about__.py'
+        >>> source = sources["src/docstring2md/mod.py"]
+        >>> source.startswith(b"#!/usr/bin/env python3")
+        True
+        >>> GitRevision("oups...", os.path.dirname(__file__))
+        Traceback (most recent call last):
+        ...
+        ValueError: oups...: unknown revision
+
+    """
+
+    __directory: str
+    __rev: str
+    __process: Optional[subprocess.Popen[bytes]]
+
+    def __init__(self, rev: str, directory: str = ".") -> None:
+        """Find the repository and check the revision.
+
+        Args:
+            rev (str): branch, tag, commit...
+            directory (str): directory in the work tree
+
+        Raises:
+            OSError: git cannot be run
+            ValueError: not a git repository or unknown revision
+
+        """
+        self.__process = None
+        self.__rev = rev
+        self.__directory = directory
+        self.__directory = self.__git(
+            "rev-parse", "--show-toplevel").decode().strip()
+        try:
+            self.__git("rev-parse", "--verify", "--quiet",
+                       f"{rev}^{{commit}}")
+        except ValueError as err:
+            raise ValueError(f"{rev}: unknown revision") from err
+
+    def __enter__(self) -> GitRevision:
+        """Use the revision in a with statement."""
+        return self
+
+    def __exit__(self, exc_type: Optional[type[BaseException]],
+                 exc_value: Optional[BaseException],
+                 traceback: Optional[TracebackType]) -> None:
+        """Stop the git cat-file process."""
+        self.close()
+
+    @property
+    def directory(self) -> str:
+        """Get the top-level directory of the work tree."""
+        return self.__directory
+
+    @property
+    def rev(self) -> str:
+        """Get the revision."""
+        return self.__rev
+
+    def __git(self, *args: str) -> bytes:
+        # run a git command in the repository and get its output
+        try:
+            return subprocess.run(
+                [GIT_COMMAND, "-C", self.__directory, *args],
+                check=True, capture_output=True).stdout
+        except subprocess.CalledProcessError as err:
+            raise ValueError(
+                err.stderr.decode(errors="replace").strip() or
+                f"{GIT_COMMAND} {args[0]}: status {err.returncode}") from err
+
+    def ls_tree(self, path: str) -> list[tuple[str, str]]:
+        """List the Python files of a directory.
+
+        Args:
+            path (str): directory (relative to the top-level directory)
+
+        Returns:
+            list[tuple[str, str]]: (blob, path) of each .py file
+
+        """
+        files: list[tuple[str, str]] = []
+        # <mode> SP <type> SP <object> TAB <file> NUL
+        for line in self.__git("ls-tree", "-r", "-z", self.__rev, "--",
+                               path).split(b"\0"):
+            info, _sep, name = line.decode().partition("\t")
+            fields: list[str] = info.split()
+            if fields[1:2] == ["blob"] and name.endswith(".py"):
+                files.append((fields[2], name))
+        return files
+
+    def cat_file(self, blob: str) -> bytes:
+        """Read a blob.
+
+        Args:
+            blob (str): object name
+
+        Returns:
+            bytes: content
+
+        Raises:
+            ValueError: the blob is missing
+
+        """
+        if self.__process is None:
+            logger.debug(LOG_MSG.git.debug, self.__directory)
+            # kept for the next reads, stopped by close
+            # pylint: disable-next=consider-using-with
+            self.__process = subprocess.Popen(
+                [GIT_COMMAND, "-C", self.__directory, "cat-file", "--batch"],
+                stdin=subprocess.PIPE, stdout=subprocess.PIPE)
+        stdin: Optional[IO[bytes]] = self.__process.stdin
+        stdout: Optional[IO[bytes]] = self.__process.stdout
+        if stdin is None or stdout is None:
+            raise ValueError(f"{blob}: no {GIT_COMMAND} cat-file process")
+        stdin.write(f"{blob}\n".encode())
+        stdin.flush()
+        # <object> SP <type> SP <size> LF <content> LF
+        header: list[str] = stdout.readline().decode().split()
+        if len(header) != 3:
+            raise ValueError(f"{blob}: missing")
+        content: bytes = stdout.read(int(header[2]))
+        stdout.read(1)
+        return content
+
+    def find_package(self, package: str) -> str:
+        """Find the directory of a package in the revision.
+
+        The package is a /path/to/the/package (in the work tree) or a
+        package name (./<package> or ./src/<package>).
+
+        Args:
+            package (str): /path/to/the/package or <package_name>
+
+        Returns:
+            str: directory (relative to the top-level directory)
+
+        Raises:
+            ValueError: the package is not in the revision
+
+        """
+        relative: str = os.path.relpath(
+            os.path.abspath(package), self.__directory)
+        name: str = package.replace(Const.DOT.value, "/")
+        candidates: list[str] = [name, f"src/{name}"] if all(
+            part.isidentifier() for part in package.split(Const.DOT.value)) \
+            else []
+        if not relative.startswith(os.pardir):
+            candidates.insert(0, Path(relative).as_posix())
+        for candidate in candidates:
+            if self.__git("ls-tree", self.__rev, "--",
+                          f"{candidate}/__init__.py"):
+                return candidate
+        raise ValueError(f"{package}: no package at {self.__rev}")
+
+    def iter_sources(self, package: str) -> Iterator[tuple[str, bytes]]:
+        """Read the Python files of a package.
+
+        Args:
+            package (str): /path/to/the/package or <package_name>
+
+        Returns:
+            Iterator[tuple[str, bytes]]: path (relative to the top-level
+            directory), source
+
+        """
+        for blob, path in self.ls_tree(self.find_package(package)):
+            yield path, self.cat_file(blob)
+
+    def close(self) -> None:
+        """Stop the git cat-file process."""
+        if self.__process is None:
+            return
+        self.__process.communicate()
+        self.__process = None
+
+
+if __name__ == "__main__":
+    import doctest
+    doctest.testmod()
@@ -0,0 +1,302 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Docstring2md: index.
+
+This script is free software; you can redistribute it and/or
+modify it under the terms of the GNU Lesser General Public
+License as published by the Free Software Foundation; either
+version 3 of the License, or (at your option) any later version.
+
+This script is provided in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.
+"""
+from __future__ import annotations
+
+import re
+import sqlite3
+from types import TracebackType
+from typing import Iterator, NamedTuple, Optional
+
+from docstring2md.__config__ import (INDEX_SEARCH_LIMIT, INDEX_TIMEOUT,
+                                     LOG_MSG, Const)
+from docstring2md.ast_engine import NodeDef, NodeListType
+from docstring2md.log import logger
+
+# name of a class/function definition (after the decorators)
+INDEX_DEFINITION: re.Pattern[str] = re.compile(
+    r"^(class|def) ([\w.]+)", flags=re.MULTILINE)
+INDEX_SCHEMA: str = """
+CREATE TABLE IF NOT EXISTS symbols (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL,
+    kind TEXT NOT NULL,
+    level INTEGER NOT NULL,
+    module TEXT NOT NULL,
+    definition TEXT NOT NULL,
+    docstring TEXT NOT NULL);
+CREATE INDEX IF NOT EXISTS symbols_name ON symbols (name);
+CREATE INDEX IF NOT EXISTS symbols_module ON symbols (module);
+"""
+INDEX_FTS_SCHEMA: str = """
+CREATE VIRTUAL TABLE IF NOT EXISTS symbols_fts USING fts5 (
+    name, docstring, content='symbols', content_rowid='id');
+CREATE TRIGGER IF NOT EXISTS symbols_fts_insert AFTER INSERT ON symbols
+BEGIN
+    INSERT INTO symbols_fts (rowid, name, docstring)
+    VALUES (new.id, new.name, new.docstring);
+END;
+CREATE TRIGGER IF NOT EXISTS symbols_fts_delete AFTER DELETE ON symbols
+BEGIN
+    INSERT INTO symbols_fts (symbols_fts, rowid, name, docstring)
+    VALUES ('delete', old.id, old.name, old.docstring);
+END;
+"""
+INDEX_SELECT: str = \
+    "SELECT name, kind, level, module, definition, docstring FROM symbols"
+
+
+class Symbol(NamedTuple):
+    """Define a row of the index.
+
+    Attributes:
+        name (str): qualified name (package.module.Class.method)
+        kind (str): class, function, method or property
+        level (int): level in the module
+        module (str): dotted name of the module
+        definition (str): class/function definition
+        docstring (str): raw docstring
+
+    """
+
+    name: str
+    kind: str
+    level: int
+    module: str
+    definition: str
+    docstring: str
+
+
+def iter_symbols(module: str, node_lst: NodeListType) -> Iterator[Symbol]:
+    r"""Get the rows of a module.
+
+    The qualified names of the functions are read from their definitions
+    (module-qualified), the names of the classes and the kinds are rebuilt
+    from the levels: a function defined in a class is a method (a property
+    if it is decorated with @property). A private function is not
+    extracted: a class defined in it is local (not indexed).
+
+    Args:
+        module (str): dotted name of the module
+        node_lst (NodeListType): nodes of the module (not released)
+
+    Returns:
+        Iterator[Symbol]: rows
+
+    Examples:
+        >>> from docstring2md.mod import PytMod
+        >>> nodes = PytMod.extract(
+        ...     "class A:\n"
+        ...     "    @property\n"
+        ...     "    def b(self): pass\n"
+        ...     "    def c(self): pass\n"
+        ...     "def d(): pass\n")
+        >>> for symbol in iter_symbols("pkg.mod", nodes):
+        ...     print(symbol.name, symbol.kind, symbol.level)
+        pkg.mod.A class 1
+        pkg.mod.A.b property 2
+        pkg.mod.A.c method 2
+        pkg.mod.d function 1
+        >>> # the private function __f is skipped: C is local
+        >>> nodes = PytMod.extract(
+        ...     "class A:\n"
+        ...     "    def __f(self):\n"
+        ...     "        class C:\n"
+        ...     "            def g(self): pass\n"
+        ...     "    def h(self): pass\n")
+        >>> for symbol in iter_symbols("pkg.mod", nodes):
+        ...     print(symbol.name, symbol.kind, symbol.level)
+        pkg.mod.A class 1
+        pkg.mod.A.__f.C.g method 4
+        pkg.mod.A.h method 2
+
+    """
+    # qualified name (None => local class) and kind of the parents, by level
+    parents: list[tuple[Optional[str], str]] = []
+    for node in node_lst:
+        if not isinstance(node, NodeDef):
+            continue
+        match: Optional[re.Match[str]] = INDEX_DEFINITION.search(
+            node.definition)
+        if match is None:
+            continue
+        del parents[max(node.level - 1, 0):]
+        # the parents missing in the stack are skipped private functions
+        parent: tuple[Optional[str], str] = \
+            (None, "function") if len(parents) < node.level - 1 else \
+            parents[-1] if parents else (module, "")
+        while len(parents) < node.level - 1:
+            parents.append((None, "function"))
+        kind: str = "class" if match.group(1) == "class" else \
+            "function" if parent[1] != "class" else \
+            "property" if node.definition.startswith(
+                f"{Const.DECORATOR_TAG.value}property") else "method"
+        name: Optional[str] = \
+            f"{module}{Const.DOT.value}{match.group(2)}" if kind != "class" \
+            else None if parent[0] is None \
+            else f"{parent[0]}{Const.DOT.value}{match.group(2)}"
+        parents.append((name, kind))
+        if name is not None:
+            yield Symbol(name, kind, node.level, module, node.definition,
+                         node.docstring)
+
+
+class SymbolIndex:
+    r"""Store the documented objects in a SQLite database.
+
+    The symbols are indexed by qualified name and by module, and the
+    docstrings by an FTS5 table (LIKE is used if FTS5 is not available).
+    The database is updated module by module: several packages can share
+    it. The changes are committed when the index is closed.
+
+    Examples:
+        >>> import tempfile
+        >>> from docstring2md.mod import PytMod
+        >>> tmp = tempfile.TemporaryDirectory()
+        >>> with SymbolIndex(f"{tmp.name}/index.sqlite") as index:
+        ...     index.put_module("json", PytMod.extract(
+        ...         "def loads(s):\n    '''Deserialize a JSON document.'''"))
+        1
+        >>> with SymbolIndex(f"{tmp.name}/index.sqlite") as index:
+        ...     index.find("json.loads")[0].kind
+        ...     [symbol.name for symbol in index.search("deserialize")]
+        'function'
+        ['json.loads']
+        >>> # only the modules of the package are deleted
+        >>> with SymbolIndex(f"{tmp.name}/index.sqlite") as index:
+        ...     modules = ("a.b", "a.b.c", "a.bc", "a.d")
+        ...     for module in modules:
+        ...         _ = index.put_module(module, PytMod.extract("def f(): 0"))
+        ...     index.delete_package("a.b")
+        ...     [bool(index.find(f"{module}.f")) for module in modules]
+        [False, False, True, True]
+        >>> tmp.cleanup()
+
+    """
+
+    __connection: sqlite3.Connection
+    __fts: bool
+
+    def __init__(self, path: str) -> None:
+        """Open (or create) the database.
+
+        Args:
+            path (str): /path/to/index.sqlite
+
+        Raises:
+            sqlite3.Error: the database cannot be opened
+
+        """
+        self.__connection = sqlite3.connect(path, timeout=INDEX_TIMEOUT)
+        self.__connection.execute("PRAGMA journal_mode=WAL")
+        self.__connection.executescript(INDEX_SCHEMA)
+        try:
+            self.__connection.executescript(INDEX_FTS_SCHEMA)
+            self.__fts = True
+        except sqlite3.OperationalError:
+            logger.warning(LOG_MSG.index.warning)
+            self.__fts = False
+
+    def __enter__(self) -> SymbolIndex:
+        """Use the index in a with statement."""
+        return self
+
+    def __exit__(self, exc_type: Optional[type[BaseException]],
+                 exc_value: Optional[BaseException],
+                 traceback: Optional[TracebackType]) -> None:
+        """Commit the changes (rollback on error) and close the index."""
+        if exc_type is None:
+            self.__connection.commit()
+        else:
+            self.__connection.rollback()
+        self.__connection.close()
+
+    def put_module(self, module: str, node_lst: NodeListType) -> int:
+        """Replace the symbols of a module.
+
+        Args:
+            module (str): dotted name of the module
+            node_lst (NodeListType): nodes of the module (not released)
+
+        Returns:
+            int: number of symbols
+
+        """
+        self.delete_module(module)
+        cursor: sqlite3.Cursor = self.__connection.executemany(
+            "INSERT INTO symbols (name, kind, level, module, definition, "
+            "docstring) VALUES (?, ?, ?, ?, ?, ?)",
+            iter_symbols(module, node_lst))
+        return cursor.rowcount
+
+    def delete_module(self, module: str) -> None:
+        """Delete the symbols of a module.
+
+        Args:
+            module (str): dotted name of the module
+
+        """
+        self.__connection.execute(
+            "DELETE FROM symbols WHERE module = ?", (module,))
+
+    def delete_package(self, package: str) -> None:
+        """Delete the symbols of a package (all its modules).
+
+        Args:
+            package (str): dotted name of the package
+
+        """
+        self.__connection.execute(
+            "DELETE FROM symbols WHERE module = ? OR "
+            "substr(module, 1, ?) = ?",
+            (package, len(package) + 1, f"{package}{Const.DOT.value}"))
+
+    def find(self, name: str) -> list[Symbol]:
+        """Find the symbols by qualified name.
+
+        Args:
+            name (str): qualified name
+
+        Returns:
+            list[Symbol]: symbols
+
+        """
+        return [Symbol(*row) for row in self.__connection.execute(
+            f"{INDEX_SELECT} WHERE name = ? ORDER BY id", (name,))]
+
+    def search(self, query: str,
+               limit: int = INDEX_SEARCH_LIMIT) -> list[Symbol]:
+        """Search the docstrings (FTS5 query, best matches first).
+
+        Args:
+            query (str): FTS5 query (words if FTS5 is not available)
+            limit (int): number of symbols
+
+        Returns:
+            list[Symbol]: symbols
+
+        """
+        if not self.__fts:
+            return [Symbol(*row) for row in self.__connection.execute(
+                f"{INDEX_SELECT} WHERE docstring LIKE ? ORDER BY id LIMIT ?",
+                (f"%{query}%", limit))]
+        return [Symbol(*row) for row in self.__connection.execute(
+            f"{INDEX_SELECT} JOIN (SELECT rowid, rank FROM symbols_fts "
+            "WHERE symbols_fts MATCH ? ORDER BY rank LIMIT ?) AS fts "
+            "ON id = fts.rowid ORDER BY fts.rank", (query, limit))]
+
+
+if __name__ == "__main__":
+    import doctest
+    doctest.testmod()
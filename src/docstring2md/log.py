@@ -16,31 +16,61 @@ from __future__ import annotations
 
 import logging
 import os
-
-from rich.logging import RichHandler
+import sys
 
 from docstring2md.__config__ import LOG_MSG, LOGGING_SETUP
 
 if __name__ == "__main__":
     raise Exception("Do not start this script manually !")
 
-# ------------------------------------------------------------------------------
-# Windows specific
-# ------------------------------------------------------------------------------
-# enables ansi escape characters in Windows terminals
-if os.name == "nt":
-    os.system("")
+# the library does not configure logging: the CLI does (setup_logging)
+logger: logging.Logger = logging.getLogger(__name__)
+
 
 # ------------------------------------------------------------------------------
 # logging : basic config
 # ------------------------------------------------------------------------------
-logging.basicConfig(
-    level=LOGGING_SETUP.default_level,
-    format=LOGGING_SETUP.default_format,
-    handlers=[RichHandler(rich_tracebacks=True, show_time=False)]
-)
+def get_handler() -> logging.Handler:
+    """Get the console handler.
 
-logger: logging.Logger = logging.getLogger(__name__)
+    rich is imported only if stderr is a terminal: a plain handler is used
+    otherwise (pipe, CI, pre-commit hook...).
+
+    Returns:
+        logging.Handler: RichHandler or StreamHandler (stderr)
+
+    Examples:
+        >>> import io
+        >>> from unittest import mock
+        >>> with mock.patch("sys.stderr", io.StringIO()):
+        ...     type(get_handler()).__name__
+        'StreamHandler'
+
+    """
+    if not sys.stderr.isatty():
+        handler: logging.Handler = logging.StreamHandler()
+        handler.setFormatter(logging.Formatter(LOGGING_SETUP.simple_format))
+        return handler
+    # enables ansi escape characters in Windows terminals
+    if os.name == "nt":
+        os.system("")
+    # pylint: disable-next=import-outside-toplevel
+    from rich.logging import RichHandler
+    return RichHandler(rich_tracebacks=True, show_time=False)
+
+
+def setup_logging() -> None:
+    """Set up the console logging (CLI).
+
+    The root logger is configured once: the level is INFO and the events
+    are written to stderr.
+
+    """
+    logging.basicConfig(
+        level=LOGGING_SETUP.default_level,
+        format=LOGGING_SETUP.default_format,
+        handlers=[get_handler()]
+    )
 
 
 # ------------------------------------------------------------------------------
@@ -14,15 +14,53 @@ MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.
 """
 from __future__ import annotations
 
+import ast
 import importlib
+import os
 import pkgutil
+import sys
 from collections import deque
-from typing import Optional
-
-from docstring2md.__config__ import LOG_MSG
+from concurrent.futures import Executor, Future
+from contextlib import ExitStack
+from importlib.machinery import PathFinder
+from itertools import chain
+from pathlib import Path
+from typing import Iterable, NamedTuple, Optional, Union
+
+from docstring2md.__config__ import LOG_MSG, Const
+from docstring2md.archive import Archive
 from docstring2md.ast_engine import NodeListType, ObjVisitor
-from docstring2md.file import MyFile
+from docstring2md.cache import ExtractCache, MemoryCache
+from docstring2md.file import MyFile, SourceType
 from docstring2md.log import logger
+from docstring2md.profiler import Profiler, profile_phase
+
+ModuleListType = dict[str, NodeListType]
+
+
+class PytModOptions(NamedTuple):
+    """Define the PytMod options.
+
+    Attributes:
+        cache (ExtractCache | MemoryCache): extraction cache (None => no
+            cache)
+        jobs (int): number of processes used to extract the modules
+        no_import (bool): True -> discover the modules without importing
+            the package
+        profiler (Profiler): profiler (None => no profiling)
+        executor (Executor): shared process pool (None => a pool is
+            created for each extraction)
+        git_rev (str): read the package at this git revision, without
+            checking it out (None => the files are read)
+
+    """
+
+    cache: Optional[Union[ExtractCache, MemoryCache]] = None
+    jobs: int = 1
+    no_import: bool = False
+    profiler: Optional[Profiler] = None
+    executor: Optional[Executor] = None
+    git_rev: Optional[str] = None
 
 
 class PytMod:
@@ -38,8 +76,8 @@ class PytMod:
         ModuleNotFoundError: No module named 'oups'
         >>> mod = PytMod("json")
         >>> mod.read()
-        >>> print(mod.node_lst[0].definition)
-        def dump(obj, fp, **kw):
+        >>> print(mod.node_lst[0].definition[:37])
+        def dump(obj, fp, *, skipkeys = False
         >>> mod = PytMod(__file__)
         >>> mod.read()
         >>> print(mod.node_lst[0].docstring)
@@ -50,24 +88,79 @@ class PytMod:
         >>> mod.read()
         >>> print(mod.node_lst[0].definition)
         class Const(Enum):
+        >>> # a process pool gives the same nodes in the same order
+        >>> mod_jobs = PytMod('docstring2md', options=PytModOptions(jobs=2))
+        >>> mod_jobs.read()
+        >>> list(mod_jobs.node_lst) == list(mod.node_lst)
+        True
+        >>> # discovery without import (package name or path)
+        >>> no_import = PytModOptions(no_import=True)
+        >>> mod_fs = PytMod('docstring2md', options=no_import)
+        >>> mod_fs.read()
+        >>> list(mod_fs.node_lst) == list(mod.node_lst)
+        True
+        >>> mod_fs = PytMod(str(Path(__file__).parent), options=no_import)
+        >>> mod_fs.read()
+        >>> list(mod_fs.node_lst) == list(mod.node_lst)
+        True
+        >>> # only the changed modules are extracted again
+        >>> mod.refresh([__file__])
+        True
+        >>> list(mod_fs.node_lst) == list(mod.node_lst)
+        True
+        >>> mod.refresh(["/oups/README.md"])
+        False
+        >>> # wheel, zip or sdist: the modules are read from the archive
+        >>> import tempfile, zipfile
+        >>> tmp = tempfile.TemporaryDirectory()
+        >>> wheel = f"{tmp.name}/docstring2md-1.0-py3-none-any.whl"
+        >>> with zipfile.ZipFile(wheel, "w") as archive:
+        ...     for module in mod.modules:
+        ...         archive.write(module, Path(module).relative_to(
+        ...             Path(__file__).parent.parent))
+        >>> mod_whl = PytMod(wheel)
+        >>> mod_whl.read()
+        >>> list(mod_whl.node_lst) == list(mod.node_lst)
+        True
+        >>> mod_whl.get_module_name(mod_whl.modules[1])
+        'docstring2md.__about__'
+        >>> tmp.cleanup()
+        >>> # git revision: the files are read without checkout
+        >>> mod_git = PytMod(str(Path(__file__).parent),
+        ...                  options=PytModOptions(git_rev="HEAD"))
+        >>> mod_git.read()
+        >>> mod_git.get_module_name(mod_git.modules[1])
+        'docstring2md.__about__'
+        >>> PytMod("docstring2md", options=PytModOptions(
+        ...     git_rev="oups...")).read()
+        Traceback (most recent call last):
+        ...
+        ModuleNotFoundError: No module named 'docstring2md'
 
     """
 
     __path: Optional[str]
     __module: str
     __private_def: bool
+    __options: PytModOptions
+    __archive: Optional[Archive]
 
-    def __init__(self, module_name: str, private_def: bool = False) -> None:
+    def __init__(self, module_name: str, private_def: bool = False,
+                 options: PytModOptions = PytModOptions()) -> None:
         """Init the object.
 
         Args:
             module_name (str): module name
             private_def (bool): extract private def
+            options (PytModOptions): cache, jobs and discovery options
         """
         self.__path = ""
         self.__module = module_name
         self.__private_def = private_def
+        self.__options = options
+        self.__archive = None
         self.__node_lst: NodeListType = deque()
+        self.__mod_lst: ModuleListType = {}
         logger.debug(LOG_MSG.pytmod.debug, module_name)
 
     @property
@@ -78,6 +171,7 @@ class PytMod:
             modulename
             /path/to/the/mod
             ./path/to/the/mod
+            /path/to/the/archive.whl (.zip, .tar.gz)
         """
         return self.__module
 
@@ -91,6 +185,75 @@ class PytMod:
         """
         return self.__node_lst
 
+    @property
+    def modules(self) -> list[str]:
+        """Get the module files.
+
+        Returns:
+            list[str]: /path/to/the/module.py (in an archive:
+            /path/to/the/archive.whl/package/module.py)
+
+        """
+        return list(self.__mod_lst)
+
+    @property
+    def module_nodes(self) -> ModuleListType:
+        """Get the nodes of each module.
+
+        Returns:
+            ModuleListType: /path/to/the/module.py => nodes
+
+        """
+        return self.__mod_lst
+
+    def get_module_name(self, module: str) -> str:
+        """Get the dotted name of a module file.
+
+        Args:
+            module (str): /path/to/the/module.py
+
+        Returns:
+            str: package.module (package for __init__.py)
+
+        Examples:
+            >>> mod = PytMod("json", options=PytModOptions(no_import=True))
+            >>> mod.read()
+            >>> [mod.get_module_name(module) for module in mod.modules[:2]]
+            ['json', 'json.decoder']
+
+        """
+        path: Path = Path(module).with_suffix("")
+        if self.ismodule() or not self.__path:
+            return path.name
+        try:
+            # an archive can have several top-level packages
+            parts: tuple[str, ...] = path.relative_to(
+                Path(self.__path).parent).parts
+        except ValueError:
+            # namespace package: another directory
+            return path.name
+        if parts[-1:] == ("__init__",):
+            parts = parts[:-1]
+        return Const.DOT.value.join(parts)
+
+    @property
+    def packages(self) -> list[str]:
+        """Get the dotted names of the top-level packages.
+
+        Returns:
+            list[str]: packages (an archive can have several ones)
+
+        Examples:
+            >>> mod = PytMod("email.mime", options=PytModOptions(
+            ...     no_import=True))
+            >>> mod.read()
+            >>> mod.packages
+            ['mime']
+
+        """
+        return sorted({self.get_module_name(module).split(
+            Const.DOT.value, 1)[0] for module in self.__mod_lst})
+
     @property
     def pkg_main_docstring(self) -> NodeListType:
         """Get the main docstring.
@@ -103,8 +266,15 @@ class PytMod:
             logger.debug(LOG_MSG.pytmod_mod.info, self.module)
             return deque()
         logger.debug(LOG_MSG.pytmod_script.info, self.module)
-        return self.__get_doc_from_module(
-            f"{self.__path}/__init__.py", module_docstring=True)
+        # archive without package: the first top-level module
+        init_file: str = f"{self.__path}/__init__.py"
+        if self.__archive and self.__archive.exists(f"{self.__path}.py"):
+            init_file = f"{self.__path}.py"
+        # namespace package
+        if not (self.__archive.exists(init_file) if self.__archive
+                else MyFile.set_path(init_file).exists):
+            return deque()
+        return self.__get_doc_from_module(init_file, module_docstring=True)
 
     def ismodule(self) -> bool:
         """Check the module.
@@ -132,27 +302,153 @@ class PytMod:
         logger.info(LOG_MSG.pytmod.info, self.module)
         if self.ismodule():
             logger.info(LOG_MSG.pytmod_mod.info, self.module)
-            self.__node_lst += self.__get_doc_from_module(
-                self.module, module_docstring=True)
+            self.__mod_lst = {self.module: self.__get_doc_from_module(
+                self.module, module_docstring=True)}
         else:
             logger.info(LOG_MSG.pytmod_script.info, self.module)
-            self.__node_lst += self.__get_doc_from_pkg(self.module)
+            self.__mod_lst = self.__get_doc_from_pkg(
+                self.__get_modules(self.module))
+        self.__node_lst = deque(chain.from_iterable(self.__mod_lst.values()))
 
-    def __get_doc_from_module(
-            self, module: str, module_docstring: bool = False) \
+    def refresh(self, paths: Iterable[str]) -> bool:
+        """Read the changed modules again.
+
+        Only the changed modules are extracted again. The package is
+        walked again if a module has been created or deleted.
+
+        Args:
+            paths (Iterable[str]): changed files
+
+        Returns:
+            bool: True if the node list has been updated, False otherwise.
+
+        """
+        changed: set[str] = {os.path.normpath(path) for path in paths}
+        known: dict[str, str] = {
+            os.path.normpath(module): module for module in self.__mod_lst}
+        if self.__archive is not None:
+            known = {os.path.normpath(self.module): self.module}
+        if self.ismodule() or self.__archive is not None or \
+                not self.__mod_lst:
+            if not changed & set(known):
+                return False
+            self.read()
+            return True
+        modules: list[str] = list(self.__mod_lst)
+        # a module or a sub-package created or deleted
+        if any(path.endswith(".py") and (
+                path not in known or not os.path.exists(path))
+               or os.path.isdir(path) for path in changed):
+            modules = self.__get_modules(self.module)
+        todo: list[str] = [
+            module for module in modules
+            if os.path.normpath(module) in changed
+            or module not in self.__mod_lst]
+        if not todo and modules == list(self.__mod_lst):
+            return False
+        mod_lst: ModuleListType = self.__get_doc_from_pkg(todo)
+        self.__mod_lst = {
+            module: mod_lst[module] if module in mod_lst
+            else self.__mod_lst[module] for module in modules}
+        self.__node_lst = deque(chain.from_iterable(self.__mod_lst.values()))
+        return True
+
+    @staticmethod
+    def extract(source: SourceType, module_docstring: bool = False,
+                private_def: bool = False,
+                profiler: Optional[Profiler] = None, module: str = "") \
             -> NodeListType:
-        # module name, for example json
-        source = MyFile.set_path(module)
+        """Extract the nodes from a source code.
+
+        This function is used by the workers to extract the modules.
+
+        Args:
+            source (SourceType): source code (str, bytes or mmap)
+            module_docstring (bool): get module docstring
+            private_def (bool): get private functions
+            profiler (Profiler): profiler (None => no profiling)
+            module (str): module (profiling)
+
+        Returns:
+            NodeListType
+
+        Examples:
+            >>> PytMod.extract("def test(): pass")[0].definition
+            'def test():'
+
+        """
         # create an ObjVisitor to search in the module
         doc: ObjVisitor = ObjVisitor(
             module_docstring=module_docstring,
-            private_def=self.__private_def
+            private_def=private_def
         )
         # Visit all module in the package
-        doc.visit(doc.parse(source.read()))
-
+        with profile_phase(profiler, "parse", module):
+            tree: ast.AST = doc.parse(source)
+        with profile_phase(profiler, "visit", module):
+            doc.visit(tree)
         return doc.node_lst
 
+    @staticmethod
+    def extract_module(module: str, module_docstring: bool = False,
+                       private_def: bool = False) -> NodeListType:
+        """Read a module and extract the nodes.
+
+        This function is used by the workers: the path is sent to the
+        worker, not the source code.
+
+        Args:
+            module (str): /path/to/the/module.py
+            module_docstring (bool): get module docstring
+            private_def (bool): get private functions
+
+        Returns:
+            NodeListType
+
+        """
+        with MyFile.set_path(module).open_bytes() as source:
+            return PytMod.extract(source, module_docstring, private_def)
+
+    def __get_from_cache(self, source: SourceType, module_docstring: bool) \
+            -> tuple[str, Optional[NodeListType]]:
+        # same source and options => same nodes
+        cache: Optional[Union[ExtractCache, MemoryCache]] = \
+            self.__options.cache
+        if cache is None:
+            return "", None
+        with profile_phase(self.__options.profiler, "cache"):
+            key: str = cache.get_key(
+                source, module_docstring=module_docstring,
+                private_def=self.__private_def)
+            return key, cache.get(key)
+
+    def __put_in_cache(self, key: str, node_lst: NodeListType) -> None:
+        if self.__options.cache is not None:
+            with profile_phase(self.__options.profiler, "cache"):
+                self.__options.cache.put(key, node_lst)
+
+    def __read_source(self, module: str, stack: ExitStack) -> SourceType:
+        # the source stays open until the stack is closed
+        with profile_phase(self.__options.profiler, "read", module):
+            if self.__archive is not None:
+                return self.__archive.get_source(module)
+            return stack.enter_context(MyFile.set_path(module).open_bytes())
+
+    def __get_doc_from_module(
+            self, module: str, module_docstring: bool = False) \
+            -> NodeListType:
+        # module name, for example json
+        with ExitStack() as stack:
+            source: SourceType = self.__read_source(module, stack)
+            key, node_lst = self.__get_from_cache(source, module_docstring)
+            if node_lst is not None:
+                return node_lst
+            node_lst = self.extract(
+                source, module_docstring, self.__private_def,
+                self.__options.profiler, module)
+        self.__put_in_cache(key, node_lst)
+        return node_lst
+
     def __get_module_list(self, package: str) -> list[str]:
         module = []
         # Import the module
@@ -177,16 +473,174 @@ class PytMod:
                 module.append(f"{imp_pkg.__path__[0]}/{modname}.py")
         return module
 
-    def __get_doc_from_pkg(self, package: str) -> NodeListType:
-        node_lst: NodeListType = deque()
+    @staticmethod
+    def find_package(package: str) -> list[str]:
+        """Find the package's directories without importing it.
+
+        The package is a /path/to/the/package or a package name. A package
+        name is resolved like the import system (find_spec) without
+        executing any package code: sys.path is used first, then the
+        current directory and ./src (src layout).
+        A namespace package can have several directories.
+
+        Args:
+            package (str): /path/to/the/package or <package_name>
+
+        Returns:
+            list[str]: directories
+
+        Examples:
+            >>> PytMod.find_package("json")[0].endswith("json")
+            True
+            >>> PytMod.find_package("xml.dom")[0].endswith("dom")
+            True
+            >>> PytMod.find_package("json.oups")
+            Traceback (most recent call last):
+            ...
+            ModuleNotFoundError: No module named 'json.oups'
+
+        """
+        if Path(package).is_dir():
+            return [str(Path(package))]
+        search_path: list[str] = sys.path + [
+            os.getcwd(), os.path.join(os.getcwd(), "src")]
+        parts: list[str] = package.split(".")
+        for idx in range(len(parts)):
+            spec = PathFinder.find_spec(
+                ".".join(parts[:idx + 1]), search_path)
+            if spec is None or spec.submodule_search_locations is None:
+                raise ModuleNotFoundError(
+                    f"No module named '{package}'", name=package)
+            search_path = list(spec.submodule_search_locations)
+        return search_path
+
+    def __walk_package(self, package: str, paths: list[str]) -> list[str]:
+        # same list as __get_module_list, on the filesystem only
+        module: list[str] = []
+        for path in paths:
+            # keep the original path
+            if self.__path == "":
+                self.__path = path
+            init_file = MyFile.set_path(f"{path}/__init__.py")
+            if init_file.exists:
+                module.append(str(init_file.path))
+            for _finder, modname, ispkg in pkgutil.iter_modules([path]):
+                fullname = f"{package}.{modname}"
+                if ispkg:
+                    logger.info(LOG_MSG.new_module.info, fullname)
+                    module += self.__walk_package(
+                        fullname, [f"{path}/{modname}"])
+                else:
+                    module.append(f"{path}/{modname}.py")
+        return module
+
+    @staticmethod
+    def __read_revision(package: str, rev: str) -> Archive:
+        # the files of the revision are read like an archive:
+        # /path/to/the/repository@rev/src/package/module.py
+        # pylint: disable-next=import-outside-toplevel
+        from docstring2md.git import GitRevision
+        with GitRevision(rev, package if os.path.isdir(package)
+                         else os.curdir) as git:
+            return Archive(f"{git.directory}@{rev}",
+                           git.iter_sources(package))
+
+    def __get_archive_modules(self, path: str) -> list[str]:
+        # the archive is read again: it may have been rebuilt
+        git_rev: Optional[str] = self.__options.git_rev
+        try:
+            self.__archive = Archive(path) if git_rev is None \
+                else self.__read_revision(path, git_rev)
+        except (OSError, ValueError) as err:
+            logger.error((LOG_MSG.archive if git_rev is None
+                          else LOG_MSG.git).error, err)
+            raise ModuleNotFoundError(
+                f"No module named '{path}'", name=path) from err
+        if not self.__archive.modules:
+            logger.error(LOG_MSG.archive.warning, path)
+            raise ModuleNotFoundError(
+                f"No module named '{path}'", name=path)
+        self.__path = self.__archive.package
+        return self.__archive.modules
+
+    def __get_modules(self, package: str) -> list[str]:
         # get all modules
-        modules = self.__get_module_list(package)
+        with profile_phase(self.__options.profiler, "discovery"):
+            if self.__options.git_rev is not None or \
+                    Archive.is_archive(package):
+                return self.__get_archive_modules(package)
+            modules: list[str] = self.__walk_package(
+                package, self.find_package(package)) \
+                if self.__options.no_import \
+                else self.__get_module_list(package)
         logger.debug(LOG_MSG.pytmod_script.debug, str(modules))
+        return modules
+
+    def __get_doc_from_pkg(self, modules: list[str]) -> ModuleListType:
+        if self.__options.jobs > 1 and len(modules) > 1:
+            return dict(zip(modules, self.__get_doc_from_modules(modules)))
         # read all modules and get all nodes
+        mod_lst: ModuleListType = {}
         for module in modules:
             logger.info(LOG_MSG.pytmod_extract.info, module)
-            node_lst += self.__get_doc_from_module(module)
-        return node_lst
+            mod_lst[module] = self.__get_doc_from_module(module)
+        return mod_lst
+
+    def __get_doc_from_modules(self, modules: list[str]) \
+            -> list[NodeListType]:
+        # same result as __get_doc_from_module on each module, in the same
+        # order, but the extraction is done by a process pool.
+        result: list[NodeListType] = [deque() for _ in modules]
+        # index, key, module, source (None => read by the worker), size
+        todo: list[tuple[int, str, str, Optional[bytes], int]] = []
+        for idx, module in enumerate(modules):
+            logger.info(LOG_MSG.pytmod_extract.info, module)
+            if self.__options.cache is None and self.__archive is None:
+                # the workers read the modules
+                todo.append(
+                    (idx, "", module, None, os.path.getsize(module)))
+                continue
+            # the source read for the key is sent: not read twice
+            with ExitStack() as stack:
+                source: SourceType = self.__read_source(module, stack)
+                key, node_lst = self.__get_from_cache(source, False)
+                if node_lst is None:
+                    todo.append((idx, key, module, source.encode()
+                                 if isinstance(source, str)
+                                 else bytes(source), len(source)))
+            if node_lst is not None:
+                result[idx] = node_lst
+        if not todo:
+            return result
+        # biggest modules first: a huge module submitted last would keep
+        # one worker busy while the others are idle.
+        todo.sort(key=lambda elem: elem[4], reverse=True)
+        if self.__options.profiler is not None:
+            logger.warning(LOG_MSG.profile.warning, self.__options.jobs)
+        # loaded on demand: multiprocessing is slow to import
+        # pylint: disable-next=import-outside-toplevel
+        from concurrent.futures import ProcessPoolExecutor
+        with profile_phase(self.__options.profiler, "extract"), \
+                ExitStack() as stack:
+            executor: Executor = self.__options.executor or \
+                stack.enter_context(ProcessPoolExecutor(
+                    max_workers=min(self.__options.jobs, len(todo))))
+            futures: list[tuple[int, str, Future[NodeListType]]] = [
+                (idx, key, self.__submit(executor, module, source))
+                for idx, key, module, source, _size in todo]
+            for idx, key, future in futures:
+                result[idx] = future.result()
+                self.__put_in_cache(key, result[idx])
+        return result
+
+    def __submit(self, executor: Executor, module: str,
+                 source: Optional[bytes]) -> Future[NodeListType]:
+        # source already read (cache key, archive member): sent to the worker
+        if source is not None:
+            return executor.submit(
+                PytMod.extract, source, False, self.__private_def)
+        return executor.submit(
+            PytMod.extract_module, module, False, self.__private_def)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,292 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Docstring2md: profiler.
+
+This script is free software; you can redistribute it and/or
+modify it under the terms of the GNU Lesser General Public
+License as published by the Free Software Foundation; either
+version 3 of the License, or (at your option) any later version.
+
+This script is provided in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.
+"""
+from __future__ import annotations
+
+import cProfile
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager, nullcontext
+from typing import Any, ContextManager, Iterable, Iterator, Optional
+
+from docstring2md.__config__ import PROFILE_TOP
+
+
+class Profiler:
+    """Measure the time spent in each phase of a run.
+
+    A phase is timed with a context manager. The phases can be nested: the
+    report gives the time spent in each phase itself (the nested phases
+    excluded). The phases of a module are summed to rank the slowest
+    modules.
+    The run can also be profiled with cProfile and the phases recorded as
+    Chrome trace events (chrome://tracing, Perfetto...).
+
+    Examples:
+        >>> profiler = Profiler(trace=True)
+        >>> profiler.start()
+        >>> with profiler.phase("write"):
+        ...     with profiler.phase("parse", "mod.py"):
+        ...         pass
+        >>> profiler.stop()
+        >>> list(profiler.phases)
+        ['write', 'parse']
+        >>> profiler.phases["parse"][2]
+        1
+        >>> list(profiler.modules)
+        ['mod.py']
+        >>> [event["name"] for event in profiler.events]
+        ['parse', 'write']
+
+    """
+
+    __phases: dict[str, list[Any]]
+    __modules: dict[str, float]
+    __stack: list[list[float]]
+    __events: Optional[list[dict[str, Any]]]
+    __cprofile: Optional[cProfile.Profile]
+    __origin: float
+    __total: tuple[float, float]
+
+    def __init__(self, cprofile: bool = False, trace: bool = False) -> None:
+        """Init the profiler.
+
+        Args:
+            cprofile (bool): profile the run with cProfile
+            trace (bool): record the Chrome trace events
+
+        """
+        self.__phases = {}
+        self.__modules = {}
+        self.__stack = []
+        self.__events = [] if trace else None
+        self.__cprofile = cProfile.Profile() if cprofile else None
+        self.__origin = time.perf_counter()
+        self.__total = (0.0, 0.0)
+
+    @property
+    def phases(self) -> dict[str, list[Any]]:
+        """Get the phases: name => [wall (s), CPU (s), calls]."""
+        return self.__phases
+
+    @property
+    def modules(self) -> dict[str, float]:
+        """Get the time spent on each module: module => wall (s)."""
+        return self.__modules
+
+    @property
+    def events(self) -> list[dict[str, Any]]:
+        """Get the Chrome trace events."""
+        return self.__events or []
+
+    @property
+    def elapse(self) -> float:
+        """Get the wall time between start and stop (s)."""
+        return self.__total[0]
+
+    def start(self) -> None:
+        """Start the run (and cProfile)."""
+        self.__total = (time.perf_counter(), time.process_time())
+        if self.__cprofile is not None:
+            self.__cprofile.enable()
+
+    def stop(self) -> None:
+        """Stop the run (and cProfile)."""
+        if self.__cprofile is not None:
+            self.__cprofile.disable()
+        self.__total = (time.perf_counter() - self.__total[0],
+                        time.process_time() - self.__total[1])
+
+    @contextmanager
+    def phase(self, name: str, module: str = "") -> Iterator[None]:
+        """Time a phase.
+
+        Args:
+            name (str): phase name
+            module (str): module (empty if the phase is global)
+
+        """
+        # the phases are reported in the order they start
+        self.__phases.setdefault(name, [0.0, 0.0, 0])
+        self.__stack.append([0.0, 0.0])
+        start: tuple[float, float] = (time.perf_counter(),
+                                      time.process_time())
+        try:
+            yield
+        finally:
+            self.__add(name, module, start)
+
+    def iter_phase(self, name: str, items: Iterable[Any]) -> Iterator[Any]:
+        """Time the production of the items of an iterator.
+
+        The time spent to produce all items is one call of the phase. The
+        phases nested in the production of an item are excluded, like in a
+        phase (the consumer's time between the items is not measured).
+
+        Args:
+            name (str): phase name
+            items (Iterable[Any]): items
+
+        Returns:
+            Iterator[Any]: same items
+
+        Examples:
+            >>> profiler = Profiler()
+            >>> def render():
+            ...     with profiler.phase("parse"):
+            ...         time.sleep(0.05)
+            ...     yield "chunk"
+            >>> with profiler.phase("write"):
+            ...     chunks = list(profiler.iter_phase("render", render()))
+            >>> list(profiler.phases)
+            ['write', 'render', 'parse']
+            >>> [profiler.phases[name][0] < 0.025
+            ...  for name in ("write", "render", "parse")]
+            [True, True, False]
+
+        """
+        self.__phases.setdefault(name, [0.0, 0.0, 0])
+        iterator: Iterator[Any] = iter(items)
+        wall: float = 0.0
+        cpu: float = 0.0
+        children: list[float] = [0.0, 0.0]
+        while True:
+            # a frame per item: the nested phases are not added to the
+            # consumer's phase
+            self.__stack.append([0.0, 0.0])
+            start: tuple[float, float] = (time.perf_counter(),
+                                          time.process_time())
+            try:
+                item: Any = next(iterator)
+            except StopIteration:
+                break
+            finally:
+                wall += time.perf_counter() - start[0]
+                cpu += time.process_time() - start[1]
+                frame: list[float] = self.__stack.pop()
+                children[0] += frame[0]
+                children[1] += frame[1]
+            yield item
+        self.__record(name, "", (wall, cpu, wall - children[0],
+                                 cpu - children[1]))
+
+    def __add(self, name: str, module: str,
+              start: tuple[float, float]) -> None:
+        wall: float = time.perf_counter() - start[0]
+        cpu: float = time.process_time() - start[1]
+        children: list[float] = self.__stack.pop()
+        self.__record(name, module,
+                      (wall, cpu, wall - children[0], cpu - children[1]))
+        if self.__events is not None:
+            event: dict[str, Any] = {
+                "name": name, "cat": "docstring2md", "ph": "X",
+                "ts": (start[0] - self.__origin) * 1e6, "dur": wall * 1e6,
+                "pid": os.getpid(), "tid": threading.get_ident()}
+            if module:
+                event["args"] = {"module": module}
+            self.__events.append(event)
+
+    def __record(self, name: str, module: str,
+                 times: tuple[float, float, float, float]) -> None:
+        # times: wall, cpu, wall and cpu without the nested phases
+        if self.__stack:
+            self.__stack[-1][0] += times[0]
+            self.__stack[-1][1] += times[1]
+        phase: list[Any] = self.__phases.setdefault(name, [0.0, 0.0, 0])
+        phase[0] += times[2]
+        phase[1] += times[3]
+        phase[2] += 1
+        if module:
+            self.__modules[module] = self.__modules.get(module, 0.0) + \
+                times[2]
+
+    def get_report(self, top: int = PROFILE_TOP) -> str:
+        """Get the report: phases and slowest modules.
+
+        Args:
+            top (int): number of modules
+
+        Returns:
+            str: report
+
+        """
+        lines: list[str] = [f"{'phase':<12}{'wall (s)':>10}{'cpu (s)':>10}"
+                            f"{'calls':>8}"]
+        lines += [f"{name:<12}{wall:10.3f}{cpu:10.3f}{calls:8d}"
+                  for name, (wall, cpu, calls) in self.__phases.items()]
+        if self.__total != (0.0, 0.0):
+            other: tuple[float, float] = (
+                self.__total[0] - sum(phase[0] for phase in
+                                      self.__phases.values()),
+                self.__total[1] - sum(phase[1] for phase in
+                                      self.__phases.values()))
+            lines.append(f"{'other':<12}{other[0]:10.3f}{other[1]:10.3f}")
+            lines.append(f"{'total':<12}{self.__total[0]:10.3f}"
+                         f"{self.__total[1]:10.3f}")
+        if self.__modules:
+            lines.append(f"slowest modules (wall, {top} max):")
+            lines += [f"{wall:10.3f}  {module}" for module, wall in sorted(
+                self.__modules.items(), key=lambda elem: elem[1],
+                reverse=True)[:top]]
+        return "\n".join(lines)
+
+    def write_stats(self, path: str) -> None:
+        """Write the cProfile stats (pstats format).
+
+        Args:
+            path (str): /path/to/file.prof
+
+        """
+        if self.__cprofile is not None:
+            self.__cprofile.dump_stats(path)
+
+    def write_trace(self, path: str) -> None:
+        """Write the Chrome trace events (JSON).
+
+        Args:
+            path (str): /path/to/file.json
+
+        """
+        with open(path, "w", encoding="utf-8") as file:
+            json.dump({"traceEvents": self.events,
+                       "displayTimeUnit": "ms"}, file)
+
+
+def profile_phase(profiler: Optional[Profiler], name: str,
+                  module: str = "") -> ContextManager[None]:
+    """Time a phase if the profiler is defined.
+
+    Args:
+        profiler (Profiler): profiler (None => nothing is measured)
+        name (str): phase name
+        module (str): module (empty if the phase is global)
+
+    Returns:
+        ContextManager[None]
+
+    Examples:
+        >>> with profile_phase(None, "parse"):
+        ...     pass
+
+    """
+    if profiler is None:
+        return nullcontext()
+    return profiler.phase(name, module)
+
+
+if __name__ == "__main__":
+    import doctest
+    doctest.testmod()
@@ -0,0 +1,354 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Docstring2md: watch.
+
+This script is free software; you can redistribute it and/or
+modify it under the terms of the GNU Lesser General Public
+License as published by the Free Software Foundation; either
+version 3 of the License, or (at your option) any later version.
+
+This script is provided in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.
+"""
+from __future__ import annotations
+
+import ctypes
+import ctypes.util
+import os
+import select
+import struct
+import sys
+import time
+from typing import Iterable, Optional
+
+from docstring2md.__config__ import (INOTIFY_EVENT, INOTIFY_ISDIR,
+                                     INOTIFY_MASK, INOTIFY_NEW, LOG_MSG,
+                                     WATCH_DEBOUNCE, WATCH_POLL_INTERVAL,
+                                     WATCH_SUFFIX, ExitStatus)
+from docstring2md.doc2md import DocString2MD
+from docstring2md.log import logger
+
+
+class Watcher:
+    """Detect the changed files.
+
+    inotify is used on Linux, the files are polled otherwise. The
+    directories of the watched files are monitored: a python file created,
+    modified or deleted in one of these directories is a change. Their
+    sub-directories are monitored too: a new directory (a new
+    sub-package) is a change, and the files created in it are watched.
+
+    Examples:
+        >>> import tempfile
+        >>> from pathlib import Path
+        >>> tmp = tempfile.TemporaryDirectory()
+        >>> path = Path(tmp.name) / "mod.py"
+        >>> _ = path.write_text("a = 1")
+        >>> for inotify in (True, False):
+        ...     watcher = Watcher([str(path)], inotify=inotify)
+        ...     _ = path.write_text(f"a = {inotify}")
+        ...     watcher.wait(1.0) == {str(path)}
+        ...     watcher.wait(0.1)
+        ...     watcher.close()
+        True
+        set()
+        True
+        set()
+        >>> # a new sub-package
+        >>> from docstring2md.mod import PytMod, PytModOptions
+        >>> _ = (Path(tmp.name) / "__init__.py").write_text("")
+        >>> for inotify in (True, False):
+        ...     mod = PytMod(tmp.name, options=PytModOptions(no_import=True))
+        ...     mod.read()
+        ...     watcher = Watcher(mod.modules, inotify=inotify)
+        ...     sub = Path(tmp.name) / f"sub{inotify}"
+        ...     sub.mkdir()
+        ...     _ = (sub / "__init__.py").write_text("'Sub.'")
+        ...     changed = watcher.wait(1.0) | watcher.wait(0.2)
+        ...     str(sub) in changed, mod.refresh(changed)
+        ...     watcher.update(mod.modules)
+        ...     _ = (sub / "new.py").write_text("def f(): pass")
+        ...     mod.refresh(watcher.wait(1.0)), mod.modules[-1][-6:]
+        ...     watcher.close()
+        (True, True)
+        (True, 'new.py')
+        (True, True)
+        (True, 'new.py')
+        >>> tmp.cleanup()
+
+    """
+
+    __files: set[str]
+    __dirs: set[str]
+    __libc: Optional[ctypes.CDLL]
+    __fd: Optional[int]
+    __wds: dict[int, str]
+    __snapshot: dict[str, tuple[int, int]]
+
+    def __init__(self, paths: Iterable[str], inotify: bool = True) -> None:
+        """Init the watcher.
+
+        Args:
+            paths (Iterable[str]): files to watch
+            inotify (bool): use inotify if available
+
+        """
+        self.__files = set()
+        self.__dirs = set()
+        self.__wds = {}
+        self.__snapshot = {}
+        self.__libc = None
+        self.__fd = None
+        if inotify:
+            self.__inotify_init()
+        self.update(paths)
+
+    @property
+    def backend(self) -> str:
+        """Get the name of the backend: inotify or polling."""
+        return "inotify" if self.__fd is not None else "polling"
+
+    def __inotify_init(self) -> None:
+        if not sys.platform.startswith("linux"):
+            return
+        try:
+            libc = ctypes.CDLL(ctypes.util.find_library("c"), use_errno=True)
+            fd: int = libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        except (OSError, AttributeError):
+            return
+        if fd >= 0:
+            self.__libc, self.__fd = libc, fd
+
+    def update(self, paths: Iterable[str]) -> None:
+        """Set the files to watch.
+
+        Args:
+            paths (Iterable[str]): files to watch
+
+        """
+        self.__files = {os.path.normpath(path) for path in paths}
+        dirs: set[str] = {os.path.dirname(path) or os.curdir
+                          for path in self.__files}
+        # the sub-directories: a sub-package can be created there
+        for path in list(dirs):
+            dirs.update(self.__get_subdirs(path))
+        for path in dirs - self.__dirs:
+            self.__add_watch(path)
+        self.__dirs = dirs
+        if self.__fd is None:
+            self.__snapshot = self.__scan()
+
+    @staticmethod
+    def __is_subdir(path: str) -> bool:
+        # a package directory is an identifier (no .git, no __pycache__)
+        name: str = os.path.basename(path)
+        return name.isidentifier() and name != "__pycache__"
+
+    @staticmethod
+    def __get_subdirs(path: str) -> list[str]:
+        try:
+            with os.scandir(path) as entries:
+                return [os.path.join(path, entry.name) for entry in entries
+                        if entry.is_dir() and Watcher.__is_subdir(entry.name)]
+        except OSError:
+            return []
+
+    def __add_watch(self, path: str) -> None:
+        if self.__libc is None:
+            return
+        wd: int = self.__libc.inotify_add_watch(
+            self.__fd, os.fsencode(path), INOTIFY_MASK)
+        if wd >= 0:
+            self.__wds[wd] = path
+
+    def __add_dir(self, path: str) -> set[str]:
+        # a new directory is watched at once: the files created before the
+        # watch are changes too
+        self.__dirs.add(path)
+        self.__add_watch(path)
+        changed: set[str] = {path}
+        try:
+            with os.scandir(path) as entries:
+                changed.update(os.path.join(path, entry.name)
+                               for entry in entries
+                               if entry.name.endswith(WATCH_SUFFIX))
+        except OSError:
+            pass
+        return changed
+
+    def __is_watched(self, path: str) -> bool:
+        return path.endswith(WATCH_SUFFIX) or path in self.__files
+
+    def __scan(self) -> dict[str, tuple[int, int]]:
+        snapshot: dict[str, tuple[int, int]] = {}
+        for path in self.__dirs:
+            try:
+                entries = list(os.scandir(path))
+            except OSError:
+                continue
+            for entry in entries:
+                name: str = os.path.join(path, entry.name)
+                if entry.is_dir() and self.__is_subdir(name):
+                    # a directory is only created or deleted
+                    snapshot[name] = (0, 0)
+                    continue
+                if not self.__is_watched(name):
+                    continue
+                try:
+                    stat = entry.stat()
+                except OSError:
+                    continue
+                snapshot[name] = (stat.st_mtime_ns, stat.st_size)
+        return snapshot
+
+    def __read_events(self, timeout: Optional[float]) -> set[str]:
+        changed: set[str] = set()
+        if self.__fd is None or \
+                not select.select([self.__fd], [], [], timeout)[0]:
+            return changed
+        data: bytes = os.read(self.__fd, 64 * 1024)
+        offset: int = 0
+        size: int = struct.calcsize(INOTIFY_EVENT)
+        while offset < len(data):
+            wd, mask, _cookie, length = struct.unpack_from(
+                INOTIFY_EVENT, data, offset)
+            offset += size
+            name: str = os.fsdecode(
+                data[offset:offset + length].rstrip(b"\0"))
+            offset += length
+            if wd not in self.__wds:
+                continue
+            path: str = os.path.join(self.__wds[wd], name)
+            if not mask & INOTIFY_ISDIR:
+                if self.__is_watched(path):
+                    changed.add(path)
+            elif mask & INOTIFY_NEW and self.__is_subdir(path):
+                changed |= self.__add_dir(path)
+        return changed
+
+    def __poll(self) -> set[str]:
+        snapshot: dict[str, tuple[int, int]] = self.__scan()
+        # the new directories are scanned at once
+        new_dirs: set[str] = self.__get_new_dirs(snapshot)
+        while new_dirs:
+            self.__dirs |= new_dirs
+            snapshot = self.__scan()
+            new_dirs = self.__get_new_dirs(snapshot)
+        changed: set[str] = {
+            path for path in set(snapshot) | set(self.__snapshot)
+            if snapshot.get(path) != self.__snapshot.get(path)}
+        self.__snapshot = snapshot
+        return changed
+
+    def __get_new_dirs(self, snapshot: dict[str, tuple[int, int]]) \
+            -> set[str]:
+        return {path for path in set(snapshot) - set(self.__snapshot)
+                if path not in self.__dirs and os.path.isdir(path)}
+
+    def wait(self, timeout: Optional[float] = None) -> set[str]:
+        """Wait for changes.
+
+        The events received during WATCH_DEBOUNCE seconds after the first
+        one are merged (an editor can write a file several times).
+
+        Args:
+            timeout (float): seconds (None => wait forever)
+
+        Returns:
+            set[str]: changed files (empty after the timeout)
+
+        """
+        deadline: Optional[float] = None if timeout is None \
+            else time.monotonic() + timeout
+        changed: set[str] = set()
+        while not changed:
+            remaining: Optional[float] = None if deadline is None \
+                else deadline - time.monotonic()
+            if remaining is not None and remaining <= 0:
+                return changed
+            if self.__fd is not None:
+                changed = self.__read_events(remaining)
+            else:
+                changed = self.__poll()
+                if not changed:
+                    time.sleep(WATCH_POLL_INTERVAL if remaining is None
+                               else min(WATCH_POLL_INTERVAL, remaining))
+        time.sleep(WATCH_DEBOUNCE)
+        changed |= self.__read_events(0) if self.__fd is not None \
+            else self.__poll()
+        logger.debug(LOG_MSG.watch.debug, changed)
+        return changed
+
+    def changes(self) -> set[str]:
+        """Get the changes since the last call without waiting.
+
+        Returns:
+            set[str]: changed files
+
+        """
+        if self.__fd is None:
+            return self.__poll()
+        changed: set[str] = set()
+        while True:
+            events: set[str] = self.__read_events(0)
+            if not events:
+                return changed
+            changed |= events
+
+    def close(self) -> None:
+        """Stop watching."""
+        if self.__fd is not None:
+            os.close(self.__fd)
+            self.__libc, self.__fd = None, None
+
+
+def watch(doc: DocString2MD, inotify: bool = True) -> ExitStatus:
+    """Write the doc again each time a file changes.
+
+    The doc must be imported first. Only the changed modules are
+    extracted again, the rendered nodes are kept (see
+    DocString2MD.release). Stop with Ctrl+C.
+
+    Args:
+        doc (DocString2MD): imported doc
+        inotify (bool): use inotify if available
+
+    Returns:
+        int: status
+        return EX_OK: 0 -> success
+        return EX_CANTCREAT: 73 -> can't create the file
+        return EX_IOERR: 74 -> write error
+
+    """
+    watcher: Watcher = Watcher(doc.files, inotify)
+    status: ExitStatus = ExitStatus.EX_OK
+    logger.info(LOG_MSG.watch.info, watcher.backend)
+    doc.release()
+    try:
+        while status is ExitStatus.EX_OK:
+            changed: set[str] = watcher.wait()
+            start: float = time.perf_counter()
+            try:
+                if not doc.refresh(changed):
+                    continue
+            except (SyntaxError, ValueError, OSError) as err:
+                # the file is being edited: wait for the next change
+                logger.error(LOG_MSG.watch.error, err)
+                continue
+            doc.release()
+            status = doc.writedoc()
+            watcher.update(doc.files)
+            logger.info(LOG_MSG.watch_update.info,
+                        (time.perf_counter() - start) * 1000)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        watcher.close()
+    return status
+
+
+if __name__ == "__main__":
+    import doctest
+    doctest.testmod()
@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Docstring2md: xref.
+
+This script is free software; you can redistribute it and/or
+modify it under the terms of the GNU Lesser General Public
+License as published by the Free Software Foundation; either
+version 3 of the License, or (at your option) any later version.
+
+This script is provided in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.
+"""
+from __future__ import annotations
+
+from typing import Iterable, Optional
+
+from docstring2md.__config__ import Const
+from docstring2md.ast_engine import NodeDef
+
+
+class XRefIndex:
+    """Map the documented names to their anchors.
+
+    Each node is known by its name in the module (Class.method) and by its
+    qualified name (package.module.Class.method). The names are stored in
+    a dict: a lookup does not depend on the number of symbols.
+    A name defined in several modules is ambiguous: it is only linked with
+    its qualified name.
+
+    Examples:
+        >>> xref = XRefIndex()
+        >>> xref.add("pkg.a", NodeDef("Foo()", "", "", 1), "#foo")
+        >>> xref.add("pkg.a", NodeDef("Foo.run()", "", "", 2), "#foorun")
+        >>> xref.add("pkg.b", NodeDef("Foo()", "", "", 1), "#foo-1")
+        >>> xref.get_links(["Foo", "Foo.run", "pkg.b.Foo", "int"])
+        {'Foo.run': '#foorun', 'pkg.b.Foo': '#foo-1'}
+
+    """
+
+    __targets: dict[str, str]
+    # name => module (None => ambiguous)
+    __modules: dict[str, Optional[str]]
+
+    def __init__(self) -> None:
+        """Init the index."""
+        self.__targets = {}
+        self.__modules = {}
+
+    def add(self, module: str, node: NodeDef, target: str) -> None:
+        """Add a node.
+
+        The first definition of a name in a module is kept (overloads,
+        property setters...).
+
+        Args:
+            module (str): dotted name of the module
+            node (NodeDef): node
+            target (str): link target (#anchor or page.md#anchor)
+
+        """
+        name: str = node.get_name()
+        self.__targets.setdefault(f"{module}{Const.DOT.value}{name}", target)
+        owner: Optional[str] = self.__modules.setdefault(name, module)
+        if owner is None:
+            return
+        if owner != module:
+            self.__modules[name] = None
+            self.__targets.pop(name, None)
+            return
+        self.__targets.setdefault(name, target)
+
+    def get_links(self, names: Iterable[str]) -> dict[str, str]:
+        """Get the targets of the names.
+
+        Args:
+            names (Iterable[str]): names used by the nodes
+
+        Returns:
+            dict[str, str]: name => target (the unknown names are skipped)
+
+        """
+        targets: dict[str, str] = self.__targets
+        return {name: targets[name] for name in names if name in targets}
+
+
+if __name__ == "__main__":
+    import doctest
+    doctest.testmod()